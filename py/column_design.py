@@ -0,0 +1,636 @@
+# -*- coding: utf8 -*-
+"""Design of the longitudinal reinforcement of the reinforced concrete column
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import functools
+import itertools
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from APIHub.column_schedule import ScheduleRow
+from APIHub.rebar_tables    import STEEL_DENSITY, rebar_properties
+
+
+# Diameters of the longitudinal rebars in mm
+REBAR_DIAMETERS = (8, 10, 12, 14, 16, 20)
+
+# Distance between longitudinal rebars in mm
+BAR_SPACING_MIN = 100
+BAR_SPACING_MAX = 400
+
+# Lap length of the starter rebars, as a multiple of the bar diameter
+LAP_LENGTH_FACTOR = 50
+
+
+class RebarLayout(NamedTuple):
+    """Definition of class RebarLayout
+    """
+    frst_bar_diameter : int
+    scnd_bar_diameter : int
+    qtt_in_length     : int
+    qtt_in_thick      : int
+    rebar_circ_qtt    : int
+    as_real           : float
+
+
+def bar_section(diameter : float) -> float:
+    """Section of a rebar
+
+    Args:
+        diameter : diameter in mm
+
+    Returns:
+        Section in cm²
+    """
+    return rebar_properties(diameter).section
+
+
+def side_bar_count_bounds(side        : float,
+                          concr_cover : float) -> Tuple[int, int]:
+    """Quantity of intermediate rebars along one side of a rectangular column
+
+    Args:
+        side        : length of the side in mm
+        concr_cover : concrete cover in mm
+
+    Returns:
+        Min and max quantity respecting the distance between rebars
+    """
+    length = side - 2 * concr_cover
+
+    min_value = max(0, math.ceil(length / BAR_SPACING_MAX) - 1)
+    max_value = max(min_value, math.floor(length / BAR_SPACING_MIN) - 1)
+
+    return (min_value, max_value)
+
+
+def circ_bar_count_bounds(radius      : float,
+                          concr_cover : float) -> Tuple[int, int]:
+    """Quantity of rebars of a circular column
+
+    Args:
+        radius      : radius of the column in mm
+        concr_cover : concrete cover in mm
+
+    Returns:
+        Min and max quantity respecting the distance between rebars
+    """
+    perimeter = 2 * math.pi * (radius - concr_cover)
+
+    min_value = max(4, math.ceil(perimeter / BAR_SPACING_MAX))
+    max_value = max(min_value, math.floor(perimeter / BAR_SPACING_MIN))
+
+    return (min_value, max_value)
+
+
+class DispositionsInput(NamedTuple):
+    """Definition of class DispositionsInput
+    """
+    choice              : str
+    column_length       : float
+    column_thick        : float
+    column_radius       : float
+    concr_cover         : float
+    frst_bar_diameter   : int
+    scnd_bar_diameter   : int
+    qtt_in_length       : int
+    qtt_in_thick        : int
+    rebar_circ_qtt      : int
+    end_stirrup_spacing : float
+
+
+class Dispositions(NamedTuple):
+    """Definition of class Dispositions
+    """
+    qtt_in_length         : int
+    qtt_in_thick          : int
+    rebar_circ_qtt        : int
+    bounds_in_length      : Tuple[int, int]
+    bounds_in_thick       : Tuple[int, int]
+    bounds_circ           : Tuple[int, int]
+    as_min                : float
+    as_max                : float
+    main_stirrup_max_dist : float
+    end_stirrup_max_dist  : float
+    bottom_stirrup_length : float
+    top_stirrup_length    : float
+
+
+@functools.lru_cache(maxsize = 256)
+def constructive_dispositions(inputs : DispositionsInput) -> Dispositions:
+    """Calcul of constructive dispositions
+
+    Args:
+        inputs : values of the column
+
+    Returns:
+        Rebars quantities within bounds, bounds, As min / As max and stirrups limits
+    """
+    bounds_in_length = bounds_in_thick = bounds_circ = (0, 0)
+
+    qtt_in_length  = inputs.qtt_in_length
+    qtt_in_thick   = inputs.qtt_in_thick
+    rebar_circ_qtt = inputs.rebar_circ_qtt
+
+    if inputs.choice == "rectangle":
+        # Concrete section in cm²
+        Ac = (inputs.column_length * inputs.column_thick) * 1e-2
+
+        # Rebars quantity
+        bounds_in_length = side_bar_count_bounds(inputs.column_length, inputs.concr_cover)
+        bounds_in_thick  = side_bar_count_bounds(inputs.column_thick, inputs.concr_cover)
+
+        if qtt_in_length > 0 or qtt_in_thick > 0:
+            main_stirrup_max_dist = min(20 * min(inputs.frst_bar_diameter, inputs.scnd_bar_diameter), 400, min(inputs.column_length, inputs.column_thick))
+        else:
+            main_stirrup_max_dist = min(20 * inputs.frst_bar_diameter, 400, min(inputs.column_length, inputs.column_thick))
+
+        top_stirrup_length = max(inputs.column_length, inputs.column_thick)
+
+        qtt_in_length = min(max(qtt_in_length, bounds_in_length[0]), bounds_in_length[1])
+        qtt_in_thick  = min(max(qtt_in_thick, bounds_in_thick[0]), bounds_in_thick[1])
+
+    else:
+        # Concrete section in cm²
+        Ac = (math.pi * inputs.column_radius ** 2) * 1e-2
+
+        # Rebars quantity
+        bounds_circ = circ_bar_count_bounds(inputs.column_radius, inputs.concr_cover)
+
+        main_stirrup_max_dist = min(20 * inputs.frst_bar_diameter, 400, 2 * inputs.column_radius)
+        top_stirrup_length    = 2 * inputs.column_radius
+
+        rebar_circ_qtt = min(max(rebar_circ_qtt, bounds_circ[0]), bounds_circ[1])
+
+    return Dispositions(qtt_in_length,
+                        qtt_in_thick,
+                        rebar_circ_qtt,
+                        bounds_in_length,
+                        bounds_in_thick,
+                        bounds_circ,
+                        0.002 * Ac,
+                        0.04 * Ac,
+                        main_stirrup_max_dist,
+                        0.6 * main_stirrup_max_dist,
+                        float(2 * inputs.end_stirrup_spacing),
+                        float(top_stirrup_length))
+
+
+@functools.lru_cache(maxsize = 256)
+def as_real(choice            : str,
+            frst_bar_diameter : int,
+            scnd_bar_diameter : int,
+            qtt_in_length     : int,
+            qtt_in_thick      : int,
+            rebar_circ_qtt    : int) -> float:
+    """Calcul of As real
+
+    Args:
+        choice            : shape of the column
+        frst_bar_diameter : diameter of the corner rebars in mm
+        scnd_bar_diameter : diameter of the intermediate rebars in mm
+        qtt_in_length     : quantity of intermediate rebars along the length
+        qtt_in_thick      : quantity of intermediate rebars along the thickness
+        rebar_circ_qtt    : quantity of rebars of a circular column
+
+    Returns:
+        As real in cm²
+    """
+    if choice == "rectangle":
+        return 4 * bar_section(frst_bar_diameter) + 2 * (qtt_in_length + qtt_in_thick) * bar_section(scnd_bar_diameter)
+
+    return rebar_circ_qtt * bar_section(frst_bar_diameter)
+
+
+def solve_rect_layout(column_length : float,
+                      column_thick  : float,
+                      concr_cover   : float,
+                      as_min        : float,
+                      as_max        : float,
+                      same_diameter : bool = False,
+                      frst_diameter : Optional[int] = None) -> Optional[RebarLayout]:
+    """Lightest layout of a rectangular column
+
+    Every combination of corner diameter, intermediate diameter and quantities along the length
+    and the thickness is evaluated at once. The steel weight is proportional to the section for
+    a given height, so the layout with the smallest section between As min and As max is kept,
+    then the one with the fewest rebars, then the one with a single diameter.
+
+    Args:
+        column_length : length of the column in mm
+        column_thick  : thickness of the column in mm
+        concr_cover   : concrete cover in mm
+        as_min        : As min in cm²
+        as_max        : As max in cm²
+        same_diameter : the intermediate rebars have the diameter of the corner rebars
+        frst_diameter : diameter of the corner rebars, the intermediate rebars are not larger
+
+    Returns:
+        Lightest layout, None if no layout is between As min and As max
+    """
+    min_in_length, max_in_length = side_bar_count_bounds(column_length, concr_cover)
+    min_in_thick, max_in_thick   = side_bar_count_bounds(column_thick, concr_cover)
+
+    if np is not None:
+        diameters = np.array(REBAR_DIAMETERS, dtype = float)
+        sections  = np.array([rebar_properties(diameter).section for diameter in REBAR_DIAMETERS])
+
+        # Axes : corner diameter, intermediate diameter, quantity in length, quantity in thickness
+        frst_index, scnd_index, qtt_length, qtt_thick = np.meshgrid(np.arange(len(REBAR_DIAMETERS)),
+                                                                    np.arange(len(REBAR_DIAMETERS)),
+                                                                    np.arange(min_in_length, max_in_length + 1),
+                                                                    np.arange(min_in_thick, max_in_thick + 1),
+                                                                    indexing = 'ij')
+
+        nbr_scnd_bars = 2 * (qtt_length + qtt_thick)
+        as_real       = 4 * sections[frst_index] + nbr_scnd_bars * sections[scnd_index]
+
+        is_valid = (as_real >= as_min) & (as_real <= as_max)
+        if same_diameter:
+            is_valid &= frst_index == scnd_index
+        if frst_diameter is not None:
+            is_valid &= (diameters[frst_index] == frst_diameter) & (scnd_index <= frst_index)
+
+        if not is_valid.any():
+            return None
+
+        candidates = np.flatnonzero(is_valid)
+        order      = np.lexsort(((frst_index.ravel()[candidates] != scnd_index.ravel()[candidates]),
+                                 nbr_scnd_bars.ravel()[candidates],
+                                 as_real.ravel()[candidates]))
+        best       = candidates[order[0]]
+
+        return RebarLayout(REBAR_DIAMETERS[frst_index.ravel()[best]],
+                           REBAR_DIAMETERS[scnd_index.ravel()[best]],
+                           int(qtt_length.ravel()[best]),
+                           int(qtt_thick.ravel()[best]),
+                           0,
+                           float(as_real.ravel()[best]))
+
+    candidates = []
+
+    for frst_diam, scnd_diam, qtt_length, qtt_thick in itertools.product(REBAR_DIAMETERS,
+                                                                        REBAR_DIAMETERS,
+                                                                        range(min_in_length, max_in_length + 1),
+                                                                        range(min_in_thick, max_in_thick + 1)):
+        if same_diameter and frst_diam != scnd_diam:
+            continue
+        if frst_diameter is not None and (frst_diam != frst_diameter or scnd_diam > frst_diam):
+            continue
+
+        nbr_scnd_bars = 2 * (qtt_length + qtt_thick)
+        as_real       = 4 * bar_section(frst_diam) + nbr_scnd_bars * bar_section(scnd_diam)
+
+        if as_min <= as_real <= as_max:
+            candidates.append(((as_real, nbr_scnd_bars, frst_diam != scnd_diam),
+                               RebarLayout(frst_diam, scnd_diam, qtt_length, qtt_thick, 0, as_real)))
+
+    return min(candidates, key = lambda candidate: candidate[0])[1] if candidates else None
+
+
+def solve_circ_layout(column_radius : float,
+                      concr_cover   : float,
+                      as_min        : float,
+                      as_max        : float,
+                      diameter      : Optional[int] = None) -> Optional[RebarLayout]:
+    """Lightest layout of a circular column
+
+    Args:
+        column_radius : radius of the column in mm
+        concr_cover   : concrete cover in mm
+        as_min        : As min in cm²
+        as_max        : As max in cm²
+        diameter      : diameter of the rebars, any diameter if None
+
+    Returns:
+        Lightest layout, None if no layout is between As min and As max
+    """
+    min_value, max_value = circ_bar_count_bounds(column_radius, concr_cover)
+
+    if np is not None:
+        diameters = np.array(REBAR_DIAMETERS, dtype = float)
+        sections  = np.array([rebar_properties(diameter).section for diameter in REBAR_DIAMETERS])
+
+        diam_index, qtt = np.meshgrid(np.arange(len(REBAR_DIAMETERS)),
+                                      np.arange(min_value, max_value + 1),
+                                      indexing = 'ij')
+
+        as_real  = qtt * sections[diam_index]
+        is_valid = (as_real >= as_min) & (as_real <= as_max)
+        if diameter is not None:
+            is_valid &= diameters[diam_index] == diameter
+
+        if not is_valid.any():
+            return None
+
+        candidates_index = np.flatnonzero(is_valid)
+        order            = np.lexsort((qtt.ravel()[candidates_index], as_real.ravel()[candidates_index]))
+        best             = candidates_index[order[0]]
+        bar_diameter     = REBAR_DIAMETERS[diam_index.ravel()[best]]
+
+        return RebarLayout(bar_diameter, bar_diameter, 0, 0, int(qtt.ravel()[best]), float(as_real.ravel()[best]))
+
+    candidates = []
+
+    for bar_diameter, qtt in itertools.product(REBAR_DIAMETERS, range(min_value, max_value + 1)):
+        if diameter is not None and bar_diameter != diameter:
+            continue
+
+        as_real = qtt * bar_section(bar_diameter)
+
+        if as_min <= as_real <= as_max:
+            candidates.append(((as_real, qtt), RebarLayout(bar_diameter, bar_diameter, 0, 0, qtt, as_real)))
+
+    return min(candidates, key = lambda candidate: candidate[0])[1] if candidates else None
+
+
+class StackStorey(NamedTuple):
+    """Definition of class StackStorey
+    """
+    column_length : float
+    column_thick  : float
+    column_radius : float
+    column_height : float
+
+
+def layout_bar_count(layout : RebarLayout) -> int:
+    """Quantity of longitudinal rebars of a layout
+
+    Args:
+        layout : rebar layout
+
+    Returns:
+        Quantity of rebars
+    """
+    return layout.rebar_circ_qtt or 4 + 2 * (layout.qtt_in_length + layout.qtt_in_thick)
+
+
+def lap_length(diameter : float) -> float:
+    """Lap length of the starter rebars in mm
+
+    Args:
+        diameter : diameter of the rebars in mm
+
+    Returns:
+        Lap length
+    """
+    return LAP_LENGTH_FACTOR * diameter
+
+
+def storey_layouts(choice        : str,
+                   storey        : StackStorey,
+                   concr_cover   : float,
+                   same_diameter : bool = False) -> List[RebarLayout]:
+    """Lightest layout of a storey for each diameter of the corner rebars
+
+    Args:
+        choice        : shape of the column
+        storey        : storey of the stack
+        concr_cover   : concrete cover in mm
+        same_diameter : the intermediate rebars have the diameter of the corner rebars
+
+    Returns:
+        Layouts between As min and As max
+    """
+    dispositions = constructive_dispositions(DispositionsInput(choice,
+                                                               storey.column_length,
+                                                               storey.column_thick,
+                                                               storey.column_radius,
+                                                               concr_cover,
+                                                               0, 0, 0, 0, 0, 0))
+    layouts = []
+
+    for diameter in REBAR_DIAMETERS:
+        if choice == "rectangle":
+            layout = solve_rect_layout(storey.column_length, storey.column_thick, concr_cover,
+                                       dispositions.as_min, dispositions.as_max, same_diameter, diameter)
+        else:
+            layout = solve_circ_layout(storey.column_radius, concr_cover,
+                                       dispositions.as_min, dispositions.as_max, diameter)
+
+        if layout is not None:
+            layouts.append(layout)
+
+    return layouts
+
+
+def solve_stack_layout(choice        : str,
+                       storeys       : Sequence[StackStorey],
+                       concr_cover   : float,
+                       same_diameter : bool = False) -> Optional[List[RebarLayout]]:
+    """Lightest layouts of a stack of columns, from the ground to the roof
+
+    The corner rebars of a storey are not larger than the ones of the storey below, and the intermediate
+    rebars are not larger than the corner rebars, so each storey laps on starter rebars of its own diameter.
+    The weight of a storey is the weight of its longitudinal rebars plus the weight of the starter
+    rebars coming from the storey below, the lightest chain is found by dynamic programming.
+
+    Args:
+        choice        : shape of the columns
+        storeys       : storeys of the stack, from the ground
+        concr_cover   : concrete cover in mm
+        same_diameter : the intermediate rebars have the diameter of the corner rebars
+
+    Returns:
+        Layout of each storey, None if a storey has no layout or if the diameters can't decrease
+    """
+    # Layouts of each storey, with the weight in kg of the stack up to the layout and the index of the layout below
+    chain = []
+
+    for index, storey in enumerate(storeys):
+        layouts = storey_layouts(choice, storey, concr_cover, same_diameter)
+        costs   = []
+
+        for layout in layouts:
+            weight = layout.as_real * 1e-4 * storey.column_height * 1e-3 * STEEL_DENSITY
+
+            if index == 0:
+                costs.append((weight, -1))
+                continue
+
+            # Starter rebars of the storey below
+            weight += layout_bar_count(layout) * bar_section(layout.frst_bar_diameter) * 1e-4 \
+                      * 2 * lap_length(layout.frst_bar_diameter) * 1e-3 * STEEL_DENSITY
+
+            below_layouts, below_costs = chain[-1]
+
+            below = [(below_costs[below_index][0], below_index)
+                     for below_index, below_layout in enumerate(below_layouts)
+                     if below_costs[below_index][0] is not None
+                     and below_layout.frst_bar_diameter >= layout.frst_bar_diameter]
+
+            if below:
+                below_weight, below_index = min(below)
+                costs.append((below_weight + weight, below_index))
+            else:
+                costs.append((None, -1))
+
+        chain.append((layouts, costs))
+
+    if not chain:
+        return None
+
+    valid = [(cost[0], layout_index) for layout_index, cost in enumerate(chain[-1][1]) if cost[0] is not None]
+    if not valid:
+        return None
+
+    # Go back down the stack
+    stack_layouts = []
+    layout_index  = min(valid)[1]
+
+    for layouts, costs in reversed(chain):
+        stack_layouts.append(layouts[layout_index])
+        layout_index = costs[layout_index][1]
+
+    stack_layouts.reverse()
+
+    return stack_layouts
+
+
+class ComplianceResult(NamedTuple):
+    """Definition of class ComplianceResult
+    """
+    column_id  : str
+    is_valid   : bool
+    violations : Tuple[str, ...]
+
+
+# Rules checked on the schedule rows
+COMPLIANCE_RULES = ("Espacement des armatures longitudinales",
+                    "As < As min",
+                    "As > As max",
+                    "Espacement A des cadres",
+                    "Espacement B des cadres",
+                    "Espacement C des cadres")
+
+
+def check_schedule_rows(schedule_rows : Sequence[ScheduleRow],
+                        choice        : str,
+                        column_length : float,
+                        column_thick  : float,
+                        column_radius : float,
+                        concr_cover   : float) -> List[ComplianceResult]:
+    """Check the schedule rows against the constructive dispositions
+
+    All the rows are checked at once with arrays, one by one without NumPy. The column section
+    is the same for all the rows.
+
+    Args:
+        schedule_rows : schedule rows
+        choice        : shape of the columns
+        column_length : length of the columns in mm
+        column_thick  : thickness of the columns in mm
+        column_radius : radius of the columns in mm
+        concr_cover   : concrete cover in mm
+
+    Returns:
+        Result of each row, in the same order
+    """
+    if choice == "rectangle":
+        Ac = (column_length * column_thick) * 1e-2
+
+        min_in_length, max_in_length = side_bar_count_bounds(column_length, concr_cover)
+        min_in_thick, max_in_thick   = side_bar_count_bounds(column_thick, concr_cover)
+
+        # 4 => one main longitudinal rebar for each corner
+        min_quantity = 4 + 2 * (min_in_length + min_in_thick)
+        max_quantity = 4 + 2 * (max_in_length + max_in_thick)
+
+        smallest_side = min(column_length, column_thick)
+    else:
+        Ac = (math.pi * column_radius ** 2) * 1e-2
+
+        min_quantity, max_quantity = circ_bar_count_bounds(column_radius, concr_cover)
+
+        smallest_side = 2 * column_radius
+
+    if np is None:
+        results = []
+
+        for schedule_row in schedule_rows:
+            as_bars               = schedule_row.long_bar_quantity * rebar_properties(schedule_row.long_bar_diameter).section
+            main_stirrup_max_dist = min(20 * schedule_row.long_bar_diameter, 400, smallest_side)
+            end_stirrup_max_dist  = 0.6 * main_stirrup_max_dist
+
+            # One value for each rule of COMPLIANCE_RULES
+            is_rule_valid = (min_quantity <= schedule_row.long_bar_quantity <= max_quantity,
+                             as_bars >= 0.002 * Ac,
+                             as_bars <= 0.04 * Ac,
+                             schedule_row.stirrup_spacing_a <= main_stirrup_max_dist,
+                             schedule_row.stirrup_spacing_b <= end_stirrup_max_dist,
+                             schedule_row.stirrup_spacing_c <= end_stirrup_max_dist)
+
+            violations = tuple(rule for rule, is_valid in zip(COMPLIANCE_RULES, is_rule_valid) if not is_valid)
+            results.append(ComplianceResult(schedule_row.column_id, not violations, violations))
+
+        return results
+
+    count = len(schedule_rows)
+
+    diameter  = np.fromiter((schedule_row.long_bar_diameter for schedule_row in schedule_rows), dtype = float, count = count)
+    section   = np.fromiter((rebar_properties(schedule_row.long_bar_diameter).section for schedule_row in schedule_rows),
+                            dtype = float, count = count)
+    quantity  = np.fromiter((schedule_row.long_bar_quantity for schedule_row in schedule_rows), dtype = float, count = count)
+    spacing_a = np.fromiter((schedule_row.stirrup_spacing_a for schedule_row in schedule_rows), dtype = float, count = count)
+    spacing_b = np.fromiter((schedule_row.stirrup_spacing_b for schedule_row in schedule_rows), dtype = float, count = count)
+    spacing_c = np.fromiter((schedule_row.stirrup_spacing_c for schedule_row in schedule_rows), dtype = float, count = count)
+
+    as_bars               = quantity * section
+    main_stirrup_max_dist = np.minimum(20 * diameter, min(400, smallest_side))
+    end_stirrup_max_dist  = 0.6 * main_stirrup_max_dist
+
+    # One line for each rule of COMPLIANCE_RULES
+    is_rule_valid = np.vstack(((quantity >= min_quantity) & (quantity <= max_quantity),
+                               as_bars >= 0.002 * Ac,
+                               as_bars <= 0.04 * Ac,
+                               spacing_a <= main_stirrup_max_dist,
+                               spacing_b <= end_stirrup_max_dist,
+                               spacing_c <= end_stirrup_max_dist))
+
+    results = [ComplianceResult(schedule_row.column_id, True, ()) for schedule_row in schedule_rows]
+
+    for index in np.flatnonzero(~is_rule_valid.all(axis = 0)):
+        violations     = tuple(rule for rule, is_valid in zip(COMPLIANCE_RULES, is_rule_valid[:, index]) if not is_valid)
+        results[index] = ComplianceResult(schedule_rows[index].column_id, False, violations)
+
+    return results
+
+
+def iter_schedule_compliance(schedule_rows : Iterable[ScheduleRow],
+                             choice        : str,
+                             column_length : float,
+                             column_thick  : float,
+                             column_radius : float,
+                             concr_cover   : float,
+                             chunk_size    : int = 10000) -> Iterator[Tuple[ScheduleRow, ComplianceResult]]:
+    """Check a stream of schedule rows by chunks, memory use does not depend on the schedule size
+
+    Args:
+        schedule_rows : schedule rows
+        choice        : shape of the columns
+        column_length : length of the columns in mm
+        column_thick  : thickness of the columns in mm
+        column_radius : radius of the columns in mm
+        concr_cover   : concrete cover in mm
+        chunk_size    : quantity of rows checked at once
+
+    Yields:
+        Each row with its result, in the same order
+    """
+    schedule_rows = iter(schedule_rows)
+
+    while True:
+        chunk = list(itertools.islice(schedule_rows, chunk_size))
+
+        if not chunk:
+            return
+
+        yield from zip(chunk, check_schedule_rows(chunk, choice, column_length, column_thick, column_radius, concr_cover))
@@ -0,0 +1,694 @@
+# -*- coding: utf8 -*-
+"""Reinforcement schedule reading for the reinforced concrete column script
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+
+# Headers of the reinforcement schedule (CSV file)
+COLUMN_ID_HEADER         = 'Repère'
+LONG_BAR_DIAM_HEADER     = 'Diamètre Armatures Longitudinales'
+LONG_BAR_QTT_HEADER      = 'Quantité Armatures Longitudinales'
+STIRRUP_DIAM_HEADER      = 'Diamètre Armatures Transversales'
+STIRRUP_A_SPACING_HEADER = 'Espacement A Armatures Transversales'
+STIRRUP_B_SPACING_HEADER = 'Espacement B Armatures Transversales'
+STIRRUP_C_SPACING_HEADER = 'Espacement C Armatures Transversales'
+
+SCHEDULE_HEADERS = (COLUMN_ID_HEADER,
+                    LONG_BAR_DIAM_HEADER,
+                    LONG_BAR_QTT_HEADER,
+                    STIRRUP_DIAM_HEADER,
+                    STIRRUP_A_SPACING_HEADER,
+                    STIRRUP_B_SPACING_HEADER,
+                    STIRRUP_C_SPACING_HEADER)
+
+# Row hashes of the last import (JSON file)
+SCHEDULE_STATE_SUFFIX = '.state.json'
+
+# Compiled schedule (binary file), written in a local folder and not next to the CSV file,
+# which can be on a shared or read-only drive of the project
+COMPILED_SCHEDULE_DIR     = os.path.join(tempfile.gettempdir(), 'APIHub', 'compiled_schedules')
+COMPILED_SCHEDULE_SUFFIX  = '.bin'
+COMPILED_SCHEDULE_MAGIC   = b'APSC'
+COMPILED_SCHEDULE_VERSION = 1
+
+COMPILED_HEADER = struct.Struct('<4sHII') # magic, version, row count, key width
+COMPILED_RECORD = struct.Struct('<3H3d')  # diameters / quantity, then stirrup spacings A, B, C
+
+
+class ScheduleRow(NamedTuple):
+    """Definition of class ScheduleRow
+    """
+    column_id         : str
+    long_bar_diameter : int
+    long_bar_quantity : int
+    stirrup_diameter  : int
+    stirrup_spacing_a : float
+    stirrup_spacing_b : float
+    stirrup_spacing_c : float
+
+
+def resolve_schedule_columns(header : List[str]) -> Tuple[Optional[int], ...]:
+    """Get the position of the schedule values in a CSV header
+
+    Args:
+        header : first row of the CSV file
+
+    Returns:
+        Position of each value of SCHEDULE_HEADERS, None if the value is missing
+    """
+    positions = {name.strip(): index for index, name in enumerate(header)}
+
+    if COLUMN_ID_HEADER not in positions:
+        raise ValueError(f"Colonne '{COLUMN_ID_HEADER}' absente du fichier")
+
+    return tuple(positions.get(name) for name in SCHEDULE_HEADERS)
+
+
+def read_schedule_records(file : TextIO) -> Iterator[Tuple[str, ...]]:
+    """Read the raw values of the schedule, the header is resolved only once
+
+    Args:
+        file : opened CSV file
+
+    Yields:
+        Raw values ordered as SCHEDULE_HEADERS
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+
+    if header is None:
+        return
+
+    positions = resolve_schedule_columns(header)
+
+    for record in reader:
+        size = len(record)
+        yield tuple(record[index] if index is not None and index < size else '' for index in positions)
+
+
+def normalize_schedule_records(records : Iterable[Tuple[str, ...]]) -> Iterator[Tuple[str, ...]]:
+    """Remove the blanks around the raw values
+
+    Args:
+        records : raw values
+
+    Yields:
+        Normalized values
+    """
+    for record in records:
+        yield tuple(value.strip() for value in record)
+
+
+def validate_schedule_records(records : Iterable[Tuple[str, ...]]) -> Iterator[ScheduleRow]:
+    """Convert the values to typed schedule rows, incomplete or invalid rows are skipped
+
+    Args:
+        records : normalized values
+
+    Yields:
+        Typed schedule rows
+    """
+    for record in records:
+        # Keep only rows with all values
+        if not all(record):
+            continue
+
+        try:
+            yield ScheduleRow(record[0],
+                              int(record[1]),
+                              int(record[2]),
+                              int(record[3]),
+                              float(record[4]),
+                              float(record[5]),
+                              float(record[6])
+                              )
+        except ValueError:
+            continue
+
+
+def iter_schedule(file_path : str) -> Iterator[ScheduleRow]:
+    """Stream the rows of a schedule, memory use does not depend on the file size
+
+    Args:
+        file_path : path of the CSV file
+
+    Yields:
+        Typed schedule rows, in the file order
+    """
+    with open(file_path, mode='r', encoding='utf-8', newline='') as file:
+        yield from validate_schedule_records(normalize_schedule_records(read_schedule_records(file)))
+
+
+def read_schedule_index(file_path : str) -> Dict[str, ScheduleRow]:
+    """Read the whole schedule and index it by column name
+
+    Args:
+        file_path : path of the CSV file
+
+    Returns:
+        Dictionary {column name: schedule row}, the first valid row is kept for each column
+    """
+    index = {}
+
+    for schedule_row in iter_schedule(file_path):
+        index.setdefault(schedule_row.column_id, schedule_row)
+
+    return index
+
+
+class ScheduleDiff(NamedTuple):
+    """Definition of class ScheduleDiff
+    """
+    added     : Tuple[str, ...]
+    removed   : Tuple[str, ...]
+    changed   : Tuple[str, ...]
+    unchanged : int
+
+
+def schedule_row_digest(schedule_row : ScheduleRow) -> str:
+    """Get the content hash of a schedule row
+
+    Args:
+        schedule_row : schedule row
+
+    Returns:
+        Hash of the row values, stable between sessions
+    """
+    return hashlib.blake2b(repr(tuple(schedule_row)).encode('utf-8'), digest_size = 8).hexdigest()
+
+
+def schedule_state_path(file_path : str,
+                        level     : str = "") -> str:
+    """Get the path of the import state of a schedule
+
+    Args:
+        file_path : path of the schedule file
+        level     : level of the schedule rows
+
+    Returns:
+        Path of the import state, next to the schedule file
+    """
+    return f"{file_path}.{level}{SCHEDULE_STATE_SUFFIX}" if level else file_path + SCHEDULE_STATE_SUFFIX
+
+
+def load_schedule_state(state_path : str) -> Dict[str, str]:
+    """Load the row hashes of the last import
+
+    Args:
+        state_path : path of the import state
+
+    Returns:
+        Dictionary {column name: row hash}, empty if there is no previous import
+    """
+    try:
+        with open(state_path, mode='r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_schedule_state(state      : Dict[str, str],
+                        state_path : str) -> None:
+    """Save the row hashes of an import
+
+    Args:
+        state      : dictionary {column name: row hash}
+        state_path : path of the import state
+    """
+    with open(state_path, mode='w', encoding='utf-8') as file:
+        json.dump(state, file, ensure_ascii = False)
+
+
+def iter_changed_rows(schedule_rows  : Iterable[ScheduleRow],
+                      previous_state : Dict[str, str],
+                      current_state  : Dict[str, str]) -> Iterator[ScheduleRow]:
+    """Stream only the rows added or changed since the last import
+
+    Args:
+        schedule_rows  : schedule rows, the first row of each column is used
+        previous_state : row hashes of the last import
+        current_state  : filled with the row hashes of the schedule
+
+    Yields:
+        Added or changed schedule rows
+    """
+    for schedule_row in schedule_rows:
+        if schedule_row.column_id in current_state:
+            continue
+
+        digest = schedule_row_digest(schedule_row)
+        current_state[schedule_row.column_id] = digest
+
+        if previous_state.get(schedule_row.column_id) != digest:
+            yield schedule_row
+
+
+def schedule_state_of(schedule_rows : Iterable[ScheduleRow]) -> Dict[str, str]:
+    """Get the row hashes of a schedule
+
+    Args:
+        schedule_rows : schedule rows, the first row of each column is used
+
+    Returns:
+        Dictionary {column name: row hash}
+    """
+    state = {}
+    for schedule_row in schedule_rows:
+        if schedule_row.column_id not in state:
+            state[schedule_row.column_id] = schedule_row_digest(schedule_row)
+
+    return state
+
+
+def diff_schedule_state(previous_state : Dict[str, str],
+                        current_state  : Dict[str, str]) -> ScheduleDiff:
+    """Compare the row hashes of two imports
+
+    Args:
+        previous_state : row hashes of the last import
+        current_state  : row hashes of the new import
+
+    Returns:
+        Added, removed and changed column names
+    """
+    added     = tuple(column_id for column_id in current_state if column_id not in previous_state)
+    removed   = tuple(column_id for column_id in previous_state if column_id not in current_state)
+    changed   = tuple(column_id for column_id, digest in current_state.items()
+                      if column_id in previous_state and previous_state[column_id] != digest)
+    unchanged = len(current_state) - len(added) - len(changed)
+
+    return ScheduleDiff(added, removed, changed, unchanged)
+
+
+def compiled_schedule_path(file_path : str) -> str:
+    """Get the path of the compiled schedule of a CSV file
+
+    Args:
+        file_path : path of the CSV file
+
+    Returns:
+        Path of the compiled schedule in COMPILED_SCHEDULE_DIR, named after the hash of the CSV file path
+    """
+    file_hash = hashlib.sha1(os.path.normcase(os.path.abspath(file_path)).encode('utf-8')).hexdigest()
+
+    return os.path.join(COMPILED_SCHEDULE_DIR, file_hash + COMPILED_SCHEDULE_SUFFIX)
+
+
+def write_compiled_schedule(schedule_rows : Iterable[ScheduleRow],
+                            compiled_path : str) -> None:
+    """Write a compiled schedule
+
+    File format (little endian):
+        header  : magic, version, row count, key width
+        keys    : column names encoded in UTF-8, padded with zeros to the key width, sorted
+        records : numeric values of each row, in the same order as the keys
+
+    Args:
+        schedule_rows : schedule rows, one row for each column
+        compiled_path : path of the compiled schedule
+    """
+    keys_rows = sorted((schedule_row.column_id.encode('utf-8'), schedule_row) for schedule_row in schedule_rows)
+    key_width = max((len(key) for key, _ in keys_rows), default = 1)
+
+    compiled_dir = os.path.dirname(os.path.abspath(compiled_path))
+    os.makedirs(compiled_dir, exist_ok = True)
+
+    # The file is replaced at once, the readers never see a partial file. The temporary file
+    # has a unique name, two sessions compiling the same schedule don't write in the same file
+    file_descriptor, temp_path = tempfile.mkstemp(suffix = '.tmp', dir = compiled_dir)
+
+    try:
+        with os.fdopen(file_descriptor, mode='wb') as file:
+            file.write(COMPILED_HEADER.pack(COMPILED_SCHEDULE_MAGIC, COMPILED_SCHEDULE_VERSION, len(keys_rows), key_width))
+
+            for key, _ in keys_rows:
+                file.write(key.ljust(key_width, b'\0'))
+
+            for _, schedule_row in keys_rows:
+                file.write(COMPILED_RECORD.pack(*schedule_row[1:]))
+
+        os.replace(temp_path, compiled_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def compile_schedule(file_path     : str,
+                     compiled_path : Optional[str] = None) -> str:
+    """Compile a CSV schedule
+
+    Args:
+        file_path     : path of the CSV file
+        compiled_path : path of the compiled schedule, in COMPILED_SCHEDULE_DIR by default
+
+    Returns:
+        Path of the compiled schedule
+    """
+    compiled_path = compiled_path or compiled_schedule_path(file_path)
+
+    write_compiled_schedule(read_schedule_index(file_path).values(), compiled_path)
+
+    return compiled_path
+
+
+class CompiledSchedule:
+    """Definition of class CompiledSchedule
+
+    Read-only view of a compiled schedule, the file is memory-mapped and searched by bisection.
+    """
+    def __init__(self,
+                 compiled_path : str):
+        with open(compiled_path, mode='rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+        try:
+            magic, version, self.count, self.key_width = COMPILED_HEADER.unpack_from(self.data, 0)
+        except struct.error:
+            self.data.close()
+            raise ValueError(f"Fichier compilé tronqué : {compiled_path}")
+
+        if magic != COMPILED_SCHEDULE_MAGIC or version != COMPILED_SCHEDULE_VERSION:
+            self.data.close()
+            raise ValueError(f"Format de fichier non supporté : {compiled_path}")
+
+        # A truncated or extended file would give wrong rows
+        if len(self.data) != COMPILED_HEADER.size + self.count * (self.key_width + COMPILED_RECORD.size):
+            self.data.close()
+            raise ValueError(f"Taille de fichier incorrecte : {compiled_path}")
+
+        self.keys_offset    = COMPILED_HEADER.size
+        self.records_offset = self.keys_offset + self.count * self.key_width
+
+
+    def key_at(self, index : int) -> bytes:
+        start = self.keys_offset + index * self.key_width
+
+        return self.data[start:start + self.key_width]
+
+
+    def lookup(self, column_id : str) -> Optional[ScheduleRow]:
+        """Get the schedule row of a column
+
+        Args:
+            column_id : column name
+
+        Returns:
+            Schedule row, None if the column is not in the schedule
+        """
+        key = column_id.encode('utf-8')
+
+        if len(key) > self.key_width:
+            return None
+
+        key  = key.ljust(self.key_width, b'\0')
+        low  = 0
+        high = self.count
+
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.count or self.key_at(low) != key:
+            return None
+
+        values = COMPILED_RECORD.unpack_from(self.data, self.records_offset + low * COMPILED_RECORD.size)
+
+        return ScheduleRow(column_id, *values)
+
+
+    def close(self) -> None:
+        self.data.close()
+
+
+class ScheduleCache:
+    """Definition of class ScheduleCache
+
+    The schedule is parsed once and kept until the file changes (size or modification time).
+    The misses count the parsings of the CSV file, the openings of a compiled file are counted apart.
+    An up to date compiled schedule is used instead of the CSV file, it is written in the local folder
+    COMPILED_SCHEDULE_DIR after each parsing if auto_compile is True. The cache can be used from the schedule loader thread.
+    """
+    def __init__(self,
+                 auto_compile : bool = True):
+        self.auto_compile   = auto_compile
+        self.lock           = threading.RLock()
+        self.entries        = {}
+        self.compiled       = {}
+        self.hits           = 0
+        self.misses         = 0
+        self.compiled_opens = 0
+
+
+    @staticmethod
+    def file_key(file_path : str) -> Tuple[str, int, int]:
+        """Get the cache key of a file
+
+        Args:
+            file_path : path of the file
+
+        Returns:
+            Normalized path, size and modification time
+        """
+        stat = os.stat(file_path)
+
+        return (os.path.normcase(os.path.abspath(file_path)), stat.st_size, stat.st_mtime_ns)
+
+
+    def get_index(self, file_path : str) -> Dict[str, ScheduleRow]:
+        """Get the schedule index, the file is parsed only if it changed since the last call
+
+        Args:
+            file_path : path of the CSV file
+
+        Returns:
+            Dictionary {column name: schedule row}
+        """
+        with self.lock:
+            key   = self.file_key(file_path)
+            entry = self.entries.get(key[0])
+
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            index = read_schedule_index(file_path)
+            self.entries[key[0]] = (key, index)
+
+            if self.auto_compile:
+                try:
+                    write_compiled_schedule(index.values(), compiled_schedule_path(file_path))
+                except (OSError, struct.error):
+                    # Full local folder, compiled file in use or out of range value, the CSV file remains the reference
+                    pass
+
+            return index
+
+
+    def get_compiled(self, file_path : str) -> Optional[CompiledSchedule]:
+        """Get the compiled schedule of a CSV file
+
+        Args:
+            file_path : path of the CSV file
+
+        Returns:
+            Compiled schedule, None if it doesn't exist or is older than the CSV file
+        """
+        with self.lock:
+            compiled_path = compiled_schedule_path(file_path)
+
+            try:
+                compiled_key = self.file_key(compiled_path)
+                if os.stat(file_path).st_mtime_ns > compiled_key[2]:
+                    return None
+            except OSError:
+                return None
+
+            entry = self.compiled.get(compiled_key[0])
+
+            if entry is not None and entry[0] == compiled_key:
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                entry[1].close()
+                del self.compiled[compiled_key[0]]
+
+            try:
+                compiled_schedule = CompiledSchedule(compiled_path)
+            except (OSError, ValueError, struct.error):
+                # Truncated or corrupt file, compiled again from the CSV file
+                return self.recompile(file_path) if self.auto_compile else None
+
+            # Opening a compiled file is not a parsing, it is counted apart from the misses
+            self.compiled_opens += 1
+            self.compiled[compiled_key[0]] = (compiled_key, compiled_schedule)
+
+            return compiled_schedule
+
+
+    def recompile(self, file_path : str) -> Optional[CompiledSchedule]:
+        """Write the compiled schedule again and open it
+
+        Args:
+            file_path : path of the CSV file
+
+        Returns:
+            Compiled schedule, None if it cannot be written or read
+        """
+        with self.lock:
+            compiled_path = compiled_schedule_path(file_path)
+
+            try:
+                write_compiled_schedule(self.get_index(file_path).values(), compiled_path)
+
+                compiled_key      = self.file_key(compiled_path)
+                compiled_schedule = CompiledSchedule(compiled_path)
+            except (OSError, ValueError, struct.error):
+                return None
+
+            self.compiled_opens += 1
+            self.compiled[compiled_key[0]] = (compiled_key, compiled_schedule)
+
+            return compiled_schedule
+
+
+    def lookup(self,
+               file_path : str,
+               column_id : str) -> Optional[ScheduleRow]:
+        """Get the schedule row of a column
+
+        Args:
+            file_path : path of the CSV file
+            column_id : column name
+
+        Returns:
+            Schedule row, None if the column is not in the schedule
+        """
+        with self.lock:
+            compiled_schedule = self.get_compiled(file_path)
+
+            if compiled_schedule is not None:
+                return compiled_schedule.lookup(column_id)
+
+            return self.get_index(file_path).get(column_id)
+
+
+    def clear(self) -> None:
+        with self.lock:
+            for _, compiled_schedule in self.compiled.values():
+                compiled_schedule.close()
+
+            self.entries.clear()
+            self.compiled.clear()
+            self.hits           = 0
+            self.misses         = 0
+            self.compiled_opens = 0
+
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits'           : self.hits,
+                'misses'         : self.misses,
+                'compiled_opens' : self.compiled_opens,
+                'files'          : len(self.entries),
+                'compiled'       : len(self.compiled)
+                }
+
+
+# Cache shared by all the calls of the script
+SCHEDULE_CACHE = ScheduleCache()
+
+
+class ScheduleLoader:
+    """Definition of class ScheduleLoader
+
+    Run the schedule loadings in a worker thread, the result is taken without waiting by a later callback.
+    A new request supersedes the previous one, whose result is never returned.
+    """
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "ScheduleLoader")
+        self.request  = None
+        self.future   : Optional[Future] = None
+
+
+    def submit(self,
+               request       : tuple,
+               load_function : Callable[..., Any],
+               *args) -> None:
+        """Start a loading, nothing is done if the same request is already running
+
+        Args:
+            request       : hashable identifier of the loading
+            load_function : function called in the worker thread
+            args          : arguments of the function
+        """
+        if request == self.request and self.future is not None:
+            return
+
+        self.cancel()
+
+        self.request = request
+        self.future  = self.executor.submit(load_function, *args)
+
+
+    def cancel(self) -> None:
+        """Cancel the current request, a loading already started ends but its result is dropped
+        """
+        if self.future is not None:
+            self.future.cancel()
+
+        self.request = None
+        self.future  = None
+
+
+    def is_pending(self, request : tuple) -> bool:
+        return request == self.request and self.future is not None
+
+
+    def take_result(self, request : tuple) -> Tuple[bool, Any]:
+        """Get the result of a request without waiting
+
+        Args:
+            request : identifier of the loading
+
+        Returns:
+            True and the result if the loading is finished, False and None otherwise.
+            A failed loading is reported and gives True and None.
+        """
+        if not self.is_pending(request) or not self.future.done():
+            return (False, None)
+
+        future = self.future
+
+        self.request = None
+        self.future  = None
+
+        if future.cancelled():
+            return (False, None)
+
+        try:
+            return (True, future.result())
+        except Exception as error:
+            print(f"Erreur de chargement du fichier : {error}")
+            return (True, None)
+
+
+# Loader shared by all the calls of the script
+SCHEDULE_LOADER = ScheduleLoader()
@@ -0,0 +1,74 @@
+# -*- coding: utf8 -*-
+"""Geometries shared between the identical columns of the session
+
+Author:
+    API2GETHER - 2024
+"""
+from collections import OrderedDict
+from typing      import Any, Callable, Dict, Hashable
+
+import threading
+
+
+class GeometryCache:
+    """Definition of class GeometryCache
+
+    Geometries interned by their defining values, the least recently used ones are dropped
+    above max_size. The geometries are shared: they must not be modified in place, the
+    Geometry.Move / Geometry.Transform functions return new objects.
+    """
+    def __init__(self,
+                 max_size : int = 512):
+        self.max_size = max_size
+        self.lock     = threading.RLock()
+        self.entries  = OrderedDict()
+        self.hits     = 0
+        self.misses   = 0
+
+
+    def get(self,
+            key    : Hashable,
+            create : Callable[[], Any]) -> Any:
+        """Get the geometry of a key, created only at the first call
+
+        Args:
+            key    : values defining the geometry
+            create : function creating the geometry
+
+        Returns:
+            Shared geometry
+        """
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+            self.misses += 1
+
+            geometry = create()
+
+            self.entries[key] = geometry
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last = False)
+
+            return geometry
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits   = 0
+            self.misses = 0
+
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits'     : self.hits,
+                'misses'   : self.misses,
+                'entries'  : len(self.entries),
+                'max_size' : self.max_size
+                }
+
+
+# Cache shared by all the scripts
+GEOMETRY_CACHE = GeometryCache()
@@ -0,0 +1,51 @@
+# -*- coding: utf8 -*-
+"""Lazy evaluation of the geometries derived from an element
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, Callable, Dict
+
+
+class GeometryGraph:
+    """Definition of class GeometryGraph
+
+    Each node is computed at its first use, at most once, nodes can use other nodes
+    """
+    def __init__(self):
+        self.nodes  : Dict[str, Callable[[], Any]] = {}
+        self.values : Dict[str, Any]               = {}
+
+
+    def add(self,
+            name    : str,
+            compute : Callable[[], Any]) -> None:
+        """Add a node
+
+        Args:
+            name    : name of the node
+            compute : function computing the value of the node
+        """
+        self.nodes[name] = compute
+        self.values.pop(name, None)
+
+
+    def __getitem__(self,
+                    name : str) -> Any:
+        if name not in self.values:
+            self.values[name] = self.nodes[name]()
+
+        return self.values[name]
+
+
+    def is_computed(self,
+                    name : str) -> bool:
+        """Check if a node was already used
+
+        Args:
+            name : name of the node
+
+        Returns:
+            True/False if the value of the node is computed
+        """
+        return name in self.values
@@ -0,0 +1,196 @@
+# -*- coding: utf8 -*-
+"""Volume, surface and center of gravity of the columns, calculated without the geometry kernel
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, NamedTuple, Optional, Tuple
+
+import math
+
+try:
+    import NemAll_Python_Geometry as Geometry
+except ImportError:
+    Geometry = None
+
+
+# Compare each analytic result with Geometry.CalcMass, the differences are printed in the trace
+VERIFY_WITH_KERNEL = False
+
+# Relative tolerance of the verification
+VERIFY_TOLERANCE = 1e-6
+
+
+class MassProperties(NamedTuple):
+    """Definition of class MassProperties
+    """
+    volume            : float                       # mm3
+    surface           : float                       # mm2, whole surface of the solid
+    center_of_gravity : Tuple[float, float, float]  # mm
+
+
+def cuboid_mass(length : float,
+                thick  : float,
+                height : float,
+                origin : Tuple[float, float, float] = (0, 0, 0)) -> MassProperties:
+    """Mass properties of a cuboid
+
+    Args:
+        length : length along X
+        thick  : thickness along Y
+        height : height along Z
+        origin : lower corner
+
+    Returns:
+        Mass properties
+    """
+    return MassProperties(length * thick * height,
+                          2 * (length * thick + length * height + thick * height),
+                          (origin[0] + length / 2, origin[1] + thick / 2, origin[2] + height / 2))
+
+
+def cylinder_mass(radius : float,
+                  height : float,
+                  origin : Tuple[float, float, float] = (0, 0, 0)) -> MassProperties:
+    """Mass properties of a vertical cylinder
+
+    Args:
+        radius : radius
+        height : height along Z
+        origin : center of the bottom face
+
+    Returns:
+        Mass properties
+    """
+    return MassProperties(math.pi * radius ** 2 * height,
+                          2 * math.pi * radius * (radius + height),
+                          (origin[0], origin[1], origin[2] + height / 2))
+
+
+def kernel_mass(geo : Any) -> Optional[MassProperties]:
+    """Mass properties calculated by the geometry kernel
+
+    Args:
+        geo : solid
+
+    Returns:
+        Mass properties, None without the kernel or if the calculation failed
+    """
+    if Geometry is None or geo is None:
+        return None
+
+    err, volume, surface, center_of_gravity = Geometry.CalcMass(geo)
+
+    if err:
+        return None
+
+    return MassProperties(volume, surface, (center_of_gravity.X, center_of_gravity.Y, center_of_gravity.Z))
+
+
+def verify_mass(mass : MassProperties,
+                geo  : Any) -> bool:
+    """Compare analytic mass properties with the geometry kernel
+
+    Args:
+        mass : analytic mass properties
+        geo  : solid
+
+    Returns:
+        True/False if the properties are the same within the tolerance, True without the kernel
+    """
+    reference = kernel_mass(geo)
+
+    if reference is None:
+        return True
+
+    scale = max(abs(reference.volume) ** (1 / 3), 1)
+
+    is_same = math.isclose(mass.volume, reference.volume, rel_tol = VERIFY_TOLERANCE) and \
+              math.isclose(mass.surface, reference.surface, rel_tol = VERIFY_TOLERANCE) and \
+              all(math.isclose(value, ref_value, rel_tol = VERIFY_TOLERANCE, abs_tol = VERIFY_TOLERANCE * scale)
+                  for value, ref_value in zip(mass.center_of_gravity, reference.center_of_gravity))
+
+    if not is_same:
+        print(f"Propriétés de masse différentes du noyau : {mass} / {reference}")
+
+    return is_same
+
+
+def column_mass(choice : str,
+                length : float,
+                thick  : float,
+                radius : float,
+                height : float,
+                geo    : Any = None) -> Optional[MassProperties]:
+    """Mass properties of a column, placed on its local origin
+
+    Args:
+        choice : shape of the column, "rectangle" or "circle"
+        length : length of a rectangular column
+        thick  : thickness of a rectangular column
+        radius : radius of a circular column
+        height : height of the column
+        geo    : solid of the column, used for the other shapes and for the verification
+
+    Returns:
+        Mass properties, None if the shape is not analytic and the kernel is not available
+    """
+    if choice == "rectangle":
+        mass = cuboid_mass(length, thick, height)
+    elif choice == "circle":
+        mass = cylinder_mass(radius, height)
+    else:
+        return kernel_mass(geo)
+
+    if VERIFY_WITH_KERNEL and geo is not None:
+        verify_mass(mass, geo)
+
+    return mass
+
+
+def overlap_mass(choice      : str,
+                 length      : float,
+                 thick       : float,
+                 radius      : float,
+                 height      : float,
+                 next_length : float,
+                 next_thick  : float,
+                 next_radius : float,
+                 next_height : float,
+                 geo         : Any = None) -> Optional[MassProperties]:
+    """Mass properties of the overlap between the column moved on top of itself and the next column
+
+    Both columns are centered on the same vertical axis and start at the top of the column.
+
+    Args:
+        choice      : shape of the columns, "rectangle" or "circle"
+        length      : length of the column
+        thick       : thickness of the column
+        radius      : radius of the column
+        height      : height of the column
+        next_length : length of the next column
+        next_thick  : thickness of the next column
+        next_radius : radius of the next column
+        next_height : height of the next column
+        geo         : solid of the overlap, used for the other shapes and for the verification
+
+    Returns:
+        Mass properties, None if the shape is not analytic and the kernel is not available
+    """
+    overlap_height = min(height, next_height)
+
+    if choice == "rectangle":
+        overlap_length = min(length, next_length)
+        overlap_thick  = min(thick, next_thick)
+
+        mass = cuboid_mass(overlap_length, overlap_thick, overlap_height,
+                           ((length - overlap_length) / 2, (thick - overlap_thick) / 2, height))
+    elif choice == "circle":
+        mass = cylinder_mass(min(radius, next_radius), overlap_height, (0, 0, height))
+    else:
+        return kernel_mass(geo)
+
+    if VERIFY_WITH_KERNEL and geo is not None:
+        verify_mass(mass, geo)
+
+    return mass
@@ -20,10 +20,37 @@ from HandleParameterData     import HandleParameterData
 from HandleParameterType     import HandleParameterType
 from HandleProperties        import HandleProperties
 
+from APIHub.parameter_snapshot import ParameterTracker
+from APIHub.result_cache       import ResultCache, result_key
+
 
 print('Load Objects2D')
 
 
+# Parameters of the palette used by the script, read into a snapshot by create_element
+PARAMETERS = ("ChoiceRadioGroup",
+              "LineLength",
+              "RectLength",
+              "RectWidth",
+              "CircleRadius",
+              "UseGlobalProperties",
+              "CommonProperties",
+              "ShowTextCheckBox",
+              "TextHeight",
+              "TextAlignment",
+              "TextOrigin")
+
+# Reads the parameters into a snapshot, the key of the result cache. The script has no palette
+# callback, the dirty set of the tracker is not used
+PARAMETER_TRACKER = ParameterTracker(PARAMETERS)
+
+# Quantity of builds of create_element kept, see RESULT_CACHE.stats() for the hit rate
+RESULT_CACHE_SIZE = 16
+
+# Objects and geometries of the last calls of create_element
+RESULT_CACHE = ResultCache(RESULT_CACHE_SIZE)
+
+
 def check_allplan_version(build_ele : BuildingElement,
                           version   : float) -> bool:
     """Check the current Allplan version
@@ -70,38 +97,43 @@ def create_element(build_ele : BuildingElement,
     Returns:
         result of the created element
     """
-    model_ele_list = []
-    handle_list    = []
+    params = PARAMETER_TRACKER.take(build_ele)
 
-    pyp_util = PythonPartUtil()
+    # The global properties can be modified outside of the palette
+    global_prop = None
+    if params.UseGlobalProperties:
+        global_prop = BaseElements.CommonProperties()
+        global_prop.GetGlobalProperties()
 
-    # Extract parameters values from palette
-    choice = build_ele.ChoiceRadioGroup.value
+    # Same parameters as a previous call (palette refresh, undo), the object and its geometry are reused
+    object_2d = RESULT_CACHE.get(result_key(params, global_prop), lambda: create_object_2d(params))
+
+    # The elements and the handles are created at each call, Allplan modifies and takes them over
+    return create_object(build_ele, params, object_2d)
+
+
+def create_object_2d(params : tuple) -> "Objects2D":
+    """Creation of the 2D object and of its geometry
 
-    line_length   = build_ele.LineLength.value
-    rect_length   = build_ele.RectLength.value
-    rect_width    = build_ele.RectWidth.value
-    circle_radius = build_ele.CircleRadius.value
+    Args:
+        params : snapshot of the parameters
+
+    Returns:
+        2D object
+    """
+    choice = params.ChoiceRadioGroup
 
-    is_showing_annotation = build_ele.ShowTextCheckBox.value
+    line_length   = params.LineLength
+    rect_length   = params.RectLength
+    rect_width    = params.RectWidth
+    circle_radius = params.CircleRadius
 
     # Define common properties
-    if build_ele.UseGlobalProperties.value:
+    if params.UseGlobalProperties:
         com_prop = BaseElements.CommonProperties()
         com_prop.GetGlobalProperties()
     else:
-        com_prop = build_ele.CommonProperties.value
-
-    # Define text properties
-    text_dict = {"Aligner à Gauche" : BasisElements.TextAlignment.eLeftMiddle,
-                 "Centrer"          : BasisElements.TextAlignment.eMiddleMiddle,
-                 "Aligner à Droite" : BasisElements.TextAlignment.eRightMiddle
-                 }
-
-    text_prop           = BasisElements.TextProperties()
-    text_prop.Height    = text_prop.Width = build_ele.TextHeight.value
-    text_prop.Alignment = text_dict[build_ele.TextAlignment.value]
-    text_origin         = build_ele.TextOrigin.value
+        com_prop = params.CommonProperties
 
     # Create 2D object
     if choice == "line":
@@ -113,6 +145,44 @@ def create_element(build_ele : BuildingElement,
 
     object_2d.create_geo()
 
+    return object_2d
+
+
+def create_object(build_ele : BuildingElement,
+                  params    : tuple,
+                  object_2d : "Objects2D") -> CreateElementResult:
+    """Creation of the PythonPart
+
+    Args:
+        build_ele : the building element
+        params    : snapshot of the parameters
+        object_2d : the 2D object
+
+    Returns:
+        result of the created element
+    """
+    model_ele_list = []
+    handle_list    = []
+
+    pyp_util = PythonPartUtil()
+
+    # Extract parameters values from palette
+    is_showing_annotation = params.ShowTextCheckBox
+
+    # Define common properties
+    com_prop = object_2d.object_2d_prop
+
+    # Define text properties
+    text_dict = {"Aligner à Gauche" : BasisElements.TextAlignment.eLeftMiddle,
+                 "Centrer"          : BasisElements.TextAlignment.eMiddleMiddle,
+                 "Aligner à Droite" : BasisElements.TextAlignment.eRightMiddle
+                 }
+
+    text_prop           = BasisElements.TextProperties()
+    text_prop.Height    = text_prop.Width = params.TextHeight
+    text_prop.Alignment = text_dict[params.TextAlignment]
+    text_origin         = params.TextOrigin
+
     # Add object to view
     pyp_util.add_pythonpart_view_2d(object_2d.add_view())
 
@@ -4,6 +4,8 @@
 Author:
     Christophe MAIGNAN @ API2GETHER - 2023
 """
+from typing import Tuple
+
 import math
 
 import NemAll_Python_BaseElements       as BaseElements
@@ -24,10 +26,51 @@ from HandleParameterData     import HandleParameterData
 from HandleParameterType     import HandleParameterType
 from HandleProperties        import HandleProperties
 
+from APIHub.geometry_cache     import GEOMETRY_CACHE
+from APIHub.geometry_graph     import GeometryGraph
+from APIHub.mass_properties    import column_mass
+from APIHub.parameter_snapshot import ParameterTracker
+from APIHub.rebar_tables       import CONCRETE_GRADE_NAMES
+from APIHub.result_cache       import ResultCache, result_key
+from APIHub.tessellation       import chord_tolerance, circle_polygon
+
 
 print('Load Objects3D')
 
 
+# Parameters of the palette used by the script, read into a snapshot by create_element
+PARAMETERS = ("ColumnId",
+              "ConcreteGrade",
+              "ChoiceRadioGroup",
+              "ColumnLength",
+              "ColumnThick",
+              "ColumnRadius",
+              "ColumnHeight",
+              "PlaneReferences",
+              "AttachmentPoint",
+              "UseGlobalProperties",
+              "CommonProperties",
+              "HatchCheckBox",
+              "HatchStyle",
+              "FillCheckBox",
+              "FillColor",
+              "ShowTextCheckBox",
+              "TextCommonProperties",
+              "TextHeight",
+              "TextAlignment",
+              "TextOrigin")
+
+# Reads the parameters into a snapshot, the key of the result cache. The script has no palette
+# callback, the dirty set of the tracker is not used
+PARAMETER_TRACKER = ParameterTracker(PARAMETERS)
+
+# Quantity of builds of create_element kept, see RESULT_CACHE.stats() for the hit rate
+RESULT_CACHE_SIZE = 16
+
+# Columns and geometries of the last calls of create_element
+RESULT_CACHE = ResultCache(RESULT_CACHE_SIZE)
+
+
 def check_allplan_version(build_ele : BuildingElement,
                           version   : float) -> bool:
     """Check the current Allplan version
@@ -71,6 +114,81 @@ def create_element(build_ele : BuildingElement,
         build_ele : the building element
         doc       : input document
 
+    Returns:
+        result of the created element
+    """
+    params = PARAMETER_TRACKER.take(build_ele)
+
+    # The global properties can be modified outside of the palette
+    global_prop = None
+    if params.UseGlobalProperties:
+        global_prop = BaseElements.CommonProperties()
+        global_prop.GetGlobalProperties()
+
+    # Same parameters and elevations as a previous call (palette refresh, undo), the column and its geometries
+    # are reused. The plane references are keyed by their elevations in the document
+    my_column, geometry = RESULT_CACHE.get(result_key(params, global_prop), lambda: create_column(params))
+
+    # The elements and the handles are created at each call, Allplan modifies and takes them over
+    return create_object(build_ele, params, my_column, geometry)
+
+
+def create_column(params : tuple) -> Tuple["Objects3D", GeometryGraph]:
+    """Creation of the column and of its lazy geometries
+
+    Args:
+        params : snapshot of the parameters
+
+    Returns:
+        Column and its geometry graph
+    """
+    choice = params.ChoiceRadioGroup
+
+    column_length    = params.ColumnLength
+    column_thickness = params.ColumnThick
+    column_radius    = params.ColumnRadius
+    column_height    = params.ColumnHeight
+
+    attach_point = params.AttachmentPoint
+
+    plane_ref: ArchElements.PlaneReferences = params.PlaneReferences
+    column_bottom = plane_ref.GetAbsBottomElevation()
+
+    # Define common properties
+    if params.UseGlobalProperties:
+        com_prop = BaseElements.CommonProperties()
+        com_prop.GetGlobalProperties()
+    else:
+        com_prop = params.CommonProperties
+
+    # Create 3D object
+    if choice == "rectangle":
+        my_column = Cuboid(com_prop, attach_point, column_bottom, column_length, column_thickness, column_height)
+    else:
+        my_column = Cylinder(com_prop, attach_point, column_bottom, column_radius, column_height)
+
+    # The section is only created if the hatch or the fill uses it
+    geometry = GeometryGraph()
+    geometry.add("main_geo",  my_column.create_geo)
+    geometry.add("hatch_geo", my_column.create_hatch_geo)
+
+    my_column.geo = geometry["main_geo"]
+
+    return my_column, geometry
+
+
+def create_object(build_ele : BuildingElement,
+                  params    : tuple,
+                  my_column : "Objects3D",
+                  geometry  : GeometryGraph) -> CreateElementResult:
+    """Creation of the PythonPart
+
+    Args:
+        build_ele : the building element
+        params    : snapshot of the parameters
+        my_column : the column
+        geometry  : geometry graph of the column
+
     Returns:
         result of the created element
     """
@@ -81,62 +199,30 @@ def create_element(build_ele : BuildingElement,
     pyp_util  = PythonPartUtil()
 
     # Extract parameters values from palette
-    column_id = build_ele.ColumnId.value
-
-    column_concrete_gr_value = build_ele.ConcreteGrade.value
-
-    concrete_grade_dict = {1: 'C12/15',
-                           2: 'C16/20',
-                           3: 'C20/25',
-                           4: 'C25/30',
-                           5: 'C30/37',
-                           6: 'C35/45',
-                           7: 'C40/50',
-                           8: 'C45/55',
-                           9: 'C50/60',
-                           10: 'C55/67',
-                           11: 'C60/75',
-                           12: 'C70/85',
-                           13: 'C80/95',
-                           14: 'C90/105',
-                           15: 'C100/115',
-                           }
-    column_concrete_gr = concrete_grade_dict[column_concrete_gr_value]
-
-    choice = build_ele.ChoiceRadioGroup.value
-
-    column_length    = build_ele.ColumnLength.value
-    column_thickness = build_ele.ColumnThick.value
-    column_radius    = build_ele.ColumnRadius.value
-    column_height    = build_ele.ColumnHeight.value
-
-    attach_point = build_ele.AttachmentPoint.value
-
-    plane_ref: ArchElements.PlaneReferences = build_ele.PlaneReferences.value
-    column_bottom = plane_ref.GetAbsBottomElevation()
+    column_id = params.ColumnId
+
+    column_concrete_gr_value = params.ConcreteGrade
+
+    column_concrete_gr = CONCRETE_GRADE_NAMES[column_concrete_gr_value]
 
     # Define common properties
-    if build_ele.UseGlobalProperties.value:
-        com_prop = BaseElements.CommonProperties()
-        com_prop.GetGlobalProperties()
-    else:
-        com_prop = build_ele.CommonProperties.value
+    com_prop = my_column.object_prop
 
     # Define hatch properties
-    has_hatch  = build_ele.HatchCheckBox.value
+    has_hatch  = params.HatchCheckBox
     hatch_prop = BasisElements.HatchingProperties()
-    hatch_prop.HatchID = build_ele.HatchStyle.value
+    hatch_prop.HatchID = params.HatchStyle
 
     # Define fill properties
-    has_fill  = build_ele.FillCheckBox.value
+    has_fill  = params.FillCheckBox
     fill_prop = BasisElements.FillingProperties()
-    fill_prop.FirstColor = BaseElements.GetColorById(build_ele.FillColor.value)
+    fill_prop.FirstColor = BaseElements.GetColorById(params.FillColor)
 
     # Define text properties
-    is_showing_annotation = build_ele.ShowTextCheckBox.value
+    is_showing_annotation = params.ShowTextCheckBox
 
     text_com_prop = BaseElements.CommonProperties()
-    text_com_prop = build_ele.TextCommonProperties.value
+    text_com_prop = params.TextCommonProperties
 
     text_dict = {"Aligner à Gauche" : BasisElements.TextAlignment.eLeftMiddle,
                  "Centrer"          : BasisElements.TextAlignment.eMiddleMiddle,
@@ -144,17 +230,9 @@ def create_element(build_ele : BuildingElement,
                  }
 
     text_prop           = BasisElements.TextProperties()
-    text_prop.Height    = text_prop.Width = build_ele.TextHeight.value
-    text_prop.Alignment = text_dict[build_ele.TextAlignment.value]
-    text_origin         = build_ele.TextOrigin.value
-
-    # Create 3D object
-    if choice == "rectangle":
-        my_column = Cuboid(com_prop, attach_point, column_bottom, column_length, column_thickness, column_height)
-    else:
-        my_column = Cylinder(com_prop, attach_point, column_bottom, column_radius, column_height)
-
-    my_column.create_geo()
+    text_prop.Height    = text_prop.Width = params.TextHeight
+    text_prop.Alignment = text_dict[params.TextAlignment]
+    text_origin         = params.TextOrigin
 
     # Add object to view
     pyp_util.add_pythonpart_view_2d3d(my_column.add_view())
@@ -190,11 +268,11 @@ def create_element(build_ele : BuildingElement,
 
     # Create hatch
     if has_hatch:
-        pyp_util.add_pythonpart_view_2d(BasisElements.HatchingElement(com_prop, hatch_prop, my_column.create_hatch_geo()))
+        pyp_util.add_pythonpart_view_2d(BasisElements.HatchingElement(com_prop, hatch_prop, geometry["hatch_geo"]))
 
     # Create fill
     if has_fill:
-        pyp_util.add_pythonpart_view_2d(BasisElements.FillingElement(com_prop, fill_prop, my_column.create_hatch_geo()))
+        pyp_util.add_pythonpart_view_2d(BasisElements.FillingElement(com_prop, fill_prop, geometry["hatch_geo"]))
 
     #
     # Add attributes
@@ -342,24 +420,37 @@ class Cuboid(Objects3D):
         radius    = 0
         height    = self.column_height * 1e-3
         surface   = length * thickness
-        volume    = surface * height
+        volume    = column_mass("rectangle", self.column_length, self.column_thick, 0, self.column_height).volume * 1e-9
 
         return (length, thickness, radius, height, surface, volume)
 
 
     def create_geo(self):
+        # Identical columns share the same BRep
+        self.geo = GEOMETRY_CACHE.get(("cuboid_brep", self.column_length, self.column_thick, self.column_height),
+                                      self.create_base_geo)
+
+        return self.geo
+
+
+    def create_base_geo(self):
         placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
                                              Geometry.Vector3D(1, 0, 0),
                                              Geometry.Vector3D(0, 0, 1)
                                              )
-        self.geo  = Geometry.BRep3D.CreateCuboid(placement,
-                                                 self.column_length,
-                                                 self.column_thick,
-                                                 self.column_height
-                                                 )
+
+        return Geometry.BRep3D.CreateCuboid(placement,
+                                            self.column_length,
+                                            self.column_thick,
+                                            self.column_height
+                                            )
 
 
     def create_hatch_geo(self):
+        return GEOMETRY_CACHE.get(("rectangle_section", self.column_length, self.column_thick), self.create_section_geo)
+
+
+    def create_section_geo(self):
         hatch_geo = Geometry.Polygon2D.CreateRectangle(Geometry.Point2D(),
                                                        Geometry.Point2D(self.column_length, self.column_thick)
                                                        )
@@ -422,40 +513,33 @@ class Cylinder(Objects3D):
         radius    = self.column_radius * 1e-3
         height    = self.column_height * 1e-3
         surface   = math.pi * radius ** 2
-        volume    = surface * height
+        volume    = column_mass("circle", 0, 0, self.column_radius, self.column_height).volume * 1e-9
 
         return (length, thickness, radius, height, surface, volume)
 
 
     def create_geo(self):
+        # Identical columns share the same cylinder
+        self.geo = GEOMETRY_CACHE.get(("cylinder_3d", self.column_radius, self.column_height), self.create_base_geo)
+
+        return self.geo
+
+
+    def create_base_geo(self):
         placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
                                              Geometry.Vector3D(1, 0, 0),
                                              Geometry.Vector3D(0, 0, 1)
                                              )
-        self.geo  = Geometry.Cylinder3D(placement,
-                                        self.column_radius,
-                                        self.column_radius,
-                                        Geometry.Point3D(0, 0, self.column_height)
-                                        )
 
+        return Geometry.Cylinder3D(placement,
+                                   self.column_radius,
+                                   self.column_radius,
+                                   Geometry.Point3D(0, 0, self.column_height)
+                                   )
 
-    def create_hatch_geo(self):
-        line          = Geometry.Line3D(0, 0, 0, self.column_radius, 0, 0)
-        angle         = Geometry.Angle()
-        angle.Deg     = 10
-        rotation_axis = Geometry.Line3D(Geometry.Point3D(),
-                                        Geometry.Point3D(0, 0, 1)
-                                        )
-        transformation_matrix = Geometry.Matrix3D()
-
-        hatch_geo  = Geometry.Polygon2D()
-        for i in range(36):
-            transformation_matrix.SetRotation(rotation_axis, angle)
-            line       = Geometry.Transform(line, transformation_matrix)
-            hatch_geo += Geometry.Point2D(line.EndPoint.X, line.EndPoint.Y)
-        hatch_geo += hatch_geo.StartPoint
 
-        return hatch_geo
+    def create_hatch_geo(self):
+        return circle_polygon(self.column_radius, chord_tolerance())
 
 
     def attachment_point(self):
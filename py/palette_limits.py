@@ -0,0 +1,71 @@
+# -*- coding: utf8 -*-
+"""Control properties of the property palette, only pushed when they change
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, Dict, Tuple
+
+
+class PaletteLimits:
+    """Definition of class PaletteLimits
+
+    Min values, max values and enable conditions last pushed to the property palette,
+    the ControlPropertiesUtil functions are only called with a new value
+    """
+    def __init__(self):
+        self.pushed : Dict[Tuple[str, str], str] = {}
+
+
+    def push(self,
+             ctrl_prop_util : Any,
+             function       : str,
+             name           : str,
+             value          : str) -> bool:
+        """Call a function of the control properties utility if the value changed
+
+        Args:
+            ctrl_prop_util : control properties utility
+            function       : name of the function, e.g. "set_max_value"
+            name           : name of the parameter
+            value          : value of the control property
+
+        Returns:
+            True/False if the value was pushed
+        """
+        key = (function, name)
+
+        if self.pushed.get(key) == value:
+            return False
+
+        getattr(ctrl_prop_util, function)(name, value)
+        self.pushed[key] = value
+
+        return True
+
+
+    def set_min_value(self,
+                      ctrl_prop_util : Any,
+                      name           : str,
+                      value          : str) -> bool:
+        return self.push(ctrl_prop_util, "set_min_value", name, value)
+
+
+    def set_max_value(self,
+                      ctrl_prop_util : Any,
+                      name           : str,
+                      value          : str) -> bool:
+        return self.push(ctrl_prop_util, "set_max_value", name, value)
+
+
+    def set_enable_condition(self,
+                             ctrl_prop_util : Any,
+                             name           : str,
+                             value          : str) -> bool:
+        return self.push(ctrl_prop_util, "set_enable_condition", name, value)
+
+
+    def reset(self) -> None:
+        """Forget the pushed values, the palette is created again with the values of the .pyp file
+        """
+        self.pushed.clear()
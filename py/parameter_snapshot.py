@@ -0,0 +1,119 @@
+# -*- coding: utf8 -*-
+"""Snapshot of the parameters used by a script, and the parameters modified since the previous snapshot
+
+Author:
+    API2GETHER - 2024
+"""
+from collections import namedtuple
+from typing      import Any, FrozenSet, Hashable, Sequence, Tuple
+
+
+def freeze_value(value : Any) -> Hashable:
+    """Get a comparable copy of a parameter value
+
+    Args:
+        value : parameter value, lists and named tuples are converted into tuples
+
+    Returns:
+        Hashable value
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+
+    return value
+
+
+class ParameterTracker:
+    """Definition of class ParameterTracker
+
+    The parameters are read into a named tuple, whose fields are the names of the parameters
+    in the .pyp file. The snapshot is compared with the previous one to get the names of the
+    modified parameters.
+    """
+    def __init__(self,
+                 names : Sequence[str]):
+        self.names         = tuple(names)
+        self.snapshot_type = namedtuple("ParameterSnapshot", self.names)
+        self.snapshot      = None
+        self.dirty         = frozenset(self.names)
+
+
+    def take(self,
+             build_ele : Any) -> Tuple:
+        """Read the parameter values, without changing the previous snapshot
+
+        Args:
+            build_ele : the building element
+
+        Returns:
+            Snapshot of the parameter values
+        """
+        return self.snapshot_type._make(freeze_value(getattr(build_ele, name).value) for name in self.names)
+
+
+    def diff(self,
+             snapshot : Tuple) -> FrozenSet[str]:
+        """Compare a snapshot with the previous one
+
+        Args:
+            snapshot : snapshot of the parameter values
+
+        Returns:
+            Names of the modified parameters, all the names without previous snapshot
+        """
+        if self.snapshot is None:
+            return frozenset(self.names)
+
+        return frozenset(name for name, previous, current in zip(self.names, self.snapshot, snapshot)
+                         if previous != current)
+
+
+    def update(self,
+               build_ele : Any) -> Tuple[Tuple, FrozenSet[str]]:
+        """Read the parameter values and keep them for the next comparison
+
+        Args:
+            build_ele : the building element
+
+        Returns:
+            Snapshot of the parameter values, names of the parameters modified since the previous update
+        """
+        snapshot = self.take(build_ele)
+
+        self.dirty    = self.diff(snapshot)
+        self.snapshot = snapshot
+
+        return snapshot, self.dirty
+
+
+    def refresh(self,
+                build_ele : Any) -> Tuple:
+        """Read the parameter values modified by the script, the dirty set of the last update is kept
+
+        Args:
+            build_ele : the building element
+
+        Returns:
+            Snapshot of the parameter values, used by the next comparison
+        """
+        self.snapshot = self.take(build_ele)
+
+        return self.snapshot
+
+
+    def is_dirty(self,
+                 *names : str) -> bool:
+        """Check if one of the parameters was modified by the last update
+
+        Args:
+            names : names of the parameters
+
+        Returns:
+            True/False if one of the parameters is in the dirty set
+        """
+        return not self.dirty.isdisjoint(names)
+
+
+    def reset(self) -> None:
+        self.snapshot = None
+        self.dirty    = frozenset(self.names)
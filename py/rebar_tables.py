@@ -0,0 +1,131 @@
+# -*- coding: utf8 -*-
+"""Precomputed properties of the rebars and of the concrete grades
+
+The tables are built once at import and are read only.
+
+Author:
+    API2GETHER - 2024
+"""
+from types  import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+import functools
+import math
+
+try:
+    import NemAll_Python_Reinforcement as Reinforcement
+except ImportError:
+    Reinforcement = None
+
+
+# Density of the reinforcing steel in kg/m3
+STEEL_DENSITY = 7850
+
+# Diameters of the rebars in mm
+BAR_DIAMETERS = (6, 8, 10, 12, 14, 16, 20, 25, 32, 40)
+
+
+class RebarProperties(NamedTuple):
+    """Definition of class RebarProperties
+    """
+    diameter         : int
+    section          : float    # cm2
+    weight_per_ml    : float    # kg/m
+    mandrel_factor   : int      # mandrel diameter / bar diameter, bending roller of the shape builders
+    mandrel_diameter : int      # mm
+
+
+class ConcreteGrade(NamedTuple):
+    """Definition of class ConcreteGrade
+    """
+    name : str
+    fck  : int      # MPa
+    fcm  : int      # MPa
+    ecm  : float    # GPa
+
+
+def min_mandrel_factor(diameter : float) -> int:
+    """Minimum mandrel diameter of a rebar, as a multiple of the bar diameter (EN 1992-1-1 8.3)
+
+    Args:
+        diameter : diameter in mm
+
+    Returns:
+        Mandrel factor
+    """
+    return 4 if diameter <= 16 else 7
+
+
+def _rebar_properties(diameter : int) -> RebarProperties:
+    section = math.pi * (diameter / 10) ** 2 / 4
+
+    return RebarProperties(diameter,
+                           section,
+                           section * 1e-4 * STEEL_DENSITY,
+                           min_mandrel_factor(diameter),
+                           min_mandrel_factor(diameter) * diameter)
+
+
+def _concrete_grade(fck      : int,
+                    fck_cube : int) -> ConcreteGrade:
+    fcm = fck + 8
+
+    return ConcreteGrade(f"C{fck}/{fck_cube}", fck, fcm, round(22 * (fcm / 10) ** 0.3, 1))
+
+
+REBAR_TABLE : Mapping[int, RebarProperties] = MappingProxyType({diameter: _rebar_properties(diameter)
+                                                                for diameter in BAR_DIAMETERS})
+
+# Concrete grades by index of the ConcreteGrade palette value
+CONCRETE_GRADES : Mapping[int, ConcreteGrade] = MappingProxyType({
+    index: _concrete_grade(fck, fck_cube)
+    for index, (fck, fck_cube) in enumerate(((12, 15), (16, 20), (20, 25), (25, 30), (30, 37),
+                                             (35, 45), (40, 50), (45, 55), (50, 60), (55, 67),
+                                             (60, 75), (70, 85), (80, 95), (90, 105), (100, 115)), 1)})
+
+CONCRETE_GRADE_NAMES : Mapping[int, str] = MappingProxyType({index: grade.name
+                                                             for index, grade in CONCRETE_GRADES.items()})
+
+
+def rebar_properties(diameter : float) -> RebarProperties:
+    """Get the properties of a rebar
+
+    Args:
+        diameter : diameter in mm
+
+    Returns:
+        Properties of the rebar, computed for the diameters out of the table
+    """
+    properties = REBAR_TABLE.get(diameter)
+
+    return properties if properties is not None else _rebar_properties(diameter)
+
+
+def concrete_grade(grade_index : int) -> Optional[ConcreteGrade]:
+    """Get the properties of a concrete grade
+
+    Args:
+        grade_index : index of the concrete grade in the palette
+
+    Returns:
+        Properties of the concrete grade, None if the index is unknown
+    """
+    return CONCRETE_GRADES.get(grade_index)
+
+
+@functools.lru_cache(maxsize = None)
+def bar_weight(steel_grade : int,
+               diameter    : float) -> float:
+    """Weight per metre of a rebar, the Allplan settings are read once per steel grade and diameter
+
+    Args:
+        steel_grade : steel grade of the rebar
+        diameter    : diameter in mm
+
+    Returns:
+        Weight in kg/m
+    """
+    if Reinforcement is None:
+        return rebar_properties(diameter).weight_per_ml
+
+    return Reinforcement.ReinforcementSettings.GetBarWeight(steel_grade, diameter)
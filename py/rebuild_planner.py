@@ -0,0 +1,45 @@
+# -*- coding: utf8 -*-
+"""Outputs of an element to rebuild after a modification of its parameters
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Dict, Set, Tuple
+
+
+class RebuildPlanner:
+    """Definition of class RebuildPlanner
+
+    Each output depends on a list of parameters, an output has to be rebuilt only
+    if one of its parameters changed since the previous plan
+    """
+    def __init__(self,
+                 dependencies : Dict[str, Tuple[str, ...]]):
+        self.dependencies = dependencies
+        self.values       = {}
+
+
+    def plan(self,
+             snapshot : Tuple) -> Set[str]:
+        """Get the outputs to rebuild and keep the current values for the next plan
+
+        Args:
+            snapshot : snapshot of the parameter values, see ParameterTracker
+
+        Returns:
+            Names of the outputs whose parameters changed
+        """
+        changed_outputs = set()
+
+        for output, names in self.dependencies.items():
+            values = tuple(getattr(snapshot, name) for name in names)
+
+            if self.values.get(output) != values:
+                self.values[output] = values
+                changed_outputs.add(output)
+
+        return changed_outputs
+
+
+    def reset(self) -> None:
+        self.values.clear()
@@ -4,10 +4,12 @@
 Author:
     Christophe MAIGNAN @ API2GETHER - 2024
 """
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 import math
-import csv
+import os
+import sqlite3
+import time
 
 import NemAll_Python_BaseElements       as BaseElements
 import NemAll_Python_BasisElements      as BasisElements
@@ -40,10 +42,265 @@ from StdReinfShapeBuilder.ReinforcementShapeProperties import ReinforcementShape
 from StdReinfShapeBuilder.RotationAngles               import RotationAngles
 from StdReinfShapeBuilder.BarShapePlacementUtil        import BarShapePlacementUtil
 
+from APIHub.geometry_cache     import GEOMETRY_CACHE, GeometryCache
+from APIHub.geometry_graph     import GeometryGraph
+from APIHub.mass_properties    import VERIFY_WITH_KERNEL, MassProperties, column_mass, overlap_mass
+from APIHub.palette_limits     import PaletteLimits
+from APIHub.parameter_snapshot import ParameterTracker
+from APIHub.tessellation       import chord_tolerance, circle_polygon
+from APIHub.rebuild_planner    import RebuildPlanner
+from APIHub.result_cache       import ResultCache, result_key
+from APIHub.column_schedule    import SCHEDULE_CACHE, SCHEDULE_LOADER, ScheduleCache, ScheduleRow, diff_schedule_state, iter_schedule, \
+                                      iter_changed_rows, load_schedule_state, save_schedule_state, schedule_state_of, \
+                                      schedule_state_path
+from APIHub.schedule_store     import is_schedule_store, open_schedule_store, schedule_store_path
+from APIHub.rebar_tables       import CONCRETE_GRADE_NAMES, bar_weight, rebar_properties
+from APIHub.reinf_store        import ReinforcementStore, copy_bar_placement, create_bar_placement, describe_bar_placement, \
+                                      describe_shape_settings, open_reinforcement_store, reinforcement_hash
+from APIHub.reinf_quantities   import VERIFY_QUANTITIES, bars_weight, crosstie_count, stirrup_counts, stirrup_regions, \
+                                      verify_quantities
+from APIHub.column_design      import ComplianceResult, DispositionsInput, RebarLayout, StackStorey, as_real, circ_bar_count_bounds, \
+                                      constructive_dispositions, iter_schedule_compliance, lap_length, layout_bar_count, \
+                                      side_bar_count_bounds, solve_circ_layout, solve_rect_layout, solve_stack_layout
+
 
 print('Load Reinforced Concrete Column')
 
 
+# Number of columns in each row of the grid of a schedule batch
+SCHEDULE_BATCH_COLUMNS_PER_ROW = 20
+
+# Origin of the weight attribute, the weight is estimated without the hooks when the reinforcement is not created
+WEIGHT_ESTIMATE_LABEL = "Estimation sans crochets"
+WEIGHT_REBARS_LABEL   = "Armatures"
+
+# Height of the next column, only its overlap with the column is shown
+NEXT_COLUMN_HEIGHT = 1000
+
+# Delay in seconds between two handle moves of a drag
+HANDLE_SETTLE_DELAY = 0.3
+
+# Parameters of the palette read into the snapshot of the callbacks, the classes of the
+# column and of the reinforcement still read the building element
+COLUMN_PARAMETERS = ("ColumnId",
+                     "ConcreteGrade",
+                     "ChoiceRadioGroup",
+                     "ColumnThick",
+                     "ColumnLength",
+                     "ColumnRadius",
+                     "ColumnHeight",
+                     "PlaneReferences",
+                     "SlabHeight",
+                     "NextColumnCheckBox",
+                     "TakeColumnDim",
+                     "NextColumnThick",
+                     "NextColumnLength",
+                     "NextColumnRadius",
+                     "StackCheckBox",
+                     "StoreyCount",
+                     "StoreyList",
+                     "AttachmentPoint",
+                     "ShowHandlesCheckBox",
+                     "HandlePreviewCheckBox",
+                     "ShowTextCheckBox",
+                     "TextCommonProperties",
+                     "TextHeight",
+                     "TextAlignment",
+                     "ShowReinfCheckBox",
+                     "CSVFilePath",
+                     "ScheduleLevel",
+                     "ScheduleBatchCheckBox",
+                     "ScheduleBatchSpacing",
+                     "ScheduleChangedOnlyCheckBox",
+                     "ScheduleValidOnlyCheckBox",
+                     "ReinfConcreteCover",
+                     "AsMinDouble",
+                     "AsRealDouble",
+                     "AsMaxDouble",
+                     "FirstBarDiameter",
+                     "ScndBarAsFirstBar",
+                     "SecondBarDiameter",
+                     "ScndBarRectQttInLength",
+                     "ScndBarRectQttInThick",
+                     "RebarCircQtt",
+                     "MainStirrup",
+                     "StirrupList",
+                     "StterBarQtt",
+                     "StarterBarDiameter",
+                     "StarterBarLength",
+                     "CommonProperties",
+                     "HatchCheckBox",
+                     "HatchStyle",
+                     "FillCheckBox",
+                     "FillColor",
+                     "ChordTolerance",
+                     "DrawingScale",
+                     "MaterialButton",
+                     "ReinfLayerProperties",
+                     "ColumnRotAngleZ",
+                     "TextOrigin",
+                     "TextRotAngle")
+
+# Snapshot of the parameters of the last palette callback, the other callbacks only read the parameters
+PARAMETER_TRACKER = ParameterTracker(COLUMN_PARAMETERS)
+
+# Control properties last pushed to the property palette
+PALETTE_LIMITS = PaletteLimits()
+
+# Parameters modified by the creation of all the columns of the schedule
+SCHEDULE_BATCH_PARAMETERS = ("ScheduleBatchCheckBox",
+                             "ColumnId",
+                             "FirstBarDiameter",
+                             "SecondBarDiameter",
+                             "ScndBarRectQttInLength",
+                             "ScndBarRectQttInThick",
+                             "RebarCircQtt",
+                             "MainStirrup",
+                             "StirrupList",
+                             "AsMinDouble",
+                             "AsMaxDouble",
+                             "AsRealDouble")
+
+# Parameters modified by the creation of the storeys of a stack
+STACK_PARAMETERS = ("StackCheckBox",
+                    "ColumnLength",
+                    "ColumnThick",
+                    "ColumnRadius",
+                    "ColumnHeight",
+                    "NextColumnCheckBox",
+                    "NextColumnLength",
+                    "NextColumnThick",
+                    "NextColumnRadius",
+                    "StarterBarDiameter",
+                    "StterBarQtt",
+                    "StarterBarLength")
+
+
+class ColumnBuildCache:
+    """Definition of class ColumnBuildCache
+
+    Geometry and reinforcement shared between identical columns of a batch and between the calls
+    with the same parameters. The bar placements are copied for each use.
+    """
+    def __init__(self):
+        self.geometry      = {}
+        self.reinforcement = {}
+
+
+    def clear(self,
+              output : str) -> None:
+        """Drop the kept values of an output
+
+        Args:
+            output : "geometry" or "reinforcement"
+        """
+        getattr(self, output).clear()
+
+
+# Parameters used by each output of the column, the other parameters only change
+# the placement, the handles, the text and the attributes
+COLUMN_OUTPUT_DEPENDENCIES = {"geometry"      : ("ChoiceRadioGroup",
+                                                 "ColumnLength",
+                                                 "ColumnThick",
+                                                 "ColumnRadius",
+                                                 "ColumnHeight",
+                                                 "NextColumnLength",
+                                                 "NextColumnThick",
+                                                 "NextColumnRadius",
+                                                 "ChordTolerance",
+                                                 "DrawingScale"),
+                              "reinforcement" : ("ChoiceRadioGroup",
+                                                 "ColumnLength",
+                                                 "ColumnThick",
+                                                 "ColumnRadius",
+                                                 "ColumnHeight",
+                                                 "SlabHeight",
+                                                 "NextColumnCheckBox",
+                                                 "NextColumnLength",
+                                                 "NextColumnThick",
+                                                 "NextColumnRadius",
+                                                 "ConcreteGrade",
+                                                 "ReinfConcreteCover",
+                                                 "FirstBarDiameter",
+                                                 "SecondBarDiameter",
+                                                 "ScndBarRectQttInLength",
+                                                 "ScndBarRectQttInThick",
+                                                 "RebarCircQtt",
+                                                 "StarterBarDiameter",
+                                                 "StterBarQtt",
+                                                 "StarterBarLength",
+                                                 "MainStirrup",
+                                                 "StirrupList")
+                              }
+
+
+class HandleBuild:
+    """Definition of class HandleBuild
+
+    Outputs of the previous build reused while the handles move. A move shown as a preview
+    marks the element, the next create_element builds it in full.
+    """
+    def __init__(self):
+        self.planner          = RebuildPlanner(COLUMN_OUTPUT_DEPENDENCIES)
+        self.build_cache      = ColumnBuildCache()
+        self.last_move        = 0.0
+        self.needs_full_build = False
+
+
+    def is_dragging(self) -> bool:
+        """Check if the handle is still moving, the previous move is recent
+
+        Returns:
+            True/False if the previous move is less than HANDLE_SETTLE_DELAY ago
+        """
+        now            = time.monotonic()
+        is_dragging    = now - self.last_move < HANDLE_SETTLE_DELAY
+        self.last_move = now
+
+        return is_dragging
+
+
+    def prepare(self,
+                params : tuple) -> ColumnBuildCache:
+        """Drop the outputs depending on the modified parameters
+
+        Args:
+            params : snapshot of the parameters
+
+        Returns:
+            Geometry and reinforcement still valid
+        """
+        for output in self.planner.plan(params):
+            self.build_cache.clear(output)
+
+        return self.build_cache
+
+
+# Version of "Poteau BA.pyp", the reinforcements stored by another version are created again
+SCRIPT_VERSION = "1.07"
+
+# Keep the generated reinforcement in the folder of the project, between the sessions
+REINF_STORE_ENABLED = True
+
+# Quantity of builds of create_element kept, see RESULT_CACHE.stats() for the hit rate
+RESULT_CACHE_SIZE = 16
+
+# Geometry and reinforcement of the last calls of create_element
+RESULT_CACHE = ResultCache(RESULT_CACHE_SIZE)
+
+# Bending shapes shared by the reinforcements of the session, copied for each use
+SHAPE_CACHE = GeometryCache(max_size = 256)
+
+# Steel grade and hooks resolved by Allplan for each diameter, read once in the session
+SHAPE_SETTINGS_CACHE = GeometryCache(max_size = 64)
+
+# Length of the sides of the reference shapes used to read the settings, in mm
+REFERENCE_SHAPE_LENGTH = 1000.0
+
+# Build kept between the handle moves
+HANDLE_BUILD = HandleBuild()
+
+
 def check_allplan_version(build_ele : BuildingElement,
                           version   : float) -> bool:
     """Check the current Allplan version
@@ -80,7 +337,19 @@ def move_handle(build_ele   : BuildingElement,
     """
     HandlePropertiesService.update_property_value(build_ele, handle_prop, input_pnt)
 
-    return create_element(build_ele, doc)
+    params = PARAMETER_TRACKER.take(build_ele)
+
+    if (params.ScheduleBatchCheckBox and params.CSVFilePath) or params.StackCheckBox:
+        return create_element(build_ele, doc)
+
+    # While dragging, a preview without the bar placements but with the attributes. The last move
+    # can be a preview, the element is then marked and built in full by the next create_element
+    preview = params.HandlePreviewCheckBox and HANDLE_BUILD.is_dragging()
+
+    HANDLE_BUILD.needs_full_build = preview
+
+    # Only the outputs depending on the moved parameter are rebuilt
+    return create_column(build_ele, doc, HANDLE_BUILD.prepare(params), preview = preview, params = params)
 
 
 def initialize_control_properties(build_ele      : BuildingElement,
@@ -94,8 +363,15 @@ def initialize_control_properties(build_ele      : BuildingElement,
         ctrl_prop_util : control properties utility
         doc            : document
     """
+    # The palette is created with the control properties of the .pyp file
+    PALETTE_LIMITS.reset()
+    PARAMETER_TRACKER.reset()
+
     if build_ele.CSVFilePath.value:
-        ctrl_prop_util.set_enable_condition("ImportDataButton", "True")
+        PALETTE_LIMITS.set_enable_condition(ctrl_prop_util, "ImportDataButton", "True")
+
+        # Parse the schedule in the background, the import is then immediate
+        SCHEDULE_LOADER.submit(("preload", build_ele.CSVFilePath.value), preload_schedule, build_ele.CSVFilePath.value)
 
     set_constructive_dispositions(build_ele, ctrl_prop_util)
     calcul_as_real(build_ele)
@@ -118,144 +394,166 @@ def modify_control_properties(build_ele      : BuildingElement,
     Returns:
         True if an update of the property palette is necessary, False otherwise
     """
-    if value_name == "ChoiceRadioGroup":
-        if build_ele.ChoiceRadioGroup.value == "circle":
-            build_ele.ColumnRotAngleZ.value = 0
-            build_ele.TextRotAngle.value    = 0
+    # Parameters modified since the last palette callback, by the palette or the handles
+    params, _ = PARAMETER_TRACKER.update(build_ele)
+
+    update_palette = update_control_properties(build_ele, ctrl_prop_util, value_name, event_id, params)
+
+    # The values written by the script are the previous values of the next callback, a value set back
+    # by the user to its value before the script modification is then seen as modified
+    PARAMETER_TRACKER.refresh(build_ele)
+
+    return update_palette
+
+
+def update_control_properties(build_ele      : BuildingElement,
+                              ctrl_prop_util : ControlPropertiesUtil,
+                              value_name     : str,
+                              event_id       : int,
+                              params         : tuple) -> bool:
+    """Calculate the values depending on the modified values of the property palette
+
+    Args:
+        build_ele      : building element
+        ctrl_prop_util : control properties utility
+        value_name     : name(s) of the modified value (multiple names are separated by ,)
+        event_id       : event ID
+        params         : snapshot of the parameters taken at the beginning of the callback
+
+    Returns:
+        True if an update of the property palette is necessary, False otherwise
+    """
+    value_names = value_name.split(",")
 
-            return True
+    # Apply the schedule row loaded in the background since the last call
+    update_palette = apply_loaded_schedule_row(build_ele, ctrl_prop_util)
 
     if event_id == build_ele.IMPORT_REINF_DATA_FROM_CSV:
-        # Path of CSV file
-        csv_file_path = build_ele.CSVFilePath.value
-
-        # Opening and reading the CSV file
-        with open(csv_file_path, mode='r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-
-            # Iterating over each row in the CSV file
-            for row in csv_reader:
-                # Search column name
-                if row['Repère'] == build_ele.ColumnId.value:
-                    # Extracting the required data
-                    long_rebars_diameter = row.get('Diamètre Armatures Longitudinales', '').strip()
-                    long_rebars_quantity = row.get('Quantité Armatures Longitudinales', '').strip()
-                    stir_rebars_diameter = row.get('Diamètre Armatures Transversales', '').strip()
-                    A_stirrup_spacing    = row.get('Espacement A Armatures Transversales', '').strip()
-                    B_stirrup_spacing    = row.get('Espacement B Armatures Transversales', '').strip()
-                    C_stirrup_spacing    = row.get('Espacement C Armatures Transversales', '').strip()
-
-                    # Change value if not empty
-                    if all([long_rebars_diameter, long_rebars_quantity, stir_rebars_diameter, A_stirrup_spacing, B_stirrup_spacing, C_stirrup_spacing]):
-                        long_rebars_diameter = int(long_rebars_diameter)
-                        valid_diameters = [8, 10, 12, 14, 16, 20]
-                        if long_rebars_diameter in valid_diameters:
-                            build_ele.FirstBarDiameter.value  = long_rebars_diameter
-                            build_ele.SecondBarDiameter.value = long_rebars_diameter
-
-                        esp_min = 100
-                        esp_max = 400
-
-                        concr_cover = build_ele.ReinfConcreteCover.value
-
-                        if build_ele.ChoiceRadioGroup.value == "rectangle":
-                            length      = max(build_ele.ColumnLength.value, build_ele.ColumnThick.value) - 2 * concr_cover
-                            thickness   = min(build_ele.ColumnLength.value, build_ele.ColumnThick.value) - 2 * concr_cover
-                            nbr_rebars  = int(long_rebars_quantity) - 4 # 4 => one main longitudinal rebar for each corner
-
-                            min_value_in_length = max(0, math.ceil(length / esp_max) - 1)
-                            max_value_in_length = max(min_value_in_length, math.floor(length / esp_min) - 1)
-
-                            min_value_in_thick = max(0, math.ceil(thickness / esp_max) - 1)
-                            max_value_in_thick = max(min_value_in_thick, math.floor(thickness / esp_min) - 1)
-
-                            init_qtt_in_length = max(min_value_in_length, math.ceil((nbr_rebars - 2 * min_value_in_thick) / 2))
-                            init_qtt_in_thick  = min_value_in_thick
-
-                            if init_qtt_in_length > max_value_in_length:
-                                build_ele.ScndBarRectQttInLength.value = max_value_in_length
-                                init_qtt_in_thick = nbr_rebars - 2 * max_value_in_length
-                            else:
-                                build_ele.ScndBarRectQttInLength.value = init_qtt_in_length
-
-                            if init_qtt_in_thick > max_value_in_thick:
-                                build_ele.ScndBarRectQttInThick.value = max_value_in_thick
-                            else:
-                                build_ele.ScndBarRectQttInThick.value = init_qtt_in_thick
-
-                            main_stirrup_max_spac = min(20 * build_ele.FirstBarDiameter.value, 400, min(build_ele.ColumnLength.value, build_ele.ColumnThick.value))
-
-                        else:
-                            nbr_rebars = int(long_rebars_quantity)
-                            diameter   = 2 * math.pi * (build_ele.ColumnRadius.value - concr_cover)
-
-                            min_value_circ = max(4, math.ceil(diameter / esp_max))
-                            max_value_circ = max(min_value_circ, math.floor(diameter / esp_min))
-
-                            nbr_rebars = max(min_value_circ, min(nbr_rebars, max_value_circ))
-                            build_ele.RebarCircQtt.value = nbr_rebars
-
-                            main_stirrup_max_spac = min(20 * build_ele.FirstBarDiameter.value, 400, 2 * build_ele.ColumnRadius.value)
-
-                        # Stirrup diameter and spacing
-                        scnd_stirrup_max_spac = 0.6 * main_stirrup_max_spac
-
-                        ctrl_prop_util.set_max_value("MainStirrup", f",10,{main_stirrup_max_spac}")
-                        ctrl_prop_util.set_max_value("StirrupList", f",{scnd_stirrup_max_spac},,")
-
-                        A_stirrup_spacing = min(main_stirrup_max_spac, float(A_stirrup_spacing))
-                        B_stirrup_spacing = min(scnd_stirrup_max_spac, float(B_stirrup_spacing))
-                        C_stirrup_spacing = min(scnd_stirrup_max_spac, float(C_stirrup_spacing))
-
-                        main_stirrup = build_ele.MainStirrup.value
-                        main_stirrup = main_stirrup._replace(Spacing = A_stirrup_spacing)
-                        valid_diameters = [6, 8, 10]
-                        stir_rebars_diameter = int(stir_rebars_diameter)
-                        if stir_rebars_diameter in valid_diameters:
-                            main_stirrup = main_stirrup._replace(Diameter = stir_rebars_diameter)
-                        build_ele.MainStirrup.value = main_stirrup
-
-                        stirrup_list    = build_ele.StirrupList.value
-                        stirrup_list[0] = stirrup_list[0]._replace(Spacing = B_stirrup_spacing)
-                        stirrup_list[1] = stirrup_list[1]._replace(Spacing = C_stirrup_spacing)
-                        break
+        # Search column name in the schedule, in the background to keep the palette responsive
+        SCHEDULE_LOADER.submit(schedule_request(build_ele),
+                               load_schedule_row,
+                               build_ele.CSVFilePath.value,
+                               build_ele.ScheduleLevel.value,
+                               build_ele.ColumnId.value)
 
-        calcul_as_real(build_ele)
+        # The palette is never blocked, the row is applied by the next callback of the palette
+        return update_palette
 
-        return True
+    if event_id == build_ele.SAVE_SCHEDULE_STATE:
+        # Save the row hashes, the next batch only creates the columns changed since now
+        state_path     = schedule_state_path(build_ele.CSVFilePath.value, build_ele.ScheduleLevel.value)
+        schedule_state = schedule_state_of(iter_schedule_rows(build_ele))
+        schedule_diff  = diff_schedule_state(load_schedule_state(state_path), schedule_state)
+
+        save_schedule_state(schedule_state, state_path)
+
+        print(f"{len(schedule_diff.added)} poteau(x) ajouté(s), {len(schedule_diff.changed)} modifié(s), "
+              f"{len(schedule_diff.removed)} supprimé(s), {schedule_diff.unchanged} inchangé(s) depuis le dernier enregistrement")
+
+        return update_palette
+
+    if event_id == build_ele.CHECK_SCHEDULE:
+        # Report of the rows not respecting the constructive dispositions. The schedule has no
+        # section, every row is checked with the section of the palette
+        if build_ele.ChoiceRadioGroup.value == "rectangle":
+            section = f"{build_ele.ColumnLength.value:g} x {build_ele.ColumnThick.value:g} mm"
+        else:
+            section = f"rayon {build_ele.ColumnRadius.value:g} mm"
+
+        print(f"Vérification de tous les poteaux avec la section de la palette : {section}, "
+              f"enrobage {build_ele.ReinfConcreteCover.value:g} mm")
+
+        nbr_rows    = 0
+        nbr_invalid = 0
+
+        for _, result in iter_schedule_compliance_rows(build_ele, iter_schedule_rows(build_ele)):
+            nbr_rows += 1
+            if not result.is_valid:
+                nbr_invalid += 1
+                print(f"{result.column_id} : {', '.join(result.violations)}")
+
+        print(f"{nbr_invalid} poteau(x) non conforme(s) sur {nbr_rows}")
+
+        return update_palette
+
+    if event_id == build_ele.IMPORT_SCHEDULE_STORE:
+        # The rows of the CSV file are imported for the level in the store next to it,
+        # the store then holds the schedules of all the levels of the project
+        csv_path = build_ele.CSVFilePath.value
+
+        if is_schedule_store(csv_path):
+            print("Le fichier sélectionné est déjà une base de données")
+            return update_palette
+
+        store_path = schedule_store_path(csv_path)
+
+        try:
+            nbr_rows = open_schedule_store(store_path, create = True).load_csv(csv_path, build_ele.ScheduleLevel.value)
+        except (OSError, sqlite3.Error, ValueError) as error:
+            # Missing or invalid CSV file, locked or read-only store
+            print(f"Erreur d'importation dans la base de données : {error}")
+            return update_palette
+
+        print(f"{nbr_rows} poteau(x) importé(s) dans {store_path}, niveau \"{build_ele.ScheduleLevel.value}\"")
+
+        return update_palette
 
     if event_id == build_ele.CALC_LONG_REBAR_DIAM:
-        as_min = build_ele.AsMinDouble.value
-        list_diam_mm = [8, 10, 12, 14, 16, 20]
-        dict_section_cm2 = {diam: math.pi * (diam * 0.1 / 2) ** 2 for diam in list_diam_mm}
+        # Lightest layout between As min and As max
         if build_ele.ChoiceRadioGroup.value == "rectangle":
-            nbr_rebars = 4 + 2 * (build_ele.ScndBarRectQttInLength.value + build_ele.ScndBarRectQttInThick.value)
+            layout = solve_rect_layout(build_ele.ColumnLength.value,
+                                       build_ele.ColumnThick.value,
+                                       build_ele.ReinfConcreteCover.value,
+                                       build_ele.AsMinDouble.value,
+                                       build_ele.AsMaxDouble.value,
+                                       build_ele.ScndBarAsFirstBar.value)
         else:
-            nbr_rebars = build_ele.RebarCircQtt.value
+            layout = solve_circ_layout(build_ele.ColumnRadius.value,
+                                       build_ele.ReinfConcreteCover.value,
+                                       build_ele.AsMinDouble.value,
+                                       build_ele.AsMaxDouble.value)
 
-        for diametre, section in dict_section_cm2.items():
-            if section * nbr_rebars >= as_min:
-                build_ele.FirstBarDiameter.value = build_ele.SecondBarDiameter.value = diametre
-                break
+        if layout is not None:
+            build_ele.FirstBarDiameter.value  = layout.frst_bar_diameter
+            build_ele.SecondBarDiameter.value = layout.scnd_bar_diameter
 
-        calcul_as_real(build_ele)
+            if build_ele.ChoiceRadioGroup.value == "rectangle":
+                build_ele.ScndBarRectQttInLength.value = layout.qtt_in_length
+                build_ele.ScndBarRectQttInThick.value  = layout.qtt_in_thick
+            else:
+                build_ele.RebarCircQtt.value = layout.rebar_circ_qtt
 
-        return True
+            # Stirrup spacing depends on the diameters
+            update_palette |= set_constructive_dispositions(build_ele, ctrl_prop_util)
 
-    if value_name in ('ShowReinfCheckBox',
-                      'ChoiceRadioGroup',
-                      'ColumnLength',
-                      'ColumnThick',
-                      'ColumnRadius',
-                      'TakeColumnDim',
-                      'FirstBarDiameter',
-                      'SecondBarDiameter',
-                      'ScndBarAsFirstBar',
-                      'ScndBarRectQttInLength',
-                      'ScndBarRectQttInThick',
-                      'RebarCircQtt',
-                      'MainStirrup',
-                      'StirrupList'):
+        calcul_as_real(build_ele)
+
+        return update_palette or is_palette_modified(build_ele, params)
+
+    # The palette reported values equal to the previous ones, there is nothing to calculate again
+    tracked_names = [name for name in value_names if name in PARAMETER_TRACKER.names]
+
+    if tracked_names and not PARAMETER_TRACKER.is_dirty(*tracked_names):
+        return update_palette
+
+    if "ChoiceRadioGroup" in value_names and params.ChoiceRadioGroup == "circle":
+        build_ele.ColumnRotAngleZ.value = 0
+        build_ele.TextRotAngle.value    = 0
+
+    if not set(value_names).isdisjoint(('ShowReinfCheckBox',
+                                        'ChoiceRadioGroup',
+                                        'ColumnLength',
+                                        'ColumnThick',
+                                        'ColumnRadius',
+                                        'TakeColumnDim',
+                                        'FirstBarDiameter',
+                                        'SecondBarDiameter',
+                                        'ScndBarAsFirstBar',
+                                        'ScndBarRectQttInLength',
+                                        'ScndBarRectQttInThick',
+                                        'RebarCircQtt',
+                                        'MainStirrup',
+                                        'StirrupList')):
 
         if build_ele.TakeColumnDim.value:
             build_ele.NextColumnLength.value = build_ele.ColumnLength.value
@@ -265,23 +563,27 @@ def modify_control_properties(build_ele      : BuildingElement,
         if build_ele.ScndBarAsFirstBar.value:
             build_ele.SecondBarDiameter.value = build_ele.FirstBarDiameter.value
 
-        set_constructive_dispositions(build_ele, ctrl_prop_util)
+        update_palette |= set_constructive_dispositions(build_ele, ctrl_prop_util)
         calcul_as_real(build_ele)
 
-        return True
+        # Only refreshed if a limit or a value calculated above changed
+        return update_palette or is_palette_modified(build_ele, params)
 
-    if value_name == "ColumnRotAngleZ":
-        build_ele.TextRotAngle.value = -build_ele.ColumnRotAngleZ.value
+    if "ColumnRotAngleZ" in value_names:
+        build_ele.TextRotAngle.value = -params.ColumnRotAngleZ
 
-        return True
+        return update_palette or is_palette_modified(build_ele, params)
+
+    if "CSVFilePath" in value_names:
+        # Loadings of the previous file are superseded
+        SCHEDULE_LOADER.cancel()
 
-    if value_name == "CSVFilePath":
-        if build_ele.CSVFilePath.value:
-            ctrl_prop_util.set_enable_condition("ImportDataButton", "True")
+        if params.CSVFilePath:
+            update_palette |= PALETTE_LIMITS.set_enable_condition(ctrl_prop_util, "ImportDataButton", "True")
 
-            return True
+            SCHEDULE_LOADER.submit(("preload", params.CSVFilePath), preload_schedule, params.CSVFilePath)
 
-    return False
+    return update_palette
 
 
 def on_control_event(build_ele : BuildingElement,
@@ -326,6 +628,325 @@ def create_element(build_ele : BuildingElement,
         build_ele : the building element
         doc       : input document
 
+    Returns:
+        result of the created element
+    """
+    params = PARAMETER_TRACKER.take(build_ele)
+
+    is_schedule_batch = params.ScheduleBatchCheckBox and params.CSVFilePath
+
+    # The element was left as a preview by the last handle move
+    if HANDLE_BUILD.needs_full_build:
+        HANDLE_BUILD.needs_full_build = False
+
+        build_cache = ColumnBuildCache()
+    else:
+        # The schedule can be modified outside of the palette, its files are part of the key
+        files_key = schedule_files_key(params) if is_schedule_batch else ()
+
+        # Same parameters and elevations as a previous call (palette refresh, undo), the geometry and the
+        # reinforcement are reused. The plane references are keyed by their elevations in the document
+        build_cache = RESULT_CACHE.get(result_key(params, files_key), ColumnBuildCache)
+
+    # The elements and the handles are created at each call, Allplan modifies and takes them over
+    if is_schedule_batch:
+        return create_schedule_batch(build_ele, doc, build_cache)
+
+    if params.StackCheckBox:
+        return create_stack(build_ele, doc, build_cache)
+
+    return create_column(build_ele, doc, build_cache, params = params)
+
+
+def create_schedule_batch(build_ele   : BuildingElement,
+                          doc         : ElementAdapter.DocumentAdapter,
+                          build_cache : Optional[ColumnBuildCache] = None) -> CreateElementResult:
+    """Creation of one column for each row of the reinforcement schedule
+
+    The columns are placed on a grid, identical rows share the same geometry and reinforcement.
+
+    Args:
+        build_ele   : the building element
+        doc         : input document
+        build_cache : geometry and reinforcement kept between the calls
+
+    Returns:
+        result of the created elements
+    """
+    model_ele_list = []
+
+    # Save the values modified by the schedule
+    saved_values = {name: getattr(build_ele, name).value for name in SCHEDULE_BATCH_PARAMETERS}
+    saved_values["StirrupList"] = list(saved_values["StirrupList"])
+
+    if build_cache is None:
+        build_cache = ColumnBuildCache()
+
+    spacing     = build_ele.ScheduleBatchSpacing.value
+    column_ids  = set()
+
+    schedule_rows = iter_schedule_rows(build_ele)
+
+    # Only the rows added or changed since the saved import state
+    if build_ele.ScheduleChangedOnlyCheckBox.value:
+        state_path    = schedule_state_path(build_ele.CSVFilePath.value, build_ele.ScheduleLevel.value)
+        schedule_rows = iter_changed_rows(schedule_rows, load_schedule_state(state_path), {})
+
+    # Only the rows respecting the constructive dispositions, checked before any geometry is built
+    if build_ele.ScheduleValidOnlyCheckBox.value:
+        schedule_rows = (schedule_row for schedule_row, result in iter_schedule_compliance_rows(build_ele, schedule_rows)
+                         if result.is_valid)
+
+    # Each created column is a single column
+    build_ele.ScheduleBatchCheckBox.value = False
+
+    try:
+        # The schedule is streamed, only the first valid row of each column is used
+        for schedule_row in schedule_rows:
+            if schedule_row.column_id in column_ids:
+                continue
+
+            index = len(column_ids)
+            column_ids.add(schedule_row.column_id)
+
+            build_ele.ColumnId.value = schedule_row.column_id
+
+            apply_schedule_row(build_ele, None, schedule_row)
+            set_constructive_dispositions(build_ele, None)
+            calcul_as_real(build_ele)
+
+            offset = Geometry.Vector3D((index % SCHEDULE_BATCH_COLUMNS_PER_ROW) * spacing,
+                                       (index // SCHEDULE_BATCH_COLUMNS_PER_ROW) * spacing,
+                                       0)
+
+            result = create_column(build_ele, doc, build_cache, offset)
+            model_ele_list.extend(result.elements)
+
+    finally:
+        for name, value in saved_values.items():
+            getattr(build_ele, name).value = value
+
+    return CreateElementResult(model_ele_list, [])
+
+
+def create_stack(build_ele   : BuildingElement,
+                 doc         : ElementAdapter.DocumentAdapter,
+                 build_cache : Optional[ColumnBuildCache] = None) -> CreateElementResult:
+    """Creation of all the storeys of a stack of columns in a single PythonPart
+
+    The longitudinal rebars of the storeys are chosen for the lightest stack, the starter rebars
+    of a storey are the rebars of the storey above. Identical storeys share the same geometry.
+    The hatch, the fill and the text are the ones of the bottom storey. The dimension handles
+    are not created, the dimensions of the storeys are given by the storey list.
+
+    Args:
+        build_ele   : the building element
+        doc         : input document
+        build_cache : geometry and reinforcement kept between the calls
+
+    Returns:
+        result of the created element
+    """
+    choice      = build_ele.ChoiceRadioGroup.value
+    concr_cover = build_ele.ReinfConcreteCover.value
+
+    storeys = [StackStorey(storey.Length, storey.Thick, storey.Radius, storey.Height)
+               for storey in build_ele.StoreyList.value[:build_ele.StoreyCount.value]]
+
+    layouts = solve_stack_layout(choice, storeys, concr_cover, build_ele.ScndBarAsFirstBar.value)
+
+    if layouts is None:
+        print("Aucune disposition des armatures longitudinales ne convient à la pile")
+        return create_column(build_ele, doc, build_cache)
+
+    attr_list   = BuildingElementAttributeList()
+    pyp_util    = PythonPartUtil()
+    handle_list = []
+
+    # Values of the palette, before they are modified by the storeys
+    params = PARAMETER_TRACKER.take(build_ele)
+
+    plane_ref: ArchElements.PlaneReferences = build_ele.PlaneReferences.value
+
+    texture  = BasisElements.TextureDefinition(build_ele.MaterialButton.value)
+    com_prop = build_ele.CommonProperties.value
+
+    reinf_prop       = BaseElements.CommonProperties()
+    reinf_prop.Layer = build_ele.ReinfLayerProperties.value
+
+    # Save the values modified by the storeys
+    saved_values = {name: getattr(build_ele, name).value for name in SCHEDULE_BATCH_PARAMETERS + STACK_PARAMETERS}
+    saved_values["StirrupList"] = list(saved_values["StirrupList"])
+
+    if build_cache is None:
+        build_cache = ColumnBuildCache()
+
+    storey_z      = 0
+    weight        = 0
+    is_estimated  = False
+    bottom_col    = None
+    bottom_center = None
+
+    build_ele.StackCheckBox.value = False
+
+    try:
+        for index, (storey, layout) in enumerate(zip(storeys, layouts)):
+            apply_stack_storey(build_ele, storey, layout,
+                               storeys[index + 1] if index + 1 < len(storeys) else None,
+                               layouts[index + 1] if index + 1 < len(layouts) else None)
+            set_constructive_dispositions(build_ele, None)
+            calcul_as_real(build_ele)
+
+            if choice == "rectangle":
+                column = Cuboid(build_ele, True, com_prop, build_ele.AttachmentPoint.value, plane_ref.GetAbsBottomElevation(),
+                                texture, storey.column_length, storey.column_thick, storey.column_height,
+                                build_ele.ColumnRotAngleZ.value, build_ele.SlabHeight.value)
+                center = Geometry.Point3D(storey.column_length / 2, storey.column_thick / 2, 0)
+            else:
+                column = Cylinder(build_ele, True, com_prop, build_ele.AttachmentPoint.value, plane_ref.GetAbsBottomElevation(),
+                                  texture, storey.column_radius, storey.column_height, build_ele.SlabHeight.value)
+                center = Geometry.Point3D()
+
+            if bottom_col is None:
+                bottom_col, bottom_center = column, center
+
+            # Storeys centered on the bottom storey
+            offset = Geometry.Vector3D(center, bottom_center) + Geometry.Vector3D(0, 0, storey_z)
+
+            geo_key = (choice, storey.column_length, storey.column_thick, storey.column_radius, storey.column_height,
+                       params.ChordTolerance, params.DrawingScale)
+            if geo_key not in build_cache.geometry:
+                build_cache.geometry[geo_key] = column.create_geo()
+
+            pyp_util.add_pythonpart_view_2d3d(BasisElements.ModelElement3D(com_prop, texture,
+                                                                           Geometry.Move(build_cache.geometry[geo_key], offset)))
+
+            if build_ele.ShowReinfCheckBox.value:
+                reinf_ele_list = column.create_reinforcement(build_cache)
+
+                for rebar in reinf_ele_list:
+                    rebar.Move(offset)
+                    rebar.SetCommonProperties(reinf_prop)
+
+                pyp_util.add_reinforcement_elements(reinf_ele_list)
+            else:
+                column.create_reinf_quantities()
+
+            weight       += column.reinf_ele.weight()
+            is_estimated |= column.reinf_ele.is_weight_estimated()
+            storey_z += storey.column_height
+
+    finally:
+        for name, value in saved_values.items():
+            getattr(build_ele, name).value = value
+
+    # Hatch and fill of the bottom storey
+    if params.HatchCheckBox or params.FillCheckBox:
+        hatch_geo = bottom_col.create_hatch_geo()
+
+    if params.HatchCheckBox:
+        hatch_prop         = BasisElements.HatchingProperties()
+        hatch_prop.HatchID = params.HatchStyle
+        pyp_util.add_pythonpart_view_2d(BasisElements.HatchingElement(com_prop, hatch_prop, hatch_geo))
+
+    if params.FillCheckBox:
+        fill_prop            = BasisElements.FillingProperties()
+        fill_prop.FirstColor = BaseElements.GetColorById(params.FillColor)
+        pyp_util.add_pythonpart_view_2d(BasisElements.FillingElement(com_prop, fill_prop, hatch_geo))
+
+    # Rotation of the stack
+    if params.ShowHandlesCheckBox and choice == "rectangle":
+        handle_list.append(create_rotation_handle(bottom_col))
+
+    # Annotation of the bottom storey
+    if params.ShowTextCheckBox:
+        handle_list.append(add_column_text(pyp_util, bottom_col, params))
+
+    # Attribute set object @18358@
+    attr_list.add_attribute(18358, "Column")
+
+    # Code @18199@
+    attr_list.add_attribute(18199, "ReinforcedConcreteColumn")
+
+    # Concrete grade @1905@
+    attr_list.add_attribute(1905, CONCRETE_GRADE_NAMES[build_ele.ConcreteGrade.value])
+
+    # Height in m, as for a single column
+    attr_list.add_attribute(222, storey_z * 1e-3)
+
+    # Weight of bar
+    attr_list.add_attribute(756, weight)
+
+    # Origin of the weight => ALLFA_value_02
+    attr_list.add_attribute(844, WEIGHT_ESTIMATE_LABEL if is_estimated else WEIGHT_REBARS_LABEL)
+
+    attr_list.add_attributes_from_parameters(build_ele)
+    pyp_util.add_attribute_list(attr_list)
+
+    # Reference point
+    placement_mat = Geometry.Matrix3D()
+    if choice == "rectangle":
+        rotation_axis  = Geometry.Line3D(Geometry.Point3D(), Geometry.Point3D(0, 0, 1))
+        rotation_angle = Geometry.Angle.FromDeg(build_ele.ColumnRotAngleZ.value)
+        placement_mat.SetRotation(rotation_axis,rotation_angle)
+    placement_mat.SetTranslation(Geometry.Vector3D(bottom_col.placement_pt))
+
+    return CreateElementResult(pyp_util.create_pythonpart(build_ele, placement_mat), handle_list)
+
+
+def apply_stack_storey(build_ele   : BuildingElement,
+                       storey      : StackStorey,
+                       layout      : RebarLayout,
+                       next_storey : Optional[StackStorey],
+                       next_layout : Optional[RebarLayout]) -> None:
+    """Apply the values of a storey of the stack
+
+    Args:
+        build_ele   : the building element
+        storey      : storey of the stack
+        layout      : longitudinal rebars of the storey
+        next_storey : storey above, None for the top storey
+        next_layout : longitudinal rebars of the storey above
+    """
+    build_ele.ColumnLength.value = storey.column_length
+    build_ele.ColumnThick.value  = storey.column_thick
+    build_ele.ColumnRadius.value = storey.column_radius
+    build_ele.ColumnHeight.value = storey.column_height
+
+    build_ele.FirstBarDiameter.value       = layout.frst_bar_diameter
+    build_ele.SecondBarDiameter.value      = layout.scnd_bar_diameter
+    build_ele.ScndBarRectQttInLength.value = layout.qtt_in_length
+    build_ele.ScndBarRectQttInThick.value  = layout.qtt_in_thick
+    build_ele.RebarCircQtt.value           = layout.rebar_circ_qtt
+
+    build_ele.NextColumnCheckBox.value = next_storey is not None
+
+    # Starter rebars are lapped with the rebars of the storey above
+    if next_storey is not None:
+        build_ele.NextColumnLength.value   = next_storey.column_length
+        build_ele.NextColumnThick.value    = next_storey.column_thick
+        build_ele.NextColumnRadius.value   = next_storey.column_radius
+        build_ele.StarterBarDiameter.value = next_layout.frst_bar_diameter
+        build_ele.StterBarQtt.value        = layout_bar_count(next_layout)
+        build_ele.StarterBarLength.value   = 2 * lap_length(next_layout.frst_bar_diameter)
+
+
+def create_column(build_ele   : BuildingElement,
+                  doc         : ElementAdapter.DocumentAdapter,
+                  build_cache : Optional[ColumnBuildCache] = None,
+                  offset      : Optional[Geometry.Vector3D] = None,
+                  preview     : bool = False,
+                  params      : Optional[tuple] = None) -> CreateElementResult:
+    """Creation of one column
+
+    Args:
+        build_ele   : the building element
+        doc         : input document
+        build_cache : geometry and reinforcement shared between the columns of a batch and the calls
+        offset      : translation of the column in a batch
+        preview     : without the bar placements and the next column, while a handle moves
+        params      : snapshot of the parameters, read from the building element if not given
+
     Returns:
         result of the created element
     """
@@ -335,53 +956,38 @@ def create_element(build_ele : BuildingElement,
     attr_list      = BuildingElementAttributeList()
     pyp_util       = PythonPartUtil()
 
-    # Extract parameters values from palette
-    column_id = build_ele.ColumnId.value
-
-    column_concrete_gr_value = build_ele.ConcreteGrade.value
-
-    concrete_grade_dict = {1: 'C12/15',
-                           2: 'C16/20',
-                           3: 'C20/25',
-                           4: 'C25/30',
-                           5: 'C30/37',
-                           6: 'C35/45',
-                           7: 'C40/50',
-                           8: 'C45/55',
-                           9: 'C50/60',
-                           10: 'C55/67',
-                           11: 'C60/75',
-                           12: 'C70/85',
-                           13: 'C80/95',
-                           14: 'C90/105',
-                           15: 'C100/115',
-                           }
-    column_concrete_gr = concrete_grade_dict[column_concrete_gr_value]
+    # Extract parameters values from palette, the batch and the stack modify them between the columns
+    if params is None:
+        params = PARAMETER_TRACKER.take(build_ele)
 
-    choice = build_ele.ChoiceRadioGroup.value
+    column_concrete_gr_value = params.ConcreteGrade
 
-    column_length    = build_ele.ColumnLength.value
-    column_thickness = build_ele.ColumnThick.value
-    column_radius    = build_ele.ColumnRadius.value
-    column_height    = build_ele.ColumnHeight.value
-    col_z_rotation   = build_ele.ColumnRotAngleZ.value
+    column_concrete_gr = CONCRETE_GRADE_NAMES[column_concrete_gr_value]
 
-    has_next_col    = build_ele.NextColumnCheckBox.value
-    next_col_length = build_ele.NextColumnLength.value
-    next_col_thick  = build_ele.NextColumnThick.value
-    next_col_radius = build_ele.NextColumnRadius.value
+    choice = params.ChoiceRadioGroup
 
-    attach_point = build_ele.AttachmentPoint.value
+    column_length    = params.ColumnLength
+    column_thickness = params.ColumnThick
+    column_radius    = params.ColumnRadius
+    column_height    = params.ColumnHeight
+    col_z_rotation   = params.ColumnRotAngleZ
 
-    plane_ref: ArchElements.PlaneReferences = build_ele.PlaneReferences.value
+    has_next_col    = params.NextColumnCheckBox
+    next_col_length = params.NextColumnLength
+    next_col_thick  = params.NextColumnThick
+    next_col_radius = params.NextColumnRadius
+
+    attach_point = params.AttachmentPoint
+
+    plane_ref: ArchElements.PlaneReferences = params.PlaneReferences
     column_bottom = plane_ref.GetAbsBottomElevation()
 
-    slab_height = build_ele.SlabHeight.value
+    slab_height = params.SlabHeight
 
-    texture = BasisElements.TextureDefinition(build_ele.MaterialButton.value)
+    texture = BasisElements.TextureDefinition(params.MaterialButton)
 
     # Define common properties
-    com_prop = build_ele.CommonProperties.value
+    com_prop = params.CommonProperties
 
     # Define help properties
     help_prop = BaseElements.CommonProperties()
@@ -389,84 +995,62 @@ def create_element(build_ele : BuildingElement,
     help_prop.HelpConstruction = True
 
     # Define reinforcement properties
-    is_showing_reinf = build_ele.ShowReinfCheckBox.value
+    is_showing_reinf = params.ShowReinfCheckBox
     reinf_prop       = BaseElements.CommonProperties()
-    reinf_prop.Layer = build_ele.ReinfLayerProperties.value
+    reinf_prop.Layer = params.ReinfLayerProperties
 
     # Define hatch properties
-    has_hatch  = build_ele.HatchCheckBox.value
+    has_hatch  = params.HatchCheckBox
     hatch_prop = BasisElements.HatchingProperties()
-    hatch_prop.HatchID = build_ele.HatchStyle.value
+    hatch_prop.HatchID = params.HatchStyle
 
     # Define fill properties
-    has_fill  = build_ele.FillCheckBox.value
+    has_fill  = params.FillCheckBox
     fill_prop = BasisElements.FillingProperties()
-    fill_prop.FirstColor = BaseElements.GetColorById(build_ele.FillColor.value)
+    fill_prop.FirstColor = BaseElements.GetColorById(params.FillColor)
 
     # Define text properties
-    is_showing_annotation = build_ele.ShowTextCheckBox.value
-
-    text_com_prop = BaseElements.CommonProperties()
-    text_com_prop = build_ele.TextCommonProperties.value
-
-    text_dict = {"Aligner à Gauche" : BasisElements.TextAlignment.eLeftMiddle,
-                 "Centrer"          : BasisElements.TextAlignment.eMiddleMiddle,
-                 "Aligner à Droite" : BasisElements.TextAlignment.eRightMiddle
-                 }
-
-    text_prop           = BasisElements.TextProperties()
-    text_prop.Height    = text_prop.Width = build_ele.TextHeight.value
-    text_prop.Alignment = text_dict[build_ele.TextAlignment.value]
-    angle               = Geometry.Angle()
-    angle.Deg           = build_ele.TextRotAngle.value
-    text_prop.TextAngle = angle
-
-    text_origin = build_ele.TextOrigin.value
+    is_showing_annotation = params.ShowTextCheckBox
 
     # Define handle properties
-    is_showing_handles = build_ele.ShowHandlesCheckBox.value
+    is_showing_handles = params.ShowHandlesCheckBox
 
     # Create 3D object
     if choice == "rectangle":
         main_column = Cuboid(build_ele, True, com_prop, attach_point, column_bottom, texture, column_length, column_thickness, column_height, col_z_rotation, slab_height)
-        next_column = Cuboid(build_ele, False, help_prop, attach_point, column_height, texture, next_col_length, next_col_thick, 1000, col_z_rotation, slab_height)
-
-        # Constructions line to align center point
-        frst_line   = Geometry.Line3D(0, 0, 0, column_length, column_thickness, 0)
-        scnd_line   = Geometry.Line3D(0, 0, 0, next_col_length, next_col_thick, 0)
-        from_point  = scnd_line.GetCenterPoint()
-        to_point    = frst_line.GetCenterPoint()
-
     else:
         main_column = Cylinder(build_ele, True, com_prop, attach_point, column_bottom, texture, column_radius, column_height, slab_height)
-        next_column = Cylinder(build_ele, False, help_prop, attach_point, column_height, texture, next_col_radius, 1000, slab_height)
 
-        from_point = to_point = Geometry.Point3D()
+    # The hatch of a circular column depends on the tessellation settings
+    geo_key = (choice, column_length, column_thickness, column_radius, column_height, next_col_length, next_col_thick, next_col_radius,
+               params.ChordTolerance, params.DrawingScale)
+
+    # Derived geometries are only computed if a view uses them
+    if build_cache is not None and geo_key in build_cache.geometry:
+        geometry = build_cache.geometry[geo_key]
+    else:
+        geometry = create_geometry_graph(main_column, build_ele)
 
-    main_column.create_geo()
+        if build_cache is not None:
+            build_cache.geometry[geo_key] = geometry
 
-    # Get intersection volume between main and next column
-    base_column = Geometry.Move(main_column.create_geo(), Geometry.Vector3D(0, 0, column_height))
-    next_column = Geometry.Move(next_column.create_geo(), Geometry.Vector3D(from_point, to_point))
-    err, intersect_column = Geometry.Intersect(base_column, next_column)
+    main_column.geo = geometry["main_geo"]
 
     # Add object to view
     pyp_util.add_pythonpart_view_2d3d(main_column.add_view())
 
-    if has_next_col:
-        pyp_util.add_pythonpart_view_2d(BasisElements.ModelElement3D(help_prop, texture, intersect_column))
+    if has_next_col and not preview:
+        pyp_util.add_pythonpart_view_2d(BasisElements.ModelElement3D(help_prop, texture, geometry["intersect_geo"]))
+
+        # The analytic overlap is compared with the kernel in the trace
+        if VERIFY_WITH_KERNEL:
+            print(f"Recouvrement avec le poteau suivant : {geometry['intersect_mass'].volume * 1e-9:.4f} m3")
 
     # Create the handles
     if is_showing_handles:
         # Z rotation
         if choice == "rectangle":
-            handle = HandleProperties(handle_id         = "ColumnRotationHandle",
-                                      handle_point      = main_column.points_list[10],
-                                      ref_point         = main_column.points_list[0],
-                                      handle_param_data = [HandleParameterData("ColumnRotAngleZ", HandleParameterType.ANGLE)],
-                                      handle_move_dir   = HandleDirection.ANGLE,
-                                      info_text         = "Rotation suivant Z")
-            handle_list.append(handle)
+            handle_list.append(create_rotation_handle(main_column))
 
         for item in main_column.handles_prop:
             handle = HandleProperties(handle_id         = item.handle_id,
@@ -481,52 +1065,135 @@ def create_element(build_ele : BuildingElement,
 
     # Create the annotation
     if is_showing_annotation:
-        # Set text value
-        text = f"{column_id} {main_column.name_dim}"
-        if column_concrete_gr_value > 4:
-            text += f"\n{column_concrete_gr}"
-        # Set origin of text
-        origin = text_origin - main_column.points_list[0]
-        # Text remains horizontal
-        placement_mat = Geometry.Matrix3D()
-        if choice == "rectangle":
-            rotation_axis  = Geometry.Line3D(Geometry.Point3D(), Geometry.Point3D(0, 0, 1))
-            rotation_angle = Geometry.Angle.FromDeg(-col_z_rotation)
-            placement_mat.SetRotation(rotation_axis,rotation_angle)
-        origin = Geometry.Transform(origin, placement_mat)
-        # Transform Point3D to Point2D
-        origin = Geometry.Point2D(origin)
-        # Add text to view
-        pyp_util.add_pythonpart_view_2d(BasisElements.TextElement(text_com_prop, text_prop, text, origin))
-
-        text_handle = HandleProperties(handle_id         = "Text",
-                                       handle_point      = text_origin,
-                                       ref_point         = main_column.points_list[0],
-                                       handle_param_data = [HandleParameterData("TextOrigin", HandleParameterType.POINT, False)],
-                                       handle_move_dir   = HandleDirection.XYZ_DIR,
-                                       info_text         = "Origine du texte"
-                                       )
-        text_handle.handle_type = IFWInput.ElementHandleType.HANDLE_SQUARE_RED
-        handle_list.append(text_handle)
+        handle_list.append(add_column_text(pyp_util, main_column, params))
 
     # Create hatch
     if has_hatch:
-        pyp_util.add_pythonpart_view_2d(BasisElements.HatchingElement(com_prop, hatch_prop, main_column.create_hatch_geo()))
+        pyp_util.add_pythonpart_view_2d(BasisElements.HatchingElement(com_prop, hatch_prop, geometry["hatch_geo"]))
 
     # Create fill
     if has_fill:
-        pyp_util.add_pythonpart_view_2d(BasisElements.FillingElement(com_prop, fill_prop, main_column.create_hatch_geo()))
+        pyp_util.add_pythonpart_view_2d(BasisElements.FillingElement(com_prop, fill_prop, geometry["hatch_geo"]))
 
-    # Create reinforcement
-    if is_showing_reinf:
-        reinf_ele_list = main_column.create_reinforcement()
+    # Create reinforcement, not for the preview of a handle move
+    if is_showing_reinf and not preview:
+        reinf_ele_list = main_column.create_reinforcement(build_cache)
 
         # Apply reinforcement properties
         for rebar in reinf_ele_list:
             rebar.SetCommonProperties(reinf_prop)
 
         pyp_util.add_reinforcement_elements(reinf_ele_list)
+    else:
+        # Attributes only, the quantities are calculated without the bar placements
+        main_column.create_reinf_quantities()
+
+    # The weight of a preview is labelled as an estimate
+    add_column_attributes(attr_list, main_column, column_concrete_gr)
+
+    attr_list.add_attributes_from_parameters(build_ele)
+    pyp_util.add_attribute_list(attr_list)
+
+    # Reference point
+    placement_mat = Geometry.Matrix3D()
+    if choice == "rectangle":
+        rotation_axis  = Geometry.Line3D(Geometry.Point3D(), Geometry.Point3D(0, 0, 1))
+        rotation_angle = Geometry.Angle.FromDeg(col_z_rotation)
+        placement_mat.SetRotation(rotation_axis,rotation_angle)
+    placement_mat.SetTranslation(Geometry.Vector3D(main_column.placement_pt))
+    if offset is not None:
+        placement_mat.Translate(offset)
+
+    # Create the PythonPart
+    model_ele_list = pyp_util.create_pythonpart(build_ele, placement_mat)
+
+    return CreateElementResult(model_ele_list, handle_list)
+
+
+def create_rotation_handle(main_column : "Objects3D") -> HandleProperties:
+    """Create the handle of the Z rotation of a rectangular column
+
+    Args:
+        main_column : the column
+
+    Returns:
+        Rotation handle
+    """
+    return HandleProperties(handle_id         = "ColumnRotationHandle",
+                            handle_point      = main_column.points_list[10],
+                            ref_point         = main_column.points_list[0],
+                            handle_param_data = [HandleParameterData("ColumnRotAngleZ", HandleParameterType.ANGLE)],
+                            handle_move_dir   = HandleDirection.ANGLE,
+                            info_text         = "Rotation suivant Z")
+
+
+def add_column_text(pyp_util    : PythonPartUtil,
+                    main_column : "Objects3D",
+                    params      : tuple) -> HandleProperties:
+    """Add the annotation of the column, name, dimensions and concrete grade
+
+    Args:
+        pyp_util    : PythonPart utility
+        main_column : the column
+        params      : snapshot of the parameters
+
+    Returns:
+        Handle of the text origin
+    """
+    text_dict = {"Aligner à Gauche" : BasisElements.TextAlignment.eLeftMiddle,
+                 "Centrer"          : BasisElements.TextAlignment.eMiddleMiddle,
+                 "Aligner à Droite" : BasisElements.TextAlignment.eRightMiddle
+                 }
+
+    text_prop           = BasisElements.TextProperties()
+    text_prop.Height    = text_prop.Width = params.TextHeight
+    text_prop.Alignment = text_dict[params.TextAlignment]
+    angle               = Geometry.Angle()
+    angle.Deg           = params.TextRotAngle
+    text_prop.TextAngle = angle
+
+    text_origin = params.TextOrigin
 
+    # Set text value
+    text = f"{params.ColumnId} {main_column.name_dim}"
+    if params.ConcreteGrade > 4:
+        text += f"\n{CONCRETE_GRADE_NAMES[params.ConcreteGrade]}"
+    # Set origin of text
+    origin = text_origin - main_column.points_list[0]
+    # Text remains horizontal
+    placement_mat = Geometry.Matrix3D()
+    if params.ChoiceRadioGroup == "rectangle":
+        rotation_axis  = Geometry.Line3D(Geometry.Point3D(), Geometry.Point3D(0, 0, 1))
+        rotation_angle = Geometry.Angle.FromDeg(-params.ColumnRotAngleZ)
+        placement_mat.SetRotation(rotation_axis,rotation_angle)
+    origin = Geometry.Transform(origin, placement_mat)
+    # Transform Point3D to Point2D
+    origin = Geometry.Point2D(origin)
+    # Add text to view
+    pyp_util.add_pythonpart_view_2d(BasisElements.TextElement(params.TextCommonProperties, text_prop, text, origin))
+
+    text_handle = HandleProperties(handle_id         = "Text",
+                                   handle_point      = text_origin,
+                                   ref_point         = main_column.points_list[0],
+                                   handle_param_data = [HandleParameterData("TextOrigin", HandleParameterType.POINT, False)],
+                                   handle_move_dir   = HandleDirection.XYZ_DIR,
+                                   info_text         = "Origine du texte"
+                                   )
+    text_handle.handle_type = IFWInput.ElementHandleType.HANDLE_SQUARE_RED
+
+    return text_handle
+
+
+def add_column_attributes(attr_list          : BuildingElementAttributeList,
+                          main_column        : "Objects3D",
+                          column_concrete_gr : str) -> None:
+    """Add the attributes of the column and of its reinforcement
+
+    Args:
+        attr_list          : attribute list of the PythonPart
+        main_column        : the column, with its reinforcement or its quantities
+        column_concrete_gr : name of the concrete grade
+    """
     #
     # Attributes
     #
@@ -534,224 +1201,509 @@ def create_element(build_ele : BuildingElement,
     # Attribute set object @18358@
     attr_list.add_attribute(18358, "Column")
 
-    # Code @18199@
-    attr_list.add_attribute(18199, "ReinforcedConcreteColumn")
+    # Code @18199@
+    attr_list.add_attribute(18199, "ReinforcedConcreteColumn")
+
+    # Trade @209@
+    attr_list.add_attribute(209, 13)
+
+    # Status @49@
+    attr_list.add_attribute(49, 0)
+
+    # Load bearing @573@
+    attr_list.add_attribute(573, 1)
+
+    # Concrete grade @1905@
+    attr_list.add_attribute(1905, column_concrete_gr)
+
+    # Geometry
+    length, thickness, radius, height, surface, volume = main_column.calcul_dimensions()
+
+    attr_list.add_attribute(220, length)
+    attr_list.add_attribute(221, thickness)
+    attr_list.add_attribute(107, radius)
+    attr_list.add_attribute(222, height)
+    attr_list.add_attribute(293, surface)
+    attr_list.add_attribute(226, volume)
+
+    #
+    # Reinforcement attributes
+    #
+
+    weight, quantity, col_concr_cover, height, height_under_beam, \
+        frst_long_rebars, scnd_long_rebars, length_long_rebars, \
+            stirrup_A_placement, stirrup_B_placement, stirrup_C_placement, stirrup_sum_qtt_diam, stirrup_sum_dim, \
+                crosstie_along_length, crosstie_along_thick, \
+                    next_col_dim, start_rebars_qtt, start_rebars_mid_length = main_column.create_reinf_attributes()
+
+    # Weight of bar
+    attr_list.add_attribute(756, weight)
+
+    # Origin of the weight => ALLFA_value_02
+    attr_list.add_attribute(844, WEIGHT_ESTIMATE_LABEL if main_column.reinf_ele.is_weight_estimated() else WEIGHT_REBARS_LABEL)
+
+    # Quantity
+    attr_list.add_attribute(201, quantity)
+
+    # Concrete cover => ALLFA_value_03
+    attr_list.add_attribute(845, col_concr_cover)
+
+    # Column dimensions => ALLFA_value_06
+    attr_list.add_attribute(848, main_column.name_dim)
+
+    # Height => ALLFA_value_07
+    attr_list.add_attribute(849, height)
+
+    # Height under beam => ALLFA_value_08
+    attr_list.add_attribute(850, height_under_beam)
+
+    # First longitudinal rebars => ALLFA_value_09
+    attr_list.add_attribute(851, frst_long_rebars)
+
+    # Second longitudinal rebars => ALLFA_value_10
+    attr_list.add_attribute(852, scnd_long_rebars)
+
+    # Length of longitudinal rebars => ALLFA_value_11
+    attr_list.add_attribute(853, length_long_rebars)
+
+    # Stirrup placement [A] => ALLFA_value_12
+    attr_list.add_attribute(854, stirrup_A_placement)
+
+    # Stirrup placement [B] => ALLFA_value_13
+    attr_list.add_attribute(855, stirrup_B_placement)
+
+    # Stirrup placement [C] => ALLFA_value_14
+    attr_list.add_attribute(856, stirrup_C_placement)
+
+    # Stirrup summary for quantity / diameter => ALLFA_value_15
+    attr_list.add_attribute(857, stirrup_sum_qtt_diam)
+
+    # Stirrup summary for dimensions => ALLFA_value_16
+    attr_list.add_attribute(858, stirrup_sum_dim)
+
+    # Crosstie along length => ALLFA_value_17
+    attr_list.add_attribute(859, crosstie_along_length)
+
+    # Crosstie along thickness => ALLFA_value_18
+    attr_list.add_attribute(860, crosstie_along_thick)
+
+    # Next column dimensions => ALLFA_value_19
+    attr_list.add_attribute(861, next_col_dim)
+
+    # Starter rebars quantity => ALLFA_value_20
+    attr_list.add_attribute(862, start_rebars_qtt)
+
+    # Starter rebars mid length => ALLFA_value_01
+    attr_list.add_attribute(843, start_rebars_mid_length)
+
+
+def create_geometry_graph(main_column : "Objects3D",
+                          build_ele   : BuildingElement) -> GeometryGraph:
+    """Create the lazy geometries of a column
+
+    Nodes:
+        main_geo       : BRep of the column
+        intersect_geo  : overlap between the column moved on top of itself and the next column
+        intersect_mass : mass properties of the overlap, checked against intersect_geo if VERIFY_WITH_KERNEL
+        hatch_geo      : section of the column
+
+    Args:
+        main_column : the column
+        build_ele   : the building element
+
+    Returns:
+        Geometry graph of the column
+    """
+    choice        = build_ele.ChoiceRadioGroup.value
+    column_height = build_ele.ColumnHeight.value
+
+    def create_intersect_geo() -> Geometry.BRep3D:
+        # Both columns are centered on the same axis, the overlap is a cuboid or a cylinder
+        overlap_height = min(column_height, NEXT_COLUMN_HEIGHT)
+
+        if choice == "rectangle":
+            overlap_length = min(build_ele.ColumnLength.value, build_ele.NextColumnLength.value)
+            overlap_thick  = min(build_ele.ColumnThick.value, build_ele.NextColumnThick.value)
+            origin         = Geometry.Point3D((build_ele.ColumnLength.value - overlap_length) / 2,
+                                              (build_ele.ColumnThick.value - overlap_thick) / 2,
+                                              column_height)
+
+            return GEOMETRY_CACHE.get(("cuboid_brep_at", overlap_length, overlap_thick, overlap_height, origin.X, origin.Y, origin.Z),
+                                      lambda: Geometry.BRep3D.CreateCuboid(Geometry.AxisPlacement3D(origin,
+                                                                                                    Geometry.Vector3D(1, 0, 0),
+                                                                                                    Geometry.Vector3D(0, 0, 1)),
+                                                                           overlap_length,
+                                                                           overlap_thick,
+                                                                           overlap_height))
+
+        overlap_radius = min(build_ele.ColumnRadius.value, build_ele.NextColumnRadius.value)
+        origin         = Geometry.Point3D(0, 0, column_height)
+
+        return GEOMETRY_CACHE.get(("cylinder_brep_at", overlap_radius, overlap_height, column_height),
+                                  lambda: Geometry.BRep3D.CreateCylinder(Geometry.AxisPlacement3D(origin,
+                                                                                                  Geometry.Vector3D(1, 0, 0),
+                                                                                                  Geometry.Vector3D(0, 0, 1)),
+                                                                         overlap_radius,
+                                                                         overlap_height))
+
+    def create_intersect_mass() -> MassProperties:
+        return overlap_mass(choice,
+                            build_ele.ColumnLength.value,
+                            build_ele.ColumnThick.value,
+                            build_ele.ColumnRadius.value,
+                            column_height,
+                            build_ele.NextColumnLength.value,
+                            build_ele.NextColumnThick.value,
+                            build_ele.NextColumnRadius.value,
+                            NEXT_COLUMN_HEIGHT,
+                            geometry["intersect_geo"] if VERIFY_WITH_KERNEL else None)
+
+    geometry = GeometryGraph()
+    geometry.add("main_geo",       main_column.create_geo)
+    geometry.add("intersect_geo",  create_intersect_geo)
+    geometry.add("intersect_mass", create_intersect_mass)
+    geometry.add("hatch_geo",      main_column.create_hatch_geo)
+
+    return geometry
+
+
+def set_constructive_dispositions(build_ele      : BuildingElement,
+                                  ctrl_prop_util : ControlPropertiesUtil) -> bool:
+    """Apply the constructive dispositions
+
+    Args:
+        build_ele      : the building element
+        ctrl_prop_util : control properties utility, None outside of the property palette
+
+    Returns:
+        True if a limit of the property palette changed
+    """
+    is_limit_modified = False
+
+    stirrup_list = build_ele.StirrupList.value
+
+    # Calcul is cached, only a change of the inputs costs something
+    dispositions = constructive_dispositions(DispositionsInput(build_ele.ChoiceRadioGroup.value,
+                                                               build_ele.ColumnLength.value,
+                                                               build_ele.ColumnThick.value,
+                                                               build_ele.ColumnRadius.value,
+                                                               build_ele.ReinfConcreteCover.value,
+                                                               build_ele.FirstBarDiameter.value,
+                                                               build_ele.SecondBarDiameter.value,
+                                                               build_ele.ScndBarRectQttInLength.value,
+                                                               build_ele.ScndBarRectQttInThick.value,
+                                                               build_ele.RebarCircQtt.value,
+                                                               stirrup_list[0][1]))
+
+    if build_ele.ChoiceRadioGroup.value == "rectangle":
+        build_ele.ScndBarRectQttInLength.value = dispositions.qtt_in_length
+        build_ele.ScndBarRectQttInThick.value  = dispositions.qtt_in_thick
+
+        if ctrl_prop_util is not None:
+            is_limit_modified |= set_quantity_bounds(ctrl_prop_util, "ScndBarRectQttInLength", dispositions.bounds_in_length)
+            is_limit_modified |= set_quantity_bounds(ctrl_prop_util, "ScndBarRectQttInThick", dispositions.bounds_in_thick)
+
+    else:
+        build_ele.RebarCircQtt.value = dispositions.rebar_circ_qtt
+
+        if ctrl_prop_util is not None:
+            is_limit_modified |= set_quantity_bounds(ctrl_prop_util, "RebarCircQtt", dispositions.bounds_circ)
+
+    # As min and As max in cm²
+    build_ele.AsMinDouble.value = dispositions.as_min
+    build_ele.AsMaxDouble.value = dispositions.as_max
+
+    # Set distance between stirrups
+    if ctrl_prop_util is not None:
+        is_limit_modified |= PALETTE_LIMITS.set_max_value(ctrl_prop_util, "MainStirrup", f",10,{dispositions.main_stirrup_max_dist}")
+        is_limit_modified |= PALETTE_LIMITS.set_max_value(ctrl_prop_util, "StirrupList", f",{dispositions.end_stirrup_max_dist},,")
+
+    stirrup_list[0] = stirrup_list[0]._replace(Length = dispositions.bottom_stirrup_length)
+    stirrup_list[1] = stirrup_list[1]._replace(Length = dispositions.top_stirrup_length)
+
+    return is_limit_modified
+
+
+def set_quantity_bounds(ctrl_prop_util : ControlPropertiesUtil,
+                        name           : str,
+                        bounds         : Tuple[int, int]) -> bool:
+    """Change the min and max values if they are different, otherwise reset and lock the value
+
+    Args:
+        ctrl_prop_util : control properties utility
+        name           : name of the quantity parameter
+        bounds         : min and max values
+
+    Returns:
+        True if a control property changed
+    """
+    min_value, max_value = bounds
+
+    if min_value != max_value:
+        limits = (str(min_value), str(max_value), "True")
+    else:
+        limits = ("0", "10", "False")
+
+    is_min_modified    = PALETTE_LIMITS.set_min_value(ctrl_prop_util, name, limits[0])
+    is_max_modified    = PALETTE_LIMITS.set_max_value(ctrl_prop_util, name, limits[1])
+    is_enable_modified = PALETTE_LIMITS.set_enable_condition(ctrl_prop_util, name, limits[2])
+
+    return is_min_modified or is_max_modified or is_enable_modified
+
+
+def is_palette_modified(build_ele : BuildingElement,
+                        params    : tuple) -> bool:
+    """Check if the script modified a value shown in the property palette
+
+    The parameters are read a second time, after the modifications of the callback.
+
+    Args:
+        build_ele : the building element
+        params    : snapshot of the parameters taken at the beginning of the callback
+
+    Returns:
+        True if a value differs from the snapshot
+    """
+    return PARAMETER_TRACKER.take(build_ele) != params
+
+
+def calcul_as_real(build_ele : BuildingElement) -> None:
+    """Calcul of As real
+
+    Args:
+        build_ele : the building element
+    """
+    build_ele.AsRealDouble.value = as_real(build_ele.ChoiceRadioGroup.value,
+                                           build_ele.FirstBarDiameter.value,
+                                           build_ele.SecondBarDiameter.value,
+                                           build_ele.ScndBarRectQttInLength.value,
+                                           build_ele.ScndBarRectQttInThick.value,
+                                           build_ele.RebarCircQtt.value)
+
+
+def reinforcement_store() -> Optional[ReinforcementStore]:
+    """Get the reinforcement store of the current project
+
+    Returns:
+        Reinforcement store, None if the store is disabled or cannot be opened
+    """
+    if not REINF_STORE_ENABLED:
+        return None
+
+    project_path = Settings.AllplanPaths.GetCurPrjPath()
+
+    if not project_path or not os.path.isdir(project_path):
+        return None
+
+    try:
+        store = open_reinforcement_store(project_path, SCRIPT_VERSION)
+    except sqlite3.Error as error:
+        print(f"Cache des armatures indisponible : {error}")
+        return None
+
+    # Disabled after an error, for the session
+    return store if store.enabled else None
+
+
+def schedule_request(build_ele : BuildingElement) -> tuple:
+    """Get the identifier of the schedule loading of the column
+
+    Args:
+        build_ele : the building element
+
+    Returns:
+        Identifier of the loading
+    """
+    return ("row", build_ele.CSVFilePath.value, build_ele.ScheduleLevel.value, build_ele.ColumnId.value)
+
+
+def preload_schedule(file_path : str) -> None:
+    """Parse or open the schedule, called in the schedule loader thread
+
+    Args:
+        file_path : path of the CSV file or of the SQLite store
+    """
+    if is_schedule_store(file_path):
+        open_schedule_store(file_path)
+    elif SCHEDULE_CACHE.get_compiled(file_path) is None:
+        SCHEDULE_CACHE.get_index(file_path)
 
-    # Trade @209@
-    attr_list.add_attribute(209, 13)
 
-    # Status @49@
-    attr_list.add_attribute(49, 0)
+def load_schedule_row(file_path : str,
+                      level     : str,
+                      column_id : str) -> Optional[ScheduleRow]:
+    """Get the schedule row of a column from the CSV file or the SQLite store
 
-    # Load bearing @573@
-    attr_list.add_attribute(573, 1)
+    Args:
+        file_path : path of the CSV file or of the SQLite store
+        level     : level of the column in the SQLite store
+        column_id : column name
 
-    # Concrete grade @1905@
-    attr_list.add_attribute(1905, column_concrete_gr)
+    Returns:
+        Schedule row, None if the column is not in the schedule
+    """
+    if is_schedule_store(file_path):
+        return open_schedule_store(file_path).lookup(column_id, level)
 
-    # Geometry
-    length, thickness, radius, height, surface, volume = main_column.calcul_dimensions()
+    # CSV file parsed once while it is unchanged
+    return SCHEDULE_CACHE.lookup(file_path, column_id)
 
-    attr_list.add_attribute(220, length)
-    attr_list.add_attribute(221, thickness)
-    attr_list.add_attribute(107, radius)
-    attr_list.add_attribute(222, height)
-    attr_list.add_attribute(293, surface)
-    attr_list.add_attribute(226, volume)
 
-    #
-    # Reinforcement attributes
-    #
+def apply_loaded_schedule_row(build_ele      : BuildingElement,
+                              ctrl_prop_util : ControlPropertiesUtil) -> bool:
+    """Apply the schedule row of the column if its loading is finished
 
-    if is_showing_reinf:
-        weight, quantity, col_concr_cover, height, height_under_beam, \
-            frst_long_rebars, scnd_long_rebars, length_long_rebars, \
-                stirrup_A_placement, stirrup_B_placement, stirrup_C_placement, stirrup_sum_qtt_diam, stirrup_sum_dim, \
-                    crosstie_along_length, crosstie_along_thick, \
-                        next_col_dim, start_rebars_qtt, start_rebars_mid_length = main_column.create_reinf_attributes()
+    Args:
+        build_ele      : the building element
+        ctrl_prop_util : control properties utility
 
-        # Weight of bar
-        attr_list.add_attribute(756, weight)
+    Returns:
+        True if the row was applied, False if there is nothing to apply yet
+    """
+    is_loaded, schedule_row = SCHEDULE_LOADER.take_result(schedule_request(build_ele))
 
-        # Quantity
-        attr_list.add_attribute(201, quantity)
+    if not is_loaded:
+        return False
 
-        # Concrete cover => ALLFA_value_03
-        attr_list.add_attribute(845, col_concr_cover)
+    if schedule_row is not None:
+        apply_schedule_row(build_ele, ctrl_prop_util, schedule_row)
 
-        # Column dimensions => ALLFA_value_06
-        attr_list.add_attribute(848, main_column.name_dim)
+    calcul_as_real(build_ele)
 
-        # Height => ALLFA_value_07
-        attr_list.add_attribute(849, height)
+    return True
 
-        # Height under beam => ALLFA_value_08
-        attr_list.add_attribute(850, height_under_beam)
 
-        # First longitudinal rebars => ALLFA_value_09
-        attr_list.add_attribute(851, frst_long_rebars)
+def schedule_files_key(params : tuple) -> tuple:
+    """Get the state of the files read by a schedule batch
 
-        # Second longitudinal rebars => ALLFA_value_10
-        attr_list.add_attribute(852, scnd_long_rebars)
+    Args:
+        params : snapshot of the parameters
 
-        # Length of longitudinal rebars => ALLFA_value_11
-        attr_list.add_attribute(853, length_long_rebars)
+    Returns:
+        Path, size and modification time of the schedule and of its import state, None for a missing file
+    """
+    file_paths = [params.CSVFilePath]
 
-        # Stirrup placement [A] => ALLFA_value_12
-        attr_list.add_attribute(854, stirrup_A_placement)
+    if params.ScheduleChangedOnlyCheckBox:
+        file_paths.append(schedule_state_path(params.CSVFilePath, params.ScheduleLevel))
 
-        # Stirrup placement [B] => ALLFA_value_13
-        attr_list.add_attribute(855, stirrup_B_placement)
+    files_key = []
 
-        # Stirrup placement [C] => ALLFA_value_14
-        attr_list.add_attribute(856, stirrup_C_placement)
+    for file_path in file_paths:
+        try:
+            files_key.append(ScheduleCache.file_key(file_path))
+        except OSError:
+            files_key.append(None)
 
-        # Stirrup summary for quantity / diameter => ALLFA_value_15
-        attr_list.add_attribute(857, stirrup_sum_qtt_diam)
+    return tuple(files_key)
 
-        # Stirrup summary for dimensions => ALLFA_value_16
-        attr_list.add_attribute(858, stirrup_sum_dim)
 
-        # Crosstie along length => ALLFA_value_17
-        attr_list.add_attribute(859, crosstie_along_length)
+def iter_schedule_rows(build_ele : BuildingElement) -> Iterator[ScheduleRow]:
+    """Stream the schedule rows from the CSV file or the SQLite store
 
-        # Crosstie along thickness => ALLFA_value_18
-        attr_list.add_attribute(860, crosstie_along_thick)
+    Args:
+        build_ele : the building element
 
-        # Next column dimensions => ALLFA_value_19
-        attr_list.add_attribute(861, next_col_dim)
+    Yields:
+        Schedule rows
+    """
+    file_path = build_ele.CSVFilePath.value
 
-        # Starter rebars quantity => ALLFA_value_20
-        attr_list.add_attribute(862, start_rebars_qtt)
+    if is_schedule_store(file_path):
+        yield from open_schedule_store(file_path).iter_rows(build_ele.ScheduleLevel.value)
+    else:
+        yield from iter_schedule(file_path)
 
-        # Starter rebars mid length => ALLFA_value_01
-        attr_list.add_attribute(843, start_rebars_mid_length)
 
-    attr_list.add_attributes_from_parameters(build_ele)
-    pyp_util.add_attribute_list(attr_list)
+def iter_schedule_compliance_rows(build_ele     : BuildingElement,
+                                  schedule_rows : Iterable[ScheduleRow]) -> Iterator[Tuple[ScheduleRow, ComplianceResult]]:
+    """Check the schedule rows with the section of the column
 
-    # Reference point
-    placement_mat = Geometry.Matrix3D()
-    if choice == "rectangle":
-        rotation_axis  = Geometry.Line3D(Geometry.Point3D(), Geometry.Point3D(0, 0, 1))
-        rotation_angle = Geometry.Angle.FromDeg(col_z_rotation)
-        placement_mat.SetRotation(rotation_axis,rotation_angle)
-    placement_mat.SetTranslation(Geometry.Vector3D(main_column.placement_pt))
+    The schedule has no section, all the rows are checked with the section of the palette.
 
-    # Create the PythonPart
-    model_ele_list = pyp_util.create_pythonpart(build_ele, placement_mat)
+    Args:
+        build_ele     : the building element
+        schedule_rows : schedule rows
 
-    return CreateElementResult(model_ele_list, handle_list)
+    Yields:
+        Each row with its result
+    """
+    yield from iter_schedule_compliance(schedule_rows,
+                                        build_ele.ChoiceRadioGroup.value,
+                                        build_ele.ColumnLength.value,
+                                        build_ele.ColumnThick.value,
+                                        build_ele.ColumnRadius.value,
+                                        build_ele.ReinfConcreteCover.value)
 
 
-def set_constructive_dispositions(build_ele      : BuildingElement,
-                                  ctrl_prop_util : ControlPropertiesUtil) -> None:
-    """Calcul of constructive dispositions
+def apply_schedule_row(build_ele      : BuildingElement,
+                       ctrl_prop_util : ControlPropertiesUtil,
+                       schedule_row   : ScheduleRow) -> None:
+    """Apply the reinforcement data of a schedule row
 
     Args:
         build_ele      : the building element
-        ctrl_prop_util : control properties utility
+        ctrl_prop_util : control properties utility, None outside of the property palette
+        schedule_row   : schedule row of the column
     """
-    # Set distance between rebars
-    esp_min = 100
-    esp_max = 400
+    valid_diameters = [8, 10, 12, 14, 16, 20]
+    if schedule_row.long_bar_diameter in valid_diameters:
+        build_ele.FirstBarDiameter.value  = schedule_row.long_bar_diameter
+        build_ele.SecondBarDiameter.value = schedule_row.long_bar_diameter
+
+    concr_cover = build_ele.ReinfConcreteCover.value
 
     if build_ele.ChoiceRadioGroup.value == "rectangle":
-        # Concrete section in cm²
-        Ac = (build_ele.ColumnLength.value * build_ele.ColumnThick.value) * 1e-2
-        # Rebars quantity
-        length    = build_ele.ColumnLength.value - 2 * build_ele.ReinfConcreteCover.value
-        thickness = build_ele.ColumnThick.value - 2 * build_ele.ReinfConcreteCover.value
+        nbr_rebars  = schedule_row.long_bar_quantity - 4 # 4 => one main longitudinal rebar for each corner
 
-        min_value_in_length = max(0, math.ceil(length / esp_max) - 1)
-        max_value_in_length = max(min_value_in_length, math.floor(length / esp_min) - 1)
+        min_value_in_length, max_value_in_length = side_bar_count_bounds(max(build_ele.ColumnLength.value, build_ele.ColumnThick.value), concr_cover)
+        min_value_in_thick, max_value_in_thick   = side_bar_count_bounds(min(build_ele.ColumnLength.value, build_ele.ColumnThick.value), concr_cover)
 
-        min_value_in_thick = max(0, math.ceil(thickness / esp_max) - 1)
-        max_value_in_thick = max(min_value_in_thick, math.floor(thickness / esp_min) - 1)
+        init_qtt_in_length = max(min_value_in_length, math.ceil((nbr_rebars - 2 * min_value_in_thick) / 2))
+        init_qtt_in_thick  = min_value_in_thick
 
-        if build_ele.ScndBarRectQttInLength.value > 0 or build_ele.ScndBarRectQttInThick.value > 0:
-            main_stirrup_max_dist = min(20 * min(build_ele.FirstBarDiameter.value, build_ele.SecondBarDiameter.value), 400, min(build_ele.ColumnLength.value, build_ele.ColumnThick.value))
+        if init_qtt_in_length > max_value_in_length:
+            build_ele.ScndBarRectQttInLength.value = max_value_in_length
+            init_qtt_in_thick = nbr_rebars - 2 * max_value_in_length
         else:
-            main_stirrup_max_dist = min(20 * build_ele.FirstBarDiameter.value, 400, min(build_ele.ColumnLength.value, build_ele.ColumnThick.value))
-
-        top_stirrup_length = max(build_ele.ColumnLength.value, build_ele.ColumnThick.value)
+            build_ele.ScndBarRectQttInLength.value = init_qtt_in_length
 
-        build_ele.ScndBarRectQttInLength.value = min_value_in_length if build_ele.ScndBarRectQttInLength.value < min_value_in_length else (max_value_in_length if build_ele.ScndBarRectQttInLength.value > max_value_in_length else build_ele.ScndBarRectQttInLength.value)
-        build_ele.ScndBarRectQttInThick.value = min_value_in_thick if build_ele.ScndBarRectQttInThick.value < min_value_in_thick else (max_value_in_thick if build_ele.ScndBarRectQttInThick.value > max_value_in_thick else build_ele.ScndBarRectQttInThick.value)
-
-        # Change the min and max values ​​if they are different, otherwise reset and lock the value
-        if min_value_in_length != max_value_in_length:
-            ctrl_prop_util.set_min_value("ScndBarRectQttInLength", str(min_value_in_length))
-            ctrl_prop_util.set_max_value("ScndBarRectQttInLength", str(max_value_in_length))
-            ctrl_prop_util.set_enable_condition("ScndBarRectQttInLength", "True")
-        else:
-            ctrl_prop_util.set_min_value("ScndBarRectQttInLength", "0")
-            ctrl_prop_util.set_max_value("ScndBarRectQttInLength", "10")
-            ctrl_prop_util.set_enable_condition("ScndBarRectQttInLength", "False")
-
-        # Change the min and max values ​​if they are different, otherwise reset and lock the value
-        if min_value_in_thick != max_value_in_thick:
-            ctrl_prop_util.set_min_value("ScndBarRectQttInThick", str(min_value_in_thick))
-            ctrl_prop_util.set_max_value("ScndBarRectQttInThick", str(max_value_in_thick))
-            ctrl_prop_util.set_enable_condition("ScndBarRectQttInThick", "True")
+        if init_qtt_in_thick > max_value_in_thick:
+            build_ele.ScndBarRectQttInThick.value = max_value_in_thick
         else:
-            ctrl_prop_util.set_min_value("ScndBarRectQttInThick", "0")
-            ctrl_prop_util.set_max_value("ScndBarRectQttInThick", "10")
-            ctrl_prop_util.set_enable_condition("ScndBarRectQttInThick", "False")
-
-    else:
-        # Concrete section in cm²
-        Ac = (math.pi * build_ele.ColumnRadius.value ** 2) * 1e-2
-        # Rebars quantity
-        diameter = 2 * math.pi * (build_ele.ColumnRadius.value - build_ele.ReinfConcreteCover.value)
-
-        min_value = max(4, math.ceil(diameter / esp_max))
-        max_value = max(min_value, math.floor(diameter / esp_min))
-
-        main_stirrup_max_dist = min(20 * build_ele.FirstBarDiameter.value, 400, 2 * build_ele.ColumnRadius.value)
-        top_stirrup_length    = 2 * build_ele.ColumnRadius.value
+            build_ele.ScndBarRectQttInThick.value = init_qtt_in_thick
 
-        build_ele.RebarCircQtt.value = min_value if build_ele.RebarCircQtt.value < min_value else (max_value if build_ele.RebarCircQtt.value > max_value else build_ele.RebarCircQtt.value)
+        main_stirrup_max_spac = min(20 * build_ele.FirstBarDiameter.value, 400, min(build_ele.ColumnLength.value, build_ele.ColumnThick.value))
 
-        # Change the min and max values ​​if they are different, otherwise reset and lock the value
-        if min_value != max_value:
-            ctrl_prop_util.set_min_value("RebarCircQtt", str(min_value))
-            ctrl_prop_util.set_max_value("RebarCircQtt", str(max_value))
-            ctrl_prop_util.set_enable_condition("RebarCircQtt", "True")
-        else:
-            ctrl_prop_util.set_min_value("RebarCircQtt", "0")
-            ctrl_prop_util.set_max_value("RebarCircQtt", "10")
-            ctrl_prop_util.set_enable_condition("RebarCircQtt", "False")
-
-    # As min and As max in cm²
-    build_ele.AsMinDouble.value = 0.002 * Ac
-    build_ele.AsMaxDouble.value = 0.04 * Ac
+    else:
+        min_value_circ, max_value_circ = circ_bar_count_bounds(build_ele.ColumnRadius.value, concr_cover)
 
-    # Set distance between stirrups
-    stirrup_list = build_ele.StirrupList.value
+        nbr_rebars = max(min_value_circ, min(schedule_row.long_bar_quantity, max_value_circ))
+        build_ele.RebarCircQtt.value = nbr_rebars
 
-    end_stirrup_max_dist  = 0.6 * main_stirrup_max_dist
-    bottom_stirrup_length = 2 * stirrup_list[0][1]
+        main_stirrup_max_spac = min(20 * build_ele.FirstBarDiameter.value, 400, 2 * build_ele.ColumnRadius.value)
 
-    ctrl_prop_util.set_max_value("MainStirrup", f",10,{main_stirrup_max_dist}")
-    ctrl_prop_util.set_max_value("StirrupList", f",{end_stirrup_max_dist},,")
+    # Stirrup diameter and spacing
+    scnd_stirrup_max_spac = 0.6 * main_stirrup_max_spac
 
-    stirrup_list[0] = stirrup_list[0]._replace(Length = float(bottom_stirrup_length))
-    stirrup_list[1] = stirrup_list[1]._replace(Length = float(top_stirrup_length))
+    if ctrl_prop_util is not None:
+        PALETTE_LIMITS.set_max_value(ctrl_prop_util, "MainStirrup", f",10,{main_stirrup_max_spac}")
+        PALETTE_LIMITS.set_max_value(ctrl_prop_util, "StirrupList", f",{scnd_stirrup_max_spac},,")
 
+    A_stirrup_spacing = min(main_stirrup_max_spac, schedule_row.stirrup_spacing_a)
+    B_stirrup_spacing = min(scnd_stirrup_max_spac, schedule_row.stirrup_spacing_b)
+    C_stirrup_spacing = min(scnd_stirrup_max_spac, schedule_row.stirrup_spacing_c)
 
-def calcul_as_real(build_ele : BuildingElement) -> None:
-    """Calcul of As real
+    main_stirrup = build_ele.MainStirrup.value
+    main_stirrup = main_stirrup._replace(Spacing = A_stirrup_spacing)
+    valid_diameters = [6, 8, 10]
+    if schedule_row.stirrup_diameter in valid_diameters:
+        main_stirrup = main_stirrup._replace(Diameter = schedule_row.stirrup_diameter)
+    build_ele.MainStirrup.value = main_stirrup
 
-    Args:
-        build_ele : the building element
-    """
-    if build_ele.ChoiceRadioGroup.value == "rectangle":
-        as_frst_rebar = 4 * math.pi * (build_ele.FirstBarDiameter.value / 10) ** 2 / 4
-        as_scnd_rebar = 2 * (build_ele.ScndBarRectQttInLength.value + build_ele.ScndBarRectQttInThick.value) * math.pi * (build_ele.SecondBarDiameter.value / 10) ** 2 / 4
-        build_ele.AsRealDouble.value = as_frst_rebar + as_scnd_rebar
-    else:
-        build_ele.AsRealDouble.value = build_ele.RebarCircQtt.value * math.pi * (build_ele.FirstBarDiameter.value / 10) ** 2 / 4
+    stirrup_list    = build_ele.StirrupList.value
+    stirrup_list[0] = stirrup_list[0]._replace(Spacing = B_stirrup_spacing)
+    stirrup_list[1] = stirrup_list[1]._replace(Spacing = C_stirrup_spacing)
 
 
 class Objects3D:
@@ -809,11 +1761,28 @@ class Objects3D:
         self.points_list = [Geometry.Transform(point, placement_mat) for point in self.points_list]
 
 
-    def create_reinforcement(self) -> List[Reinforcement.BarPlacement]:
+    def create_reinforcement(self,
+                             build_cache : Optional[ColumnBuildCache] = None) -> List[Reinforcement.BarPlacement]:
         self.reinf_ele = Reinforcement3D(self.build_ele)
-        reinf_ele_list = self.reinf_ele.create_rebars()
 
-        return reinf_ele_list
+        if build_cache is None:
+            return self.reinf_ele.load_rebars(reinforcement_store())
+
+        # Identical columns of a batch share the same reinforcement
+        reinf_key = self.reinf_ele.key()
+        if reinf_key not in build_cache.reinforcement:
+            self.reinf_ele.load_rebars(reinforcement_store())
+            build_cache.reinforcement[reinf_key] = self.reinf_ele
+
+        self.reinf_ele = build_cache.reinforcement[reinf_key]
+
+        # Each column gets its own bar placements, they are moved and modified in place
+        return [copy_bar_placement(rebar) for rebar in self.reinf_ele.reinforcement]
+
+
+    def create_reinf_quantities(self) -> None:
+        self.reinf_ele = Reinforcement3D(self.build_ele)
+        self.reinf_ele.calcul_quantities()
 
 
     def create_reinf_attributes(self) -> tuple:
@@ -986,8 +1955,8 @@ class Cuboid(Objects3D):
 
 
     def calcul_dimensions(self) -> tuple:
-        err, volume, surface, center_of_gravity = Geometry.CalcMass(self.geo)
-        volume    = volume * 1e-9
+        mass      = column_mass("rectangle", self.column_length, self.column_thick, 0, self.column_height, self.geo)
+        volume    = mass.volume * 1e-9
         length    = self.column_length * 1e-3
         thickness = self.column_thick * 1e-3
         radius    = 0
@@ -998,15 +1967,9 @@ class Cuboid(Objects3D):
 
 
     def create_geo(self) -> Geometry.BRep3D:
-        placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
-                                             Geometry.Vector3D(1, 0, 0),
-                                             Geometry.Vector3D(0, 0, 1)
-                                             )
-        self.geo  = Geometry.BRep3D.CreateCuboid(placement,
-                                                 self.column_length,
-                                                 self.column_thick,
-                                                 self.column_height
-                                                 )
+        # Identical columns share the same BRep
+        self.geo = GEOMETRY_CACHE.get(("cuboid_brep", self.column_length, self.column_thick, self.column_height),
+                                      self.create_base_geo)
 
         if not self.is_main_col:
             self.geo = Geometry.Move(self.geo, Geometry.Vector3D(0, 0, self.z_offset))
@@ -1014,7 +1977,24 @@ class Cuboid(Objects3D):
         return self.geo
 
 
+    def create_base_geo(self) -> Geometry.BRep3D:
+        placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
+                                             Geometry.Vector3D(1, 0, 0),
+                                             Geometry.Vector3D(0, 0, 1)
+                                             )
+
+        return Geometry.BRep3D.CreateCuboid(placement,
+                                            self.column_length,
+                                            self.column_thick,
+                                            self.column_height
+                                            )
+
+
     def create_hatch_geo(self) -> Geometry.Polygon2D:
+        return GEOMETRY_CACHE.get(("rectangle_section", self.column_length, self.column_thick), self.create_section_geo)
+
+
+    def create_section_geo(self) -> Geometry.Polygon2D:
         hatch_geo = Geometry.Polygon2D.CreateRectangle(Geometry.Point2D(),
                                                        Geometry.Point2D(self.column_length, self.column_thick)
                                                        )
@@ -1039,6 +2019,10 @@ class Cuboid(Objects3D):
 
 
     def create_reinf_attributes(self) -> tuple:
+        # Attributes of a reused reinforcement are already calculated
+        if self.reinf_ele.attributes is not None:
+            return self.reinf_ele.attributes
+
         # Init values
         weight                    = 0
         quantity                  = 0
@@ -1059,15 +2043,7 @@ class Cuboid(Objects3D):
         start_rebars_qtt          = ""
         start_rebars_mid_length   = ""
 
-        for rebar in self.reinf_ele.reinforcement:
-            bending_shape = Reinforcement.BarPlacement.GetBendingShape(rebar)
-            steel_grade   = bending_shape.GetSteelGrade()
-            diameter      = bending_shape.GetDiameter()
-            count         = rebar.GetBarCount()
-            length        = bending_shape.GetShapePolyline()
-            length        = Geometry.CalcLength(length) * 1e-3
-            weight_per_ml = Reinforcement.ReinforcementSettings.GetBarWeight(steel_grade, diameter)
-            weight       += count * length * weight_per_ml
+        weight = self.reinf_ele.weight()
 
         quantity = 1
 
@@ -1108,25 +2084,29 @@ class Cuboid(Objects3D):
             start_rebars_qtt        = f"{self.reinf_ele.starter_bar_qtt}HA{self.reinf_ele.starter_bar_diam}"
             start_rebars_mid_length = f"{round((self.reinf_ele.starter_bar_length / 2)/ 10)}"
 
-        return (weight,
-                quantity,
-                col_concr_cover,
-                height,
-                height_under_beam,
-                frst_long_rebars,
-                scnd_long_rebars,
-                length_long_rebars,
-                stirrup_A_placement,
-                stirrup_B_placement,
-                stirrup_C_placement,
-                stirrup_sum_qtt_diam,
-                stirrup_sum_dim,
-                crosstie_along_length,
-                crosstie_along_thick,
-                next_col_dim,
-                start_rebars_qtt,
-                start_rebars_mid_length
-                )
+        self.reinf_ele.attributes = (weight,
+                                     quantity,
+                                     col_concr_cover,
+                                     height,
+                                     height_under_beam,
+                                     frst_long_rebars,
+                                     scnd_long_rebars,
+                                     length_long_rebars,
+                                     stirrup_A_placement,
+                                     stirrup_B_placement,
+                                     stirrup_C_placement,
+                                     stirrup_sum_qtt_diam,
+                                     stirrup_sum_dim,
+                                     crosstie_along_length,
+                                     crosstie_along_thick,
+                                     next_col_dim,
+                                     start_rebars_qtt,
+                                     start_rebars_mid_length
+                                     )
+
+        self.reinf_ele.store_attributes()
+
+        return self.reinf_ele.attributes
 
 
 class Cylinder(Objects3D):
@@ -1232,8 +2212,8 @@ class Cylinder(Objects3D):
 
 
     def calcul_dimensions(self) -> tuple:
-        err, volume, surface, center_of_gravity = Geometry.CalcMass(self.geo)
-        volume    = volume * 1e-9
+        mass      = column_mass("circle", 0, 0, self.column_radius, self.column_height, self.geo)
+        volume    = mass.volume * 1e-9
         length    = 0
         thickness = 0
         radius    = self.column_radius * 1e-3
@@ -1244,14 +2224,8 @@ class Cylinder(Objects3D):
 
 
     def create_geo(self) -> Geometry.BRep3D:
-        placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
-                                             Geometry.Vector3D(1, 0, 0),
-                                             Geometry.Vector3D(0, 0, 1)
-                                             )
-        self.geo  = Geometry.BRep3D.CreateCylinder(placement,
-                                                   self.column_radius,
-                                                   self.column_height
-                                                   )
+        # Identical columns share the same BRep
+        self.geo = GEOMETRY_CACHE.get(("cylinder_brep", self.column_radius, self.column_height), self.create_base_geo)
 
         if not self.is_main_col:
             self.geo = Geometry.Move(self.geo, Geometry.Vector3D(0, 0, self.z_offset))
@@ -1259,23 +2233,22 @@ class Cylinder(Objects3D):
         return self.geo
 
 
+    def create_base_geo(self) -> Geometry.BRep3D:
+        placement = Geometry.AxisPlacement3D(Geometry.Point3D(),
+                                             Geometry.Vector3D(1, 0, 0),
+                                             Geometry.Vector3D(0, 0, 1)
+                                             )
+
+        return Geometry.BRep3D.CreateCylinder(placement,
+                                              self.column_radius,
+                                              self.column_height
+                                              )
+
+
     def create_hatch_geo(self) -> Geometry.Polygon2D:
-        line          = Geometry.Line3D(0, 0, 0, self.column_radius, 0, 0)
-        angle         = Geometry.Angle()
-        angle.Deg     = 10
-        rotation_axis = Geometry.Line3D(Geometry.Point3D(),
-                                        Geometry.Point3D(0, 0, 1)
-                                        )
-        transformation_matrix = Geometry.Matrix3D()
-
-        hatch_geo  = Geometry.Polygon2D()
-        for i in range(36):
-            transformation_matrix.SetRotation(rotation_axis, angle)
-            line       = Geometry.Transform(line, transformation_matrix)
-            hatch_geo += Geometry.Point2D(line.EndPoint.X, line.EndPoint.Y)
-        hatch_geo += hatch_geo.StartPoint
+        tolerance = chord_tolerance(self.build_ele.ChordTolerance.value, self.build_ele.DrawingScale.value)
 
-        return hatch_geo
+        return circle_polygon(self.column_radius, tolerance)
 
 
     def attachment_point(self) -> Geometry.Point3D:
@@ -1295,6 +2268,10 @@ class Cylinder(Objects3D):
 
 
     def create_reinf_attributes(self) -> tuple:
+        # Attributes of a reused reinforcement are already calculated
+        if self.reinf_ele.attributes is not None:
+            return self.reinf_ele.attributes
+
         # Init values
         weight                    = 0
         quantity                  = 0
@@ -1315,15 +2292,7 @@ class Cylinder(Objects3D):
         start_rebars_qtt          = ""
         start_rebars_mid_length   = ""
 
-        for rebar in self.reinf_ele.reinforcement:
-            bending_shape = Reinforcement.BarPlacement.GetBendingShape(rebar)
-            steel_grade   = bending_shape.GetSteelGrade()
-            diameter      = bending_shape.GetDiameter()
-            count         = rebar.GetBarCount()
-            length        = bending_shape.GetShapePolyline()
-            length        = Geometry.CalcLength(length) * 1e-3
-            weight_per_ml = Reinforcement.ReinforcementSettings.GetBarWeight(steel_grade, diameter)
-            weight       += count * length * weight_per_ml
+        weight = self.reinf_ele.weight()
 
         quantity = 1
 
@@ -1351,25 +2320,29 @@ class Cylinder(Objects3D):
             start_rebars_qtt        = f"{self.reinf_ele.starter_bar_qtt}HA{self.reinf_ele.starter_bar_diam}"
             start_rebars_mid_length = f"{round((self.reinf_ele.starter_bar_length / 2)/ 10)}"
 
-        return (weight,
-                quantity,
-                col_concr_cover,
-                height,
-                height_under_beam,
-                frst_long_rebars,
-                scnd_long_rebars,
-                length_long_rebars,
-                stirrup_A_placement,
-                stirrup_B_placement,
-                stirrup_C_placement,
-                stirrup_sum_qtt_diam,
-                stirrup_sum_dim,
-                crosstie_along_length,
-                crosstie_along_thick,
-                next_col_dim,
-                start_rebars_qtt,
-                start_rebars_mid_length
-                )
+        self.reinf_ele.attributes = (weight,
+                                     quantity,
+                                     col_concr_cover,
+                                     height,
+                                     height_under_beam,
+                                     frst_long_rebars,
+                                     scnd_long_rebars,
+                                     length_long_rebars,
+                                     stirrup_A_placement,
+                                     stirrup_B_placement,
+                                     stirrup_C_placement,
+                                     stirrup_sum_qtt_diam,
+                                     stirrup_sum_dim,
+                                     crosstie_along_length,
+                                     crosstie_along_thick,
+                                     next_col_dim,
+                                     start_rebars_qtt,
+                                     start_rebars_mid_length
+                                     )
+
+        self.reinf_ele.store_attributes()
+
+        return self.reinf_ele.attributes
 
 
 class Reinforcement3D:
@@ -1397,8 +2370,6 @@ class Reinforcement3D:
         self.concrete_grade = build_ele.ConcreteGrade.value
         self.concrete_cover = build_ele.ReinfConcreteCover.value
 
-        self.bending_rol = 4
-
         self.frst_bar_diam        = build_ele.FirstBarDiameter.value
         self.scnd_bar_diam        = build_ele.SecondBarDiameter.value
         self.scnd_bar_qtt_length  = build_ele.ScndBarRectQttInLength.value
@@ -1415,32 +2386,339 @@ class Reinforcement3D:
         self.region_start_end_points = []
         self.count_stirrup           = []
         self.count_crosstie          = {'length' : 0, 'thickness' : 0}
+        self.attributes              = None
 
+        self.store      = None
+        self.store_key  = None
+        self.store_data = None
 
-    def create_rebars(self) -> List[Reinforcement.BarPlacement]:
+
+    def key(self) -> tuple:
+        """Get the values defining the reinforcement
+
+        Returns:
+            Hashable tuple of the reinforcement input values
+        """
+        return (self.choice,
+                self.col_length,
+                self.col_thick,
+                self.col_radius,
+                self.col_height,
+                self.slab_height,
+                self.has_next_col,
+                self.next_col_length,
+                self.next_col_thick,
+                self.next_col_radius,
+                self.concrete_grade,
+                self.concrete_cover,
+                self.frst_bar_diam,
+                self.scnd_bar_diam,
+                self.scnd_bar_qtt_length,
+                self.scnd_bar_qtt_thick,
+                self.rebar_qtt_circ,
+                self.starter_bar_diam,
+                self.starter_bar_qtt,
+                self.starter_bar_length,
+                tuple(self.main_stirrup),
+                tuple(tuple(stirrup) for stirrup in self.stirrup_list)
+                )
+
+
+    def calcul_quantities(self) -> None:
+        """Count the stirrups and the crossties without creating the bar placements
+        """
+        regions = stirrup_regions(self.col_height,
+                                  self.slab_height,
+                                  self.main_stirrup[2],
+                                  self.stirrup_list[0][1],
+                                  self.stirrup_list[0][2],
+                                  self.stirrup_list[1][1],
+                                  self.stirrup_list[1][2])
+
+        self.count_stirrup = stirrup_counts(regions)
 
         if self.choice == "rectangle":
+            self.count_crosstie = {'length'    : crosstie_count(self.col_length,
+                                                                self.concrete_cover,
+                                                                self.main_stirrup[1],
+                                                                self.frst_bar_diam,
+                                                                self.scnd_bar_diam,
+                                                                self.scnd_bar_qtt_length),
+                                   'thickness' : crosstie_count(self.col_thick,
+                                                                self.concrete_cover,
+                                                                self.main_stirrup[1],
+                                                                self.frst_bar_diam,
+                                                                self.scnd_bar_diam,
+                                                                self.scnd_bar_qtt_thick)
+                                   }
+
+
+    def weight(self) -> float:
+        """Weight of the reinforcement, from the bar placements if they are created
+
+        Returns:
+            Weight in kg, estimated without the hooks if the bar placements are not created
+        """
+        if not self.reinforcement:
+            return self.estimate_weight()
 
-            #
-            # Stirrups
-            #
+        weight = 0
+
+        for rebar in self.reinforcement:
+            bending_shape = Reinforcement.BarPlacement.GetBendingShape(rebar)
+            steel_grade   = bending_shape.GetSteelGrade()
+            diameter      = bending_shape.GetDiameter()
+            count         = rebar.GetBarCount()
+            length        = bending_shape.GetShapePolyline()
+            length        = Geometry.CalcLength(length) * 1e-3
+            weight_per_ml = bar_weight(steel_grade, diameter)
+            weight       += count * length * weight_per_ml
+
+        return weight
+
+
+    def is_weight_estimated(self) -> bool:
+        return not self.reinforcement
+
+
+    def verify_quantities(self) -> bool:
+        """Compare the quantities of the bar placements with the quantities of calcul_quantities,
+        used by the attributes only mode
+
+        Returns:
+            True/False if the quantities are the same
+        """
+        placed_stirrup  = list(self.count_stirrup)
+        placed_crosstie = dict(self.count_crosstie)
+
+        self.calcul_quantities()
+
+        is_same = verify_quantities((self.count_stirrup, self.count_crosstie), (placed_stirrup, placed_crosstie))
+
+        self.count_stirrup  = placed_stirrup
+        self.count_crosstie = placed_crosstie
+
+        return is_same
+
+
+    def estimate_weight(self) -> float:
+        """Nominal weight of the reinforcement from the calculated quantities
+
+        Returns:
+            Weight in kg, without the hooks
+        """
+        # Quantity of each region, none if the stirrups are not counted yet
+        stirrup_qtt  = sum(self.count_stirrup[0::2])
+        bar_length   = self.col_height - self.concrete_cover
+        stirrup_diam = self.main_stirrup[1]
+
+        if self.choice == "rectangle":
+            inner_length = self.col_length - 2 * self.concrete_cover
+            inner_thick  = self.col_thick - 2 * self.concrete_cover
+
+            bars = [(4, self.frst_bar_diam, bar_length),
+                    (2 * (self.scnd_bar_qtt_length + self.scnd_bar_qtt_thick), self.scnd_bar_diam, bar_length),
+                    (stirrup_qtt, stirrup_diam, 2 * (inner_length + inner_thick)),
+                    (stirrup_qtt * self.count_crosstie['length'], stirrup_diam, inner_thick),
+                    (stirrup_qtt * self.count_crosstie['thickness'], stirrup_diam, inner_length)]
+        else:
+            bars = [(self.rebar_qtt_circ, self.frst_bar_diam, bar_length),
+                    (stirrup_qtt, stirrup_diam, 2 * math.pi * (self.col_radius - self.concrete_cover))]
+
+        if self.has_next_col:
+            bars.append((self.starter_bar_qtt, self.starter_bar_diam, self.starter_bar_length))
+
+        return bars_weight(bars)
+
+
+    def cached_shape(self,
+                     key    : tuple,
+                     create : Callable[[], Reinforcement.BendingShape]) -> Reinforcement.BendingShape:
+        """Get a copy of a bending shape, the shape builder is only called for a new key
+
+        Args:
+            key    : shape type, diameter, length, cover, bending roller, concrete grade and rotation
+            create : function creating the shape
+
+        Returns:
+            Copy of the shape, it can be moved without changing the shared shape
+        """
+        return Reinforcement.BendingShape(SHAPE_CACHE.get(key, create))
+
+
+    def load_rebars(self,
+                    store : Optional[ReinforcementStore]) -> List[Reinforcement.BarPlacement]:
+        """Create the rebars, from the stored data if they were generated by a previous session
+
+        Args:
+            store : reinforcement store, None to always use the shape builders
+
+        Returns:
+            Bar placements
+        """
+        if store is None or not store.enabled:
+            return self.create_rebars()
+
+        self.store     = store
+        self.store_key = reinforcement_hash(self.key() + self.settings_key())
+
+        self.store_data = store.get(self.store_key)
+
+        if self.store_data is not None:
+            self.reinforcement  = [create_bar_placement(bar) for bar in self.store_data['bars']]
+            self.count_stirrup  = self.store_data['count_stirrup']
+            self.count_crosstie = self.store_data['count_crosstie']
+
+            if self.store_data['attributes'] is not None:
+                self.attributes = tuple(self.store_data['attributes'])
+
+            return self.reinforcement
 
+        self.create_rebars()
+
+        # Stored before the bar placements are moved, the attributes are added once calculated
+        self.store_data = {'bars'           : [describe_bar_placement(rebar) for rebar in self.reinforcement],
+                           'count_stirrup'  : self.count_stirrup,
+                           'count_crosstie' : self.count_crosstie,
+                           'attributes'     : None
+                           }
+        store.put(self.store_key, self.store_data)
+
+        return self.reinforcement
+
+
+    def store_attributes(self) -> None:
+        """Add the calculated attributes to the stored data
+        """
+        if self.store_data is None or self.store_data['attributes'] is not None:
+            return
+
+        self.store_data['attributes'] = list(self.attributes)
+        self.store.put(self.store_key, self.store_data)
+
+
+    def create_stirrup_shape(self) -> Reinforcement.BendingShape:
+        """Create the shape of the stirrups, with the steel grade and the hooks of the Allplan settings
+
+        Returns:
+            Copy of the shared stirrup shape
+        """
+        bending_roller = rebar_properties(self.main_stirrup[1]).mandrel_factor
+
+        if self.choice == "rectangle":
             cover_props = ConcreteCoverProperties.all(self.concrete_cover)
 
             stirrup_shape_props = ReinforcementShapeProperties.rebar(self.main_stirrup[1],
-                                                                     self.bending_rol,
+                                                                     bending_roller,
+                                                                     -1,
+                                                                     self.concrete_grade,
+                                                                     Reinforcement.BendingShapeType.Stirrup
+                                                                     )
+
+            stirrup_key = ("stirrup", self.main_stirrup[1], self.col_length, self.col_thick, self.concrete_cover,
+                           bending_roller, self.concrete_grade, (0, 0, 0))
+
+            stirrup_shape = self.cached_shape(stirrup_key,
+                                              lambda: GeneralShapeBuilder.create_stirrup(self.col_length,
+                                                                                         self.col_thick,
+                                                                                         RotationUtil(0, 0, 0),
+                                                                                         stirrup_shape_props,
+                                                                                         cover_props,
+                                                                                         Reinforcement.StirrupType.Column
+                                                                                         ))
+        else:
+            stirrup_shape_props = ReinforcementShapeProperties.rebar(self.main_stirrup[1],
+                                                                     bending_roller,
                                                                      -1,
                                                                      self.concrete_grade,
                                                                      Reinforcement.BendingShapeType.Stirrup
                                                                      )
 
-            stirrup_shape = GeneralShapeBuilder.create_stirrup(self.col_length,
-                                                               self.col_thick,
-                                                               RotationUtil(0, 0, 0),
-                                                               stirrup_shape_props,
-                                                               cover_props,
-                                                               Reinforcement.StirrupType.Column
-                                                               )
+            stirrup_key = ("circle_stirrup", self.main_stirrup[1], self.col_radius, self.concrete_cover,
+                           bending_roller, self.concrete_grade, (0, 0, -10))
+
+            stirrup_shape = self.cached_shape(stirrup_key,
+                                              lambda: GeneralShapeBuilder.create_circle_stirrup_with_user_hooks(self.col_radius,
+                                                                                                                RotationUtil(0, 0, -10),
+                                                                                                                stirrup_shape_props,
+                                                                                                                self.concrete_cover,
+                                                                                                                100,
+                                                                                                                100,
+                                                                                                                90,
+                                                                                                                100,
+                                                                                                                90
+                                                                                                                ))
+
+        return stirrup_shape
+
+
+    def settings_key(self) -> tuple:
+        """Get the values of the shapes resolved from the Allplan settings
+
+        The shapes are created with the default steel grade and hook lengths, the stored
+        reinforcement is only used with the same settings. The settings are read from
+        reference shapes, the shapes of the column are not built for the lookup.
+
+        Returns:
+            Steel grade and points of the reference stirrup and longitudinal rebar
+        """
+        return (self.shape_settings(Reinforcement.BendingShapeType.Stirrup, self.main_stirrup[1]),
+                self.shape_settings(Reinforcement.BendingShapeType.LongitudinalBar, self.frst_bar_diam))
+
+
+    def shape_settings(self,
+                       shape_type : Reinforcement.BendingShapeType,
+                       diameter   : float) -> tuple:
+        """Get the steel grade and the hooks resolved by Allplan for a type of shape
+
+        Args:
+            shape_type : Stirrup or LongitudinalBar
+            diameter   : diameter of the rebar
+
+        Returns:
+            Steel grade and points of the reference shape, built once in the session
+        """
+        bending_roller = rebar_properties(diameter).mandrel_factor
+
+        shape_props = ReinforcementShapeProperties.rebar(diameter,
+                                                         bending_roller,
+                                                         -1,
+                                                         self.concrete_grade,
+                                                         shape_type
+                                                         )
+
+        def create_reference_shape() -> Reinforcement.BendingShape:
+            if shape_type == Reinforcement.BendingShapeType.Stirrup:
+                return GeneralShapeBuilder.create_stirrup(REFERENCE_SHAPE_LENGTH,
+                                                          REFERENCE_SHAPE_LENGTH,
+                                                          RotationUtil(0, 0, 0),
+                                                          shape_props,
+                                                          ConcreteCoverProperties.all(0),
+                                                          Reinforcement.StirrupType.Column
+                                                          )
+
+            return GeneralShapeBuilder.create_longitudinal_shape_with_hooks(REFERENCE_SHAPE_LENGTH,
+                                                                            RotationUtil(0, 0, 0),
+                                                                            shape_props,
+                                                                            ConcreteCoverProperties.left_right_bottom(0, 0, 0),
+                                                                            -1,
+                                                                            -1
+                                                                            )
+
+        settings_key = (shape_type.name, diameter, bending_roller, self.concrete_grade)
+
+        return SHAPE_SETTINGS_CACHE.get(settings_key, lambda: describe_shape_settings(create_reference_shape()))
+
+
+    def create_rebars(self) -> List[Reinforcement.BarPlacement]:
+
+        if self.choice == "rectangle":
+
+            #
+            # Stirrups
+            #
+
+            stirrup_shape = self.create_stirrup_shape()
 
             if stirrup_shape.IsValid():
                 self.create_stirrups(stirrup_shape)
@@ -1494,23 +2772,7 @@ class Reinforcement3D:
             # Stirrups
             #
 
-            stirrup_shape_props = ReinforcementShapeProperties.rebar(self.main_stirrup[1],
-                                                                     self.bending_rol,
-                                                                     -1,
-                                                                     self.concrete_grade,
-                                                                     Reinforcement.BendingShapeType.Stirrup
-                                                                     )
-
-            stirrup_shape = GeneralShapeBuilder.create_circle_stirrup_with_user_hooks(self.col_radius,
-                                                                                      RotationUtil(0, 0, -10),
-                                                                                      stirrup_shape_props,
-                                                                                      self.concrete_cover,
-                                                                                      100,
-                                                                                      100,
-                                                                                      90,
-                                                                                      100,
-                                                                                      90
-                                                                                      )
+            stirrup_shape = self.create_stirrup_shape()
 
             if stirrup_shape.IsValid():
                 self.create_stirrups(stirrup_shape)
@@ -1551,6 +2813,9 @@ class Reinforcement3D:
 
         self.create_starter_rebars()
 
+        if VERIFY_QUANTITIES:
+            self.verify_quantities()
+
         return self.reinforcement
 
 
@@ -1598,8 +2863,10 @@ class Reinforcement3D:
 
     def create_longitudinal_shape(self,
                                   diameter : int) -> Reinforcement.BendingShape:
+        bending_roller = rebar_properties(diameter).mandrel_factor
+
         shape_props = ReinforcementShapeProperties.rebar(diameter,
-                                                         self.bending_rol,
+                                                         bending_roller,
                                                          -1,
                                                          self.concrete_grade,
                                                          Reinforcement.BendingShapeType.LongitudinalBar
@@ -1610,13 +2877,18 @@ class Reinforcement3D:
                                                                 0
                                                                 )
 
-        shape = GeneralShapeBuilder.create_longitudinal_shape_with_hooks(self.col_height,
-                                                                         RotationUtil(0, -90, 0),
-                                                                         shape_props,
-                                                                         cover_props,
-                                                                         -1,
-                                                                         -1
-                                                                         )
+        # The first and the second rebars often have the same diameter
+        shape_key = ("longitudinal", diameter, self.col_height, self.concrete_cover,
+                     bending_roller, self.concrete_grade, (0, -90, 0))
+
+        shape = self.cached_shape(shape_key,
+                                  lambda: GeneralShapeBuilder.create_longitudinal_shape_with_hooks(self.col_height,
+                                                                                                   RotationUtil(0, -90, 0),
+                                                                                                   shape_props,
+                                                                                                   cover_props,
+                                                                                                   -1,
+                                                                                                   -1
+                                                                                                   ))
 
         return shape
 
@@ -1632,14 +2904,18 @@ class Reinforcement3D:
             self.create_placement_regions()
 
         if distrib_along_side == "length":
-            length       = self.col_thick
-            model_angles = RotationUtil(0, 0, -90)
+            length   = self.col_thick
+            rotation = (0, 0, -90)
         else:
-            length       = self.col_length
-            model_angles = RotationUtil(0, 0, 0)
+            length   = self.col_length
+            rotation = (0, 0, 0)
+
+        model_angles = RotationUtil(*rotation)
+
+        bending_roller = rebar_properties(self.main_stirrup[1]).mandrel_factor
 
         cross_shape_props = ReinforcementShapeProperties.rebar(self.main_stirrup[1],
-                                                                self.bending_rol,
+                                                                bending_roller,
                                                                 -1,
                                                                 self.concrete_grade,
                                                                 Reinforcement.BendingShapeType.LongitudinalBar
@@ -1647,15 +2923,19 @@ class Reinforcement3D:
 
         cover_props = ConcreteCoverProperties.all(self.concrete_cover)
 
-        cross_shape = GeneralShapeBuilder.create_longitudinal_shape_with_user_hooks(length,
-                                                                                    model_angles,
-                                                                                    cross_shape_props,
-                                                                                    cover_props,
-                                                                                    0,
-                                                                                    0,
-                                                                                    180,
-                                                                                    180
-                                                                                    )
+        cross_key = ("crosstie", self.main_stirrup[1], length, self.concrete_cover,
+                     bending_roller, self.concrete_grade, rotation)
+
+        cross_shape = self.cached_shape(cross_key,
+                                        lambda: GeneralShapeBuilder.create_longitudinal_shape_with_user_hooks(length,
+                                                                                                              model_angles,
+                                                                                                              cross_shape_props,
+                                                                                                              cover_props,
+                                                                                                              0,
+                                                                                                              0,
+                                                                                                              180,
+                                                                                                              180
+                                                                                                              ))
         # Set longitudinal rebars
         for side in list_sides:
             placement_line, placement_cover_left, placement_cover_right = \
@@ -1726,8 +3006,10 @@ class Reinforcement3D:
 
     def create_starter_rebars(self) -> None:
         if self.has_next_col:
+            bending_roller = rebar_properties(self.starter_bar_diam).mandrel_factor
+
             shape_props = ReinforcementShapeProperties.rebar(self.starter_bar_diam,
-                                                             self.bending_rol,
+                                                             bending_roller,
                                                              -1,
                                                              self.concrete_grade,
                                                              Reinforcement.BendingShapeType.LongitudinalBar
@@ -1735,13 +3017,17 @@ class Reinforcement3D:
 
             cover_props = ConcreteCoverProperties.all(0)
 
-            shape = GeneralShapeBuilder.create_longitudinal_shape_with_hooks(self.starter_bar_length,
-                                                                             RotationUtil(0, -90, 0),
-                                                                             shape_props,
-                                                                             cover_props,
-                                                                             -1,
-                                                                             -1
-                                                                             )
+            shape_key = ("starter", self.starter_bar_diam, self.starter_bar_length, 0,
+                         bending_roller, self.concrete_grade, (0, -90, 0))
+
+            shape = self.cached_shape(shape_key,
+                                      lambda: GeneralShapeBuilder.create_longitudinal_shape_with_hooks(self.starter_bar_length,
+                                                                                                       RotationUtil(0, -90, 0),
+                                                                                                       shape_props,
+                                                                                                       cover_props,
+                                                                                                       -1,
+                                                                                                       -1
+                                                                                                       ))
 
             if shape.IsValid():
                 placement_z = self.col_height - self.starter_bar_length / 2
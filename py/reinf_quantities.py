@@ -0,0 +1,168 @@
+# -*- coding: utf8 -*-
+"""Quantities of the reinforcement of the column, calculated without creating the bar placements
+
+The regions and the counts follow the placements created by Reinforcement3D:
+three stirrup regions between the bottom and the underside of the slab, placed
+by distance, and the crossties on the intermediate longitudinal rebars.
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+import math
+
+from APIHub.rebar_tables import rebar_properties
+
+
+# Covers at the bottom and at the top of the stirrup placement in mm
+STIRRUP_PLACEMENT_COVER = 50
+
+# Factor for the real footprint of the longitudinal rebars
+REBAR_FOOTPRINT_FACTOR = 1.3
+
+# Below this distance between the intermediate rebars, one rebar of two is tied, in mm
+CROSSTIE_ALL_REBARS_MIN_DIST = 150
+
+# Compare the calculated quantities with the bar placements, the differences are printed in the trace
+VERIFY_QUANTITIES = False
+
+
+class StirrupRegion(NamedTuple):
+    """Definition of class StirrupRegion
+    """
+    length  : float
+    spacing : float
+    count   : int
+
+
+def bar_count_by_distance(length  : float,
+                          spacing : float) -> int:
+    """Quantity of bars placed from start to end of a region with a maximal distance
+
+    Args:
+        length  : length of the region
+        spacing : distance between the bars
+
+    Returns:
+        Quantity of bars, 0 for an empty region
+    """
+    if length <= 0 or spacing <= 0:
+        return 0
+
+    return math.ceil(length / spacing - 1e-9) + 1
+
+
+def stirrup_regions(column_height  : float,
+                    slab_height    : float,
+                    main_spacing   : float,
+                    bottom_spacing : float,
+                    bottom_length  : float,
+                    top_spacing    : float,
+                    top_length     : float) -> Tuple[StirrupRegion, StirrupRegion, StirrupRegion]:
+    """Calculate the stirrup regions, the middle region takes the remaining length
+
+    Args:
+        column_height  : height of the column
+        slab_height    : height of the slab
+        main_spacing   : distance between the main stirrups [A]
+        bottom_spacing : distance between the bottom stirrups [B]
+        bottom_length  : length of the bottom region [B]
+        top_spacing    : distance between the top stirrups [C]
+        top_length     : length of the top region [C]
+
+    Returns:
+        Bottom, middle and top regions
+    """
+    placement_length = column_height - slab_height - 2 * STIRRUP_PLACEMENT_COVER
+
+    bottom_length = min(bottom_length, max(placement_length, 0))
+    top_length    = min(top_length, max(placement_length - bottom_length, 0))
+    main_length   = max(placement_length - bottom_length - top_length, 0)
+
+    return (StirrupRegion(bottom_length, bottom_spacing, bar_count_by_distance(bottom_length, bottom_spacing)),
+            StirrupRegion(main_length, main_spacing, bar_count_by_distance(main_length, main_spacing)),
+            StirrupRegion(top_length, top_spacing, bar_count_by_distance(top_length, top_spacing)))
+
+
+def stirrup_counts(regions : Tuple[StirrupRegion, ...]) -> List[int]:
+    """Stirrup quantities and spacings in the layout of Reinforcement3D.count_stirrup
+
+    Args:
+        regions : stirrup regions
+
+    Returns:
+        Quantity and spacing in cm of each region
+    """
+    count_stirrup = []
+
+    for region in regions:
+        count_stirrup.append(region.count)
+        count_stirrup.append(round(region.spacing / 10))
+
+    return count_stirrup
+
+
+def crosstie_count(side_length      : float,
+                   concrete_cover   : float,
+                   stirrup_diameter : float,
+                   frst_bar_diam    : float,
+                   scnd_bar_diam    : float,
+                   qtt_rebars       : int) -> int:
+    """Quantity of crossties in the section along one side
+
+    Args:
+        side_length      : length of the side of the column
+        concrete_cover   : concrete cover
+        stirrup_diameter : diameter of the stirrups
+        frst_bar_diam    : diameter of the corner rebars
+        scnd_bar_diam    : diameter of the intermediate rebars
+        qtt_rebars       : quantity of intermediate rebars on the side
+
+    Returns:
+        Quantity of crossties
+    """
+    if qtt_rebars <= 0:
+        return 0
+
+    # Placement line between the axis of the corner rebars
+    placement_length = side_length - 2 * (concrete_cover + stirrup_diameter) \
+                       - (scnd_bar_diam + frst_bar_diam) * REBAR_FOOTPRINT_FACTOR
+
+    distance = placement_length / (qtt_rebars + 1) - scnd_bar_diam / 2
+
+    if distance < CROSSTIE_ALL_REBARS_MIN_DIST:
+        return len(range(1, qtt_rebars, 2))
+
+    return qtt_rebars
+
+
+def bars_weight(bars : List[Tuple[int, float, float]]) -> float:
+    """Nominal weight of rebars, the hooks are not taken into account
+
+    Args:
+        bars : quantity, diameter in mm and length in mm of each group of rebars
+
+    Returns:
+        Weight in kg
+    """
+    return sum(count * length * 1e-3 * rebar_properties(diameter).weight_per_ml for count, diameter, length in bars)
+
+
+def verify_quantities(calculated : Tuple[List[int], Dict[str, int]],
+                      placed     : Tuple[List[int], Dict[str, int]]) -> bool:
+    """Compare the calculated quantities with the quantities of the bar placements
+
+    Args:
+        calculated : stirrup counts and crosstie counts calculated without the placements
+        placed     : stirrup counts and crosstie counts of the placements
+
+    Returns:
+        True/False if the quantities are the same
+    """
+    is_same = list(calculated[0]) == list(placed[0]) and dict(calculated[1]) == dict(placed[1])
+
+    if not is_same:
+        print(f"Quantités calculées différentes des armatures : {calculated} / {placed}")
+
+    return is_same
@@ -0,0 +1,276 @@
+# -*- coding: utf8 -*-
+"""SQLite storage of the generated reinforcement of the columns, kept between the sessions
+
+The bar placements are stored as plain data (shape polyline, bending rollers, diameter,
+grades, placement points), a stored reinforcement is created again without the shape builders.
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, Dict, List, Optional
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+try:
+    import NemAll_Python_Geometry      as Geometry
+    import NemAll_Python_Reinforcement as Reinforcement
+    import NemAll_Python_Utility       as AllplanUtil
+except ImportError:
+    Geometry      = None
+    Reinforcement = None
+    AllplanUtil   = None
+
+
+# Name of the store, in the folder of the project
+REINF_STORE_FILE_NAME = "reinf_concr_column.sqlite"
+
+# Reinforcements not used since this delay are dropped, in seconds
+REINF_STORE_MAX_AGE = 90 * 24 * 3600
+
+# Maximal quantity of stored reinforcements, the least recently used ones are dropped
+REINF_STORE_MAX_ENTRIES = 20000
+
+# The last use of a reinforcement is only written again after this delay, in seconds
+REINF_STORE_TOUCH_DELAY = 24 * 3600
+
+REINF_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reinforcement (
+    key       TEXT PRIMARY KEY,
+    version   TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reinforcement_last_used ON reinforcement (last_used);
+"""
+
+
+def reinforcement_hash(values : tuple) -> str:
+    """Get a hash of the values defining a reinforcement, the same in all the sessions
+
+    Args:
+        values : values defining the reinforcement, see Reinforcement3D.key
+
+    Returns:
+        Hexadecimal hash
+    """
+    return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+
+def describe_point(point : Any) -> List[float]:
+    return [point.X, point.Y, point.Z]
+
+
+def describe_shape_settings(shape : Any) -> tuple:
+    """Get the values of a bending shape depending on the Allplan settings
+
+    Args:
+        shape : bending shape created with the default steel grade and hook lengths
+
+    Returns:
+        Steel grade and points of the shape, with the hooks resolved by Allplan
+    """
+    polyline = shape.GetShapePolyline()
+
+    return (shape.GetSteelGrade(),
+            tuple(tuple(round(value, 3) for value in describe_point(polyline[index])) for index in range(polyline.Count())))
+
+
+def describe_bar_placement(rebar : Any) -> Dict[str, Any]:
+    """Get the data of a bar placement
+
+    Args:
+        rebar : bar placement
+
+    Returns:
+        Data of the bar placement and of its bending shape, serializable in JSON
+    """
+    shape    = rebar.GetBendingShape()
+    polyline = shape.GetShapePolyline()
+
+    return {'position'       : rebar.GetPositionNumber(),
+            'count'          : rebar.GetBarCount(),
+            'distance'       : describe_point(rebar.GetDistanceVector()),
+            'start'          : describe_point(rebar.GetStartPoint()),
+            'end'            : describe_point(rebar.GetEndPoint()),
+            'points'         : [describe_point(polyline[index]) for index in range(polyline.Count())],
+            'rollers'        : list(shape.GetBendingRoller()),
+            'diameter'       : shape.GetDiameter(),
+            'steel_grade'    : shape.GetSteelGrade(),
+            'concrete_grade' : shape.GetConcreteGrade(),
+            'shape_type'     : shape.GetShapeType().name
+            }
+
+
+def create_bar_placement(data : Dict[str, Any]) -> Any:
+    """Create a bar placement from its data
+
+    Args:
+        data : data of the bar placement, see describe_bar_placement
+
+    Returns:
+        Bar placement
+    """
+    polyline = Geometry.Polyline3D()
+    for point in data['points']:
+        polyline += Geometry.Point3D(*point)
+
+    shape = Reinforcement.BendingShape(polyline,
+                                       AllplanUtil.VecDoubleList(data['rollers']),
+                                       data['diameter'],
+                                       data['steel_grade'],
+                                       data['concrete_grade'],
+                                       Reinforcement.BendingShapeType.names[data['shape_type']])
+
+    return Reinforcement.BarPlacement(data['position'],
+                                      data['count'],
+                                      Geometry.Vector3D(*data['distance']),
+                                      Geometry.Point3D(*data['start']),
+                                      Geometry.Point3D(*data['end']),
+                                      shape)
+
+
+def copy_bar_placement(rebar : Any) -> Any:
+    """Copy a bar placement and its bending shape
+
+    Args:
+        rebar : bar placement
+
+    Returns:
+        Bar placement which can be moved or modified without changing the original one
+    """
+    return Reinforcement.BarPlacement(rebar.GetPositionNumber(),
+                                      rebar.GetBarCount(),
+                                      rebar.GetDistanceVector(),
+                                      rebar.GetStartPoint(),
+                                      rebar.GetEndPoint(),
+                                      Reinforcement.BendingShape(rebar.GetBendingShape()))
+
+
+class ReinforcementStore:
+    """Definition of class ReinforcementStore
+
+    Reinforcement data by hash of the reinforcement values. The data of another version
+    of the script is dropped at the opening, as well as the data not used for too long
+    and the oldest data above the maximal quantity. After a SQLite error the store is
+    disabled for the session, the reinforcements are then always created.
+    """
+    def __init__(self,
+                 file_path   : str,
+                 version     : str,
+                 max_age     : float = REINF_STORE_MAX_AGE,
+                 max_entries : int = REINF_STORE_MAX_ENTRIES):
+        self.file_path   = file_path
+        self.version     = version
+        self.max_age     = max_age
+        self.max_entries = max_entries
+        self.enabled     = True
+        self.connection  = sqlite3.connect(file_path, check_same_thread = False)
+        self.connection.executescript(REINF_STORE_SCHEMA)
+
+        self.evict()
+
+
+    def disable(self,
+                error : Exception) -> None:
+        print(f"Cache des armatures désactivé : {error}")
+        self.enabled = False
+
+
+    def get(self,
+            key : str) -> Optional[Dict[str, Any]]:
+        """Get the data of a reinforcement
+
+        Args:
+            key : hash of the reinforcement values
+
+        Returns:
+            Reinforcement data, None if the reinforcement is not stored or if the store is disabled
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            row = self.connection.execute("SELECT data, last_used FROM reinforcement WHERE key = ? AND version = ?",
+                                          (key, self.version)).fetchone()
+
+            if row is None:
+                return None
+
+            # Only written once a day, a hit doesn't commit in most cases
+            now = time.time()
+            if now - row[1] > REINF_STORE_TOUCH_DELAY:
+                with self.connection:
+                    self.connection.execute("UPDATE reinforcement SET last_used = ? WHERE key = ?", (now, key))
+
+            return json.loads(row[0])
+
+        except (sqlite3.Error, ValueError) as error:
+            self.disable(error)
+            return None
+
+
+    def put(self,
+            key  : str,
+            data : Dict[str, Any]) -> None:
+        """Store the data of a reinforcement, the previous data of the key is replaced
+
+        Args:
+            key  : hash of the reinforcement values
+            data : reinforcement data, serializable in JSON
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO reinforcement (key, version, data, last_used) VALUES (?, ?, ?, ?)",
+                                        (key, self.version, json.dumps(data), time.time()))
+        except sqlite3.Error as error:
+            self.disable(error)
+
+
+    def evict(self) -> None:
+        """Drop the data of the other versions, the data not used since max_age and the least
+        recently used data above max_entries
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM reinforcement WHERE version != ? OR last_used < ?",
+                                    (self.version, time.time() - self.max_age))
+            self.connection.execute("DELETE FROM reinforcement WHERE key NOT IN "
+                                    "(SELECT key FROM reinforcement ORDER BY last_used DESC LIMIT ?)", (self.max_entries, ))
+
+
+    def clear(self) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM reinforcement")
+
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+# Stores opened by the script
+REINF_STORES : Dict[tuple, ReinforcementStore] = {}
+
+
+def open_reinforcement_store(folder  : str,
+                             version : str) -> ReinforcementStore:
+    """Get the store of a folder, the connection is kept for the next calls
+
+    Args:
+        folder  : folder of the store, usually the folder of the project
+        version : version of the script, the data of the other versions is dropped
+
+    Returns:
+        Reinforcement store
+    """
+    key = (os.path.normcase(os.path.abspath(folder)), version)
+
+    if key not in REINF_STORES:
+        REINF_STORES[key] = ReinforcementStore(os.path.join(folder, REINF_STORE_FILE_NAME), version)
+
+    return REINF_STORES[key]
@@ -0,0 +1,135 @@
+# -*- coding: utf8 -*-
+"""Builds of create_element kept for the calls with the same parameters
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from APIHub.geometry_cache import GeometryCache
+
+
+# Fields defining the Allplan objects used as parameter values, by type name. The methods are called.
+KNOWN_TYPE_FIELDS = {"Point2D"          : ("X", "Y"),
+                     "Point3D"          : ("X", "Y", "Z"),
+                     "Vector3D"         : ("X", "Y", "Z"),
+                     "PlaneReferences"  : ("GetAbsBottomElevation", "GetAbsTopElevation")
+                     }
+
+# Allplan objects keyed by all their properties, their fields depend on the Allplan version
+ALL_FIELDS_TYPES = ("CommonProperties", )
+
+
+def public_fields(value : Any) -> Tuple[str, ...]:
+    """Get the names of the properties of an object, the methods are not included
+
+    Args:
+        value : Allplan object
+
+    Returns:
+        Sorted names of the properties
+    """
+    return tuple(name for name in sorted(dir(value))
+                 if not name.startswith("_") and not callable(getattr(value, name)))
+
+
+def stable_key(value : Any) -> Hashable:
+    """Get a key depending only on the content of a parameter value
+
+    The Allplan objects are keyed by the fields of KNOWN_TYPE_FIELDS or by all their properties
+    for ALL_FIELDS_TYPES, the plane references by their elevations in the document.
+
+    Args:
+        value : parameter value or snapshot of the parameters
+
+    Returns:
+        Hashable key
+
+    Raises:
+        TypeError: the value has a type without known fields, it can't be keyed
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return tuple(stable_key(item) for item in value)
+
+    type_name = type(value).__name__
+
+    if type_name in ALL_FIELDS_TYPES:
+        return (type_name, ) + tuple((name, stable_key(getattr(value, name))) for name in public_fields(value))
+
+    if type_name not in KNOWN_TYPE_FIELDS:
+        raise TypeError(f"No key for the values of type {type_name}")
+
+    fields = (getattr(value, name) for name in KNOWN_TYPE_FIELDS[type_name])
+
+    return (type_name, ) + tuple(stable_key(field() if callable(field) else field) for field in fields)
+
+
+def result_key(*values : Any) -> Optional[Hashable]:
+    """Get the key of a build of create_element
+
+    Args:
+        values : parameter values, snapshot of the parameters and other values of the document
+
+    Returns:
+        Hashable key, None if a value can't be keyed and the build must not be cached
+    """
+    try:
+        return tuple(stable_key(value) for value in values)
+    except TypeError:
+        return None
+
+
+class ResultCache(GeometryCache):
+    """Definition of class ResultCache
+
+    Builds of create_element by parameter key, the least recently used ones are dropped
+    above max_size. A build is shared by all the calls with its key: it holds the objects
+    and the geometries, never the elements and the handles of a CreateElementResult.
+    Allplan modifies and takes over those, each call creates its own from the build.
+    """
+    def __init__(self,
+                 max_size : int = 16):
+        GeometryCache.__init__(self, max_size)
+
+        self.uncached = 0
+
+
+    def get(self,
+            key    : Optional[Hashable],
+            create : Callable[[], Any]) -> Any:
+        """Get the build of a key, created only at the first call
+
+        Args:
+            key    : key of the build, None to create the build without caching it
+            create : function creating the build
+
+        Returns:
+            Build of create_element
+        """
+        if key is None:
+            with self.lock:
+                self.uncached += 1
+
+            return create()
+
+        return GeometryCache.get(self, key, create)
+
+
+    def clear(self) -> None:
+        with self.lock:
+            GeometryCache.clear(self)
+
+            self.uncached = 0
+
+
+    def stats(self) -> Dict[str, Any]:
+        stats = GeometryCache.stats(self)
+
+        calls = self.hits + self.misses
+        stats['hit_rate'] = self.hits / calls if calls else 0.0
+        stats['uncached'] = self.uncached
+
+        return stats
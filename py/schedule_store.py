@@ -0,0 +1,209 @@
+# -*- coding: utf8 -*-
+"""SQLite storage of the reinforcement schedules of a project
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import os
+import sqlite3
+import threading
+
+from APIHub.column_schedule import ScheduleRow, iter_schedule
+
+
+# Extensions of the schedule stores
+SCHEDULE_STORE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+
+SCHEDULE_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS column_schedule (
+    level             TEXT    NOT NULL,
+    column_id         TEXT    NOT NULL,
+    long_bar_diameter INTEGER NOT NULL,
+    long_bar_quantity INTEGER NOT NULL,
+    stirrup_diameter  INTEGER NOT NULL,
+    stirrup_spacing_a REAL    NOT NULL,
+    stirrup_spacing_b REAL    NOT NULL,
+    stirrup_spacing_c REAL    NOT NULL,
+    PRIMARY KEY (column_id, level)
+);
+CREATE INDEX IF NOT EXISTS column_schedule_level ON column_schedule (level, column_id);
+"""
+
+# Rows read at once while streaming a level
+SCHEDULE_STORE_FETCH_SIZE = 256
+
+SCHEDULE_ROW_COLUMNS = "column_id, long_bar_diameter, long_bar_quantity, stirrup_diameter, " \
+                       "stirrup_spacing_a, stirrup_spacing_b, stirrup_spacing_c"
+
+
+def is_schedule_store(file_path : str) -> bool:
+    """Check if a schedule file is a SQLite store
+
+    Args:
+        file_path : path of the schedule file
+
+    Returns:
+        True/False if the file is a SQLite store
+    """
+    return os.path.splitext(file_path)[1].lower() in SCHEDULE_STORE_EXTENSIONS
+
+
+def schedule_store_path(csv_path : str) -> str:
+    """Get the path of the store built from a CSV schedule
+
+    Args:
+        csv_path : path of the CSV file
+
+    Returns:
+        Path of the SQLite file, next to the CSV file
+    """
+    return os.path.splitext(csv_path)[0] + SCHEDULE_STORE_EXTENSIONS[0]
+
+
+class ScheduleStore:
+    """Definition of class ScheduleStore
+
+    Schedule rows of all the levels of a project, indexed on column name and level.
+    The connection is used by the palette and by the schedule loader thread, one at a time.
+    """
+    def __init__(self,
+                 file_path : str):
+        self.file_path  = file_path
+        self.lock       = threading.RLock()
+        self.connection = sqlite3.connect(file_path, check_same_thread = False)
+        self.connection.executescript(SCHEDULE_STORE_SCHEMA)
+
+
+    def load_rows(self,
+                  schedule_rows : Iterable[ScheduleRow],
+                  level         : str = "") -> int:
+        """Replace the rows of a level, in a single transaction
+
+        Args:
+            schedule_rows : schedule rows, the first row of each column is kept
+            level         : level of the rows
+
+        Returns:
+            Number of rows of the level
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM column_schedule WHERE level = ?", (level, ))
+                self.connection.executemany(f"INSERT OR IGNORE INTO column_schedule (level, {SCHEDULE_ROW_COLUMNS}) "
+                                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                            ((level, *schedule_row) for schedule_row in schedule_rows))
+
+            return self.connection.execute("SELECT COUNT(*) FROM column_schedule WHERE level = ?", (level, )).fetchone()[0]
+
+
+    def load_csv(self,
+                 csv_path : str,
+                 level    : str = "") -> int:
+        """Replace the rows of a level by the rows of a CSV schedule
+
+        Args:
+            csv_path : path of the CSV file
+            level    : level of the rows
+
+        Returns:
+            Number of rows of the level
+        """
+        return self.load_rows(iter_schedule(csv_path), level)
+
+
+    def lookup(self,
+               column_id : str,
+               level     : str = "") -> Optional[ScheduleRow]:
+        """Get the schedule row of a column
+
+        Args:
+            column_id : column name
+            level     : level of the column, the first level is used if empty
+
+        Returns:
+            Schedule row, None if the column is not in the store
+        """
+        with self.lock:
+            if level:
+                row = self.connection.execute(f"SELECT {SCHEDULE_ROW_COLUMNS} FROM column_schedule "
+                                              "WHERE column_id = ? AND level = ?", (column_id, level)).fetchone()
+            else:
+                row = self.connection.execute(f"SELECT {SCHEDULE_ROW_COLUMNS} FROM column_schedule "
+                                              "WHERE column_id = ? ORDER BY level LIMIT 1", (column_id, )).fetchone()
+
+        return ScheduleRow(*row) if row is not None else None
+
+
+    def iter_rows(self,
+                  level : str = "") -> Iterator[ScheduleRow]:
+        """Stream the rows of a level
+
+        Args:
+            level : level of the rows, all the levels if empty
+
+        Yields:
+            Schedule rows, sorted by level and column name
+        """
+        with self.lock:
+            if level:
+                cursor = self.connection.execute(f"SELECT {SCHEDULE_ROW_COLUMNS} FROM column_schedule "
+                                                 "WHERE level = ? ORDER BY column_id", (level, ))
+            else:
+                cursor = self.connection.execute(f"SELECT {SCHEDULE_ROW_COLUMNS} FROM column_schedule "
+                                                 "ORDER BY level, column_id")
+
+        # The lock is only held while fetching, not while the caller uses the rows
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(SCHEDULE_STORE_FETCH_SIZE)
+
+            if not rows:
+                return
+
+            for row in rows:
+                yield ScheduleRow(*row)
+
+
+    def levels(self) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT level FROM column_schedule ORDER BY level")]
+
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+# Stores opened by the script, from the palette and from the schedule loader thread
+SCHEDULE_STORES : Dict[str, ScheduleStore] = {}
+
+SCHEDULE_STORES_LOCK = threading.Lock()
+
+
+def open_schedule_store(file_path : str,
+                        create    : bool = False) -> ScheduleStore:
+    """Get the store of a file, the connection is kept for the next calls
+
+    Args:
+        file_path : path of the SQLite file
+        create    : create the file if it does not exist
+
+    Returns:
+        Schedule store
+
+    Raises:
+        FileNotFoundError: the file does not exist and is not created
+    """
+    key = os.path.normcase(os.path.abspath(file_path))
+
+    with SCHEDULE_STORES_LOCK:
+        if key not in SCHEDULE_STORES:
+            # sqlite3 would create an empty store for a mistyped path
+            if not create and not os.path.isfile(file_path):
+                raise FileNotFoundError(f"Fichier introuvable : {file_path}")
+
+            SCHEDULE_STORES[key] = ScheduleStore(file_path)
+
+        return SCHEDULE_STORES[key]
@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+"""Polygons of the circular sections, with a segment count given by the chord tolerance
+
+Author:
+    API2GETHER - 2024
+"""
+from typing import Tuple
+
+import functools
+import math
+
+try:
+    import NemAll_Python_Geometry as Geometry
+except ImportError:
+    Geometry = None
+
+from APIHub.geometry_cache import GEOMETRY_CACHE
+
+
+# Maximal distance between the arc and the chord on the paper, in mm
+PAPER_CHORD_TOLERANCE = 0.05
+
+# Scale of the drawing when it is not given
+DEFAULT_DRAWING_SCALE = 100
+
+# Segment count, a multiple of 4 keeps the polygon symmetric along X and Y
+MIN_SEGMENT_COUNT = 12
+MAX_SEGMENT_COUNT = 720
+
+
+def chord_tolerance(paper_tolerance : float = PAPER_CHORD_TOLERANCE,
+                    scale           : float = DEFAULT_DRAWING_SCALE) -> float:
+    """Chord tolerance in the model
+
+    Args:
+        paper_tolerance : tolerance on the paper in mm
+        scale           : scale of the drawing
+
+    Returns:
+        Tolerance in mm
+    """
+    return paper_tolerance * scale
+
+
+def segment_count(radius    : float,
+                  tolerance : float) -> int:
+    """Quantity of segments of a circle, the distance between an arc and its chord stays below the tolerance
+
+    Args:
+        radius    : radius of the circle
+        tolerance : chord tolerance
+
+    Returns:
+        Quantity of segments
+    """
+    if tolerance <= 0 or tolerance >= radius:
+        return MIN_SEGMENT_COUNT
+
+    count = math.ceil(math.pi / math.acos(1 - tolerance / radius))
+    count = 4 * math.ceil(count / 4)
+
+    return min(max(count, MIN_SEGMENT_COUNT), MAX_SEGMENT_COUNT)
+
+
+@functools.lru_cache(maxsize = None)
+def unit_circle(count : int) -> Tuple[Tuple[float, float], ...]:
+    """Cosinus and sinus of the vertices of a polygon inscribed in the unit circle
+
+    Args:
+        count : quantity of segments
+
+    Returns:
+        Coordinates of the vertices
+    """
+    return tuple((math.cos(2 * math.pi * index / count), math.sin(2 * math.pi * index / count)) for index in range(count))
+
+
+@functools.lru_cache(maxsize = 1024)
+def circle_points(radius    : float,
+                  tolerance : float) -> Tuple[Tuple[float, float], ...]:
+    """Vertices of a closed polygon inscribed in a circle centered on the origin
+
+    Args:
+        radius    : radius of the circle
+        tolerance : chord tolerance
+
+    Returns:
+        Coordinates of the vertices, the first vertex is repeated at the end
+    """
+    points = tuple((radius * cos, radius * sin) for cos, sin in unit_circle(segment_count(radius, tolerance)))
+
+    return points + points[:1]
+
+
+def circle_polygon(radius    : float,
+                   tolerance : float) -> "Geometry.Polygon2D":
+    """Polygon inscribed in a circle centered on the origin, shared by the calls with the same values
+
+    Args:
+        radius    : radius of the circle
+        tolerance : chord tolerance
+
+    Returns:
+        Closed polygon
+    """
+    def create_polygon() -> "Geometry.Polygon2D":
+        polygon = Geometry.Polygon2D()
+        for x, y in circle_points(radius, tolerance):
+            polygon += Geometry.Point2D(x, y)
+
+        return polygon
+
+    return GEOMETRY_CACHE.get(("circle_polygon", radius, tolerance), create_polygon)
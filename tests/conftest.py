@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+"""Configuration of the tests
+
+The modules of the py folder are imported as the APIHub package, as in Allplan.
+Only the modules working without Allplan are tested.
+
+Author:
+    API2GETHER - 2024
+"""
+import os
+import sys
+import types
+
+import pytest
+
+
+PY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "py")
+
+if "APIHub" not in sys.modules:
+    package = types.ModuleType("APIHub")
+    package.__path__ = [PY_DIR]
+    sys.modules["APIHub"] = package
+
+
+# Headers of the reinforcement schedule
+SCHEDULE_HEADER = "Repère,Diamètre Armatures Longitudinales,Quantité Armatures Longitudinales," \
+                  "Diamètre Armatures Transversales,Espacement A Armatures Transversales," \
+                  "Espacement B Armatures Transversales,Espacement C Armatures Transversales\n"
+
+
+@pytest.fixture
+def write_schedule(tmp_path):
+    """Write a CSV schedule with the headers of the script, the rows are given as text
+    """
+    def write(lines : str) -> str:
+        file_path = str(tmp_path / "schedule.csv")
+
+        with open(file_path, mode='w', encoding='utf-8') as file:
+            file.write(SCHEDULE_HEADER + lines)
+
+        return file_path
+
+    return write
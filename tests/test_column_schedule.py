@@ -0,0 +1,45 @@
+# -*- coding: utf8 -*-
+"""Tests of the parsed schedule cache
+
+Author:
+    API2GETHER - 2024
+"""
+import os
+
+from APIHub.column_schedule import ScheduleCache, read_schedule_index
+
+
+def test_read_schedule_index_keeps_first_row(write_schedule):
+    file_path = write_schedule("P1,12,4,6,200,100,100\n"
+                               "P1,20,4,6,200,100,100\n"
+                               "P2,14,6,8,250,150,150\n")
+
+    index = read_schedule_index(file_path)
+
+    assert sorted(index) == ["P1", "P2"]
+    assert index["P1"].long_bar_diameter == 12
+
+
+def test_cache_hits(write_schedule):
+    file_path = write_schedule("P1,12,4,6,200,100,100\n")
+
+    cache = ScheduleCache(auto_compile = False)
+
+    assert cache.lookup(file_path, "P1").long_bar_diameter == 12
+    assert cache.lookup(file_path, "P2") is None
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_cache_parses_modified_file(write_schedule):
+    file_path = write_schedule("P1,12,4,6,200,100,100\n")
+
+    cache = ScheduleCache(auto_compile = False)
+    cache.lookup(file_path, "P1")
+
+    write_schedule("P1,16,4,6,200,100,100\n")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    assert cache.lookup(file_path, "P1").long_bar_diameter == 16
+    assert cache.stats()['misses'] == 2
@@ -0,0 +1,38 @@
+# -*- coding: utf8 -*-
+"""Tests of the stack solver
+
+Author:
+    API2GETHER - 2024
+"""
+from APIHub.column_design import StackStorey, solve_stack_layout
+
+
+def test_stack_layout_diameters_decrease():
+    storeys = [StackStorey(600, 600, 0, 3000), StackStorey(500, 500, 0, 3000), StackStorey(300, 300, 0, 3000)]
+
+    layouts = solve_stack_layout("rectangle", storeys, 30)
+
+    assert len(layouts) == 3
+    assert all(upper.frst_bar_diameter <= lower.frst_bar_diameter for lower, upper in zip(layouts, layouts[1:]))
+    assert all(layout.scnd_bar_diameter <= layout.frst_bar_diameter for layout in layouts)
+
+
+def test_stack_layout_same_diameter():
+    storeys = [StackStorey(600, 600, 0, 3000), StackStorey(400, 400, 0, 3000)]
+
+    layouts = solve_stack_layout("rectangle", storeys, 30, same_diameter = True)
+
+    assert all(layout.scnd_bar_diameter == layout.frst_bar_diameter for layout in layouts)
+
+
+def test_stack_layout_empty():
+    assert solve_stack_layout("rectangle", [], 30) is None
+
+
+def test_circular_stack_layout():
+    storeys = [StackStorey(0, 0, 300, 3000), StackStorey(0, 0, 250, 3000)]
+
+    layouts = solve_stack_layout("circle", storeys, 30)
+
+    assert all(layout.rebar_circ_qtt > 0 for layout in layouts)
+    assert layouts[1].frst_bar_diameter <= layouts[0].frst_bar_diameter
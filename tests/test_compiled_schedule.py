@@ -0,0 +1,80 @@
+# -*- coding: utf8 -*-
+"""Tests of the compiled schedule and of its memory-mapped lookup
+
+Author:
+    API2GETHER - 2024
+"""
+import os
+
+import pytest
+
+from APIHub import column_schedule
+from APIHub.column_schedule import CompiledSchedule, ScheduleCache, ScheduleRow, compile_schedule, compiled_schedule_path
+
+
+@pytest.fixture(autouse = True)
+def compiled_dir(tmp_path, monkeypatch):
+    compiled_dir = str(tmp_path / "compiled")
+    monkeypatch.setattr(column_schedule, "COMPILED_SCHEDULE_DIR", compiled_dir)
+
+    return compiled_dir
+
+
+def truncate(file_path : str) -> None:
+    with open(file_path, mode='r+b') as file:
+        file.truncate(os.path.getsize(file_path) - 5)
+
+
+def test_compiled_lookup(write_schedule):
+    file_path = write_schedule("".join(f"P{index},12,4,6,200,100,{index}\n" for index in range(50)))
+
+    compiled = CompiledSchedule(compile_schedule(file_path))
+
+    try:
+        assert compiled.count == 50
+        assert compiled.lookup("P37") == ScheduleRow("P37", 12, 4, 6, 200.0, 100.0, 37.0)
+        assert compiled.lookup("P50") is None
+        assert compiled.lookup("P" * 100) is None
+    finally:
+        compiled.close()
+
+
+def test_compiled_size_check(write_schedule):
+    compiled_path = compile_schedule(write_schedule("P1,12,4,6,200,100,100\nP2,14,6,8,250,150,150\n"))
+
+    truncate(compiled_path)
+
+    with pytest.raises(ValueError):
+        CompiledSchedule(compiled_path)
+
+
+def test_compiled_file_in_local_folder(write_schedule, tmp_path, compiled_dir):
+    file_path = write_schedule("P1,12,4,6,200,100,100\n")
+
+    cache = ScheduleCache()
+    cache.lookup(file_path, "P1")
+    cache.clear()
+
+    # Nothing is written next to the CSV file
+    assert sorted(os.listdir(os.path.dirname(file_path))) == ["compiled", "schedule.csv"]
+    assert os.path.dirname(compiled_schedule_path(file_path)) == compiled_dir
+    assert cache.lookup(file_path, "P1").long_bar_diameter == 12
+    assert cache.stats()['compiled_opens'] == 1 and cache.stats()['misses'] == 0
+
+    cache.clear()
+
+
+def test_cache_recompiles_truncated_file(write_schedule, compiled_dir):
+    file_path = write_schedule("P1,12,4,6,200,100,100\nP2,14,6,8,250,150,150\n")
+
+    cache = ScheduleCache()
+    assert cache.lookup(file_path, "P2").long_bar_diameter == 14
+    cache.clear()
+
+    truncate(compiled_schedule_path(file_path))
+
+    assert cache.lookup(file_path, "P2").long_bar_diameter == 14
+    assert cache.stats()['compiled_opens'] == 1
+    assert os.listdir(compiled_dir) == [os.path.basename(compiled_schedule_path(file_path))]
+
+    cache.clear()
@@ -0,0 +1,47 @@
+# -*- coding: utf8 -*-
+"""Tests of the geometry interning cache
+
+Author:
+    API2GETHER - 2024
+"""
+import threading
+
+from APIHub.geometry_cache import GeometryCache
+
+
+def test_geometry_cache_eviction():
+    cache = GeometryCache(max_size = 2)
+
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 0) == 1
+    assert cache.get("c", lambda: 3) == 3
+
+    # "b" is the least recently used key
+    assert cache.get("b", lambda: 4) == 4
+    assert cache.stats() == {'hits' : 1, 'misses' : 4, 'entries' : 2, 'max_size' : 2}
+
+    cache.clear()
+
+    assert cache.stats()['entries'] == 0 and cache.hits == 0
+
+
+def test_geometry_created_once():
+    cache   = GeometryCache()
+    created = []
+
+    def create():
+        created.append(1)
+        return object()
+
+    geometries = []
+    threads    = [threading.Thread(target = lambda: geometries.append(cache.get(("cuboid", 400, 300), create)))
+                  for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(geometry is geometries[0] for geometry in geometries)
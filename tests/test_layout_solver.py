@@ -0,0 +1,79 @@
+# -*- coding: utf8 -*-
+"""Tests of the lightest longitudinal layout solvers
+
+Author:
+    API2GETHER - 2024
+"""
+import math
+
+import pytest
+
+from APIHub import column_design
+from APIHub.column_design import circ_bar_count_bounds, side_bar_count_bounds, solve_circ_layout, solve_rect_layout
+
+
+def test_side_bar_count_bounds():
+    min_value, max_value = side_bar_count_bounds(400, 30)
+
+    assert 0 <= min_value <= max_value
+
+
+def test_rect_layout():
+    layout = solve_rect_layout(400, 300, 30, 5, 40)
+
+    assert (layout.frst_bar_diameter, layout.scnd_bar_diameter) == (8, 8)
+    assert (layout.qtt_in_length, layout.qtt_in_thick) == (2, 1)
+    assert math.isclose(layout.as_real, 5.0265, rel_tol = 1e-4)
+
+
+def test_rect_layout_without_solution():
+    assert solve_rect_layout(400, 300, 30, 500, 600) is None
+
+
+def test_rect_layout_diameters():
+    layout = solve_rect_layout(600, 600, 30, 20, 144, frst_diameter = 20)
+
+    assert layout.frst_bar_diameter == 20
+    assert layout.scnd_bar_diameter <= 20
+
+    layout = solve_rect_layout(600, 600, 30, 20, 144, same_diameter = True)
+
+    assert layout.frst_bar_diameter == layout.scnd_bar_diameter
+
+
+def test_circ_layout():
+    layout = solve_circ_layout(250, 30, 5, 40)
+
+    assert layout.frst_bar_diameter == 8
+    assert layout.rebar_circ_qtt == 10
+    assert circ_bar_count_bounds(250, 30)[0] <= layout.rebar_circ_qtt
+
+
+@pytest.mark.parametrize("args, kwargs", [((400, 300, 30, 5, 40), {}),
+                                          ((600, 600, 30, 20, 144), {'same_diameter' : True}),
+                                          ((600, 600, 30, 20, 144), {'frst_diameter' : 16}),
+                                          ((800, 250, 40, 12, 80), {})])
+def test_rect_layout_without_numpy(monkeypatch, args, kwargs):
+    layout = solve_rect_layout(*args, **kwargs)
+
+    monkeypatch.setattr(column_design, "np", None)
+
+    pure_layout = solve_rect_layout(*args, **kwargs)
+
+    assert layout is not None
+    assert pure_layout[:5] == layout[:5]
+    assert math.isclose(pure_layout.as_real, layout.as_real)
+
+
+@pytest.mark.parametrize("args, kwargs", [((250, 30, 5, 40), {}),
+                                          ((400, 40, 10, 200), {'diameter' : 16})])
+def test_circ_layout_without_numpy(monkeypatch, args, kwargs):
+    layout = solve_circ_layout(*args, **kwargs)
+
+    monkeypatch.setattr(column_design, "np", None)
+
+    pure_layout = solve_circ_layout(*args, **kwargs)
+
+    assert layout is not None
+    assert pure_layout[:5] == layout[:5]
+    assert math.isclose(pure_layout.as_real, layout.as_real)
@@ -0,0 +1,48 @@
+# -*- coding: utf8 -*-
+"""Tests of the analytic mass properties
+
+Author:
+    API2GETHER - 2024
+"""
+import math
+
+from APIHub.mass_properties import column_mass, cuboid_mass, cylinder_mass, overlap_mass
+
+
+def test_cuboid_mass():
+    mass = cuboid_mass(400, 300, 3000, (10, 20, 30))
+
+    assert mass.volume == 400 * 300 * 3000
+    assert mass.surface == 2 * (400 * 300 + 400 * 3000 + 300 * 3000)
+    assert mass.center_of_gravity == (210, 170, 1530)
+
+
+def test_cylinder_mass():
+    mass = cylinder_mass(250, 3000)
+
+    assert math.isclose(mass.volume, math.pi * 250 ** 2 * 3000)
+    assert math.isclose(mass.surface, 2 * math.pi * 250 ** 2 + 2 * math.pi * 250 * 3000)
+    assert mass.center_of_gravity == (0, 0, 1500)
+
+
+def test_column_mass():
+    assert column_mass("rectangle", 400, 300, 0, 3000) == cuboid_mass(400, 300, 3000)
+    assert column_mass("circle", 0, 0, 250, 3000) == cylinder_mass(250, 3000)
+
+
+def test_overlap_mass_rectangle():
+    mass = overlap_mass("rectangle", 400, 300, 0, 3000, 300, 400, 0, 1000)
+
+    assert mass == cuboid_mass(300, 300, 1000, (50, 0, 3000))
+    assert mass.center_of_gravity == (200, 150, 3500)
+
+
+def test_overlap_mass_circle():
+    mass = overlap_mass("circle", 0, 0, 250, 800, 0, 0, 200, 1000)
+
+    assert mass == cylinder_mass(200, 800, (0, 0, 800))
+
+
+def test_other_shape_without_kernel():
+    assert column_mass("polygon", 0, 0, 0, 3000) is None
+    assert overlap_mass("polygon", 0, 0, 0, 3000, 0, 0, 0, 1000) is None
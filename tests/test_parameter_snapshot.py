@@ -0,0 +1,69 @@
+# -*- coding: utf8 -*-
+"""Tests of the parameter snapshot and of the dirty set
+
+Author:
+    API2GETHER - 2024
+"""
+from types import SimpleNamespace
+
+from APIHub.parameter_snapshot import ParameterTracker
+
+
+def building_element(**values):
+    return SimpleNamespace(**{name : SimpleNamespace(value = value) for name, value in values.items()})
+
+
+def test_parameter_tracker():
+    tracker = ParameterTracker(("Length", "Points"))
+
+    assert tracker.is_dirty("Length") and tracker.is_dirty("Points")
+
+    snapshot, dirty = tracker.update(building_element(Length = 400, Points = [1, 2]))
+
+    assert snapshot.Length == 400 and snapshot.Points == (1, 2)
+    assert dirty == {"Length", "Points"}
+
+    snapshot, dirty = tracker.update(building_element(Length = 500, Points = [1, 2]))
+
+    assert dirty == {"Length"}
+    assert tracker.is_dirty("Length", "Other") and not tracker.is_dirty("Points")
+
+    # take doesn't change the previous snapshot
+    assert tracker.diff(tracker.take(building_element(Length = 500, Points = [1, 3]))) == {"Points"}
+    assert tracker.update(building_element(Length = 500, Points = [1, 2]))[1] == frozenset()
+
+    tracker.reset()
+
+    assert tracker.snapshot is None and tracker.is_dirty("Points")
+
+
+def test_value_set_back_after_script_modification():
+    tracker   = ParameterTracker(("FirstBarDiameter", "SecondBarDiameter"))
+    build_ele = building_element(FirstBarDiameter = 12, SecondBarDiameter = 12)
+
+    tracker.update(build_ele)
+
+    # The calculator of the palette writes the diameters
+    build_ele.FirstBarDiameter.value  = 16
+    build_ele.SecondBarDiameter.value = 16
+    tracker.refresh(build_ele)
+
+    assert tracker.dirty == {"FirstBarDiameter", "SecondBarDiameter"}
+
+    # The user picks the previous diameter again
+    build_ele.FirstBarDiameter.value = 12
+
+    assert tracker.update(build_ele)[1] == {"FirstBarDiameter"}
+    assert tracker.is_dirty("FirstBarDiameter")
+
+
+def test_script_modification_not_reported():
+    tracker   = ParameterTracker(("FirstBarDiameter", "AsRealDouble"))
+    build_ele = building_element(FirstBarDiameter = 12, AsRealDouble = 4.52)
+
+    tracker.update(build_ele)
+
+    build_ele.AsRealDouble.value = 6.79
+    tracker.refresh(build_ele)
+
+    assert tracker.update(build_ele)[1] == frozenset()
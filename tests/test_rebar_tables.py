@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+"""Tests of the precomputed rebar and concrete grade tables
+
+Author:
+    API2GETHER - 2024
+"""
+import math
+
+import pytest
+
+from APIHub.rebar_tables import CONCRETE_GRADE_NAMES, REBAR_TABLE, STEEL_DENSITY, bar_weight, concrete_grade, \
+                                rebar_properties
+
+
+def test_rebar_properties():
+    properties = rebar_properties(12)
+
+    assert properties is REBAR_TABLE[12]
+    assert math.isclose(properties.section, math.pi * 1.2 ** 2 / 4)
+    assert math.isclose(properties.weight_per_ml, properties.section * 1e-4 * STEEL_DENSITY)
+    assert math.isclose(bar_weight(1, 12), properties.weight_per_ml)
+
+
+def test_rebar_out_of_table():
+    assert 18 not in REBAR_TABLE
+    assert math.isclose(rebar_properties(18).section, math.pi * 1.8 ** 2 / 4)
+
+
+@pytest.mark.parametrize("diameter, mandrel_factor", [(8, 4), (16, 4), (20, 7), (32, 7)])
+def test_mandrel(diameter, mandrel_factor):
+    assert rebar_properties(diameter).mandrel_factor == mandrel_factor
+    assert rebar_properties(diameter).mandrel_diameter == mandrel_factor * diameter
+
+
+def test_tables_are_read_only():
+    with pytest.raises(TypeError):
+        REBAR_TABLE[12] = None
+
+
+def test_concrete_grades():
+    assert CONCRETE_GRADE_NAMES[4] == "C25/30"
+    assert concrete_grade(4).fcm == 33
+    assert concrete_grade(0) is None
@@ -0,0 +1,28 @@
+# -*- coding: utf8 -*-
+"""Tests of the outputs rebuilt after a handle move
+
+Author:
+    API2GETHER - 2024
+"""
+from collections import namedtuple
+
+from APIHub.rebuild_planner import RebuildPlanner
+
+
+Snapshot = namedtuple("Snapshot", ("ColumnLength", "ColumnHeight", "FirstBarDiameter", "TextOrigin"))
+
+DEPENDENCIES = {"geometry"      : ("ColumnLength", "ColumnHeight"),
+                "reinforcement" : ("ColumnLength", "ColumnHeight", "FirstBarDiameter")}
+
+
+def test_plan():
+    planner = RebuildPlanner(DEPENDENCIES)
+
+    assert planner.plan(Snapshot(400, 3000, 12, (0, 0))) == {"geometry", "reinforcement"}
+    assert planner.plan(Snapshot(400, 3000, 12, (100, 0))) == set()
+    assert planner.plan(Snapshot(400, 3000, 16, (100, 0))) == {"reinforcement"}
+    assert planner.plan(Snapshot(500, 3000, 16, (100, 0))) == {"geometry", "reinforcement"}
+
+    planner.reset()
+
+    assert planner.plan(Snapshot(500, 3000, 16, (100, 0))) == {"geometry", "reinforcement"}
@@ -0,0 +1,62 @@
+# -*- coding: utf8 -*-
+"""Tests of the quantities calculated without the bar placements
+
+Author:
+    API2GETHER - 2024
+"""
+import math
+
+from APIHub.rebar_tables import rebar_properties
+from APIHub.reinf_quantities import STIRRUP_PLACEMENT_COVER, StirrupRegion, bar_count_by_distance, bars_weight, \
+                                    crosstie_count, stirrup_counts, stirrup_regions, verify_quantities
+
+
+def test_bar_count_by_distance():
+    assert bar_count_by_distance(1000, 200) == 6
+    assert bar_count_by_distance(1000, 300) == 5
+    assert bar_count_by_distance(0, 200) == 0
+    assert bar_count_by_distance(1000, 0) == 0
+
+
+def test_stirrup_regions():
+    bottom, main, top = stirrup_regions(3000, 200, 250, 100, 500, 100, 500)
+
+    assert bottom == StirrupRegion(500, 100, 6)
+    assert top == StirrupRegion(500, 100, 6)
+    assert main.length == 3000 - 200 - 2 * STIRRUP_PLACEMENT_COVER - 1000
+    assert main.count == bar_count_by_distance(main.length, 250)
+
+
+def test_stirrup_regions_short_column():
+    bottom, main, top = stirrup_regions(600, 200, 250, 100, 500, 100, 500)
+
+    assert bottom.length == 600 - 200 - 2 * STIRRUP_PLACEMENT_COVER
+    assert main == StirrupRegion(0, 250, 0)
+    assert top == StirrupRegion(0, 100, 0)
+
+
+def test_stirrup_counts():
+    regions = (StirrupRegion(500, 100, 6), StirrupRegion(1600, 250, 8), StirrupRegion(500, 100, 6))
+
+    assert stirrup_counts(regions) == [6, 10, 8, 25, 6, 10]
+
+
+def test_crosstie_count():
+    assert crosstie_count(400, 30, 6, 12, 12, 0) == 0
+    assert crosstie_count(1000, 30, 6, 12, 12, 2) == 2
+    assert crosstie_count(400, 30, 6, 12, 12, 3) == 1
+
+
+def test_bars_weight():
+    weight = bars_weight([(4, 12, 3000), (20, 6, 1200)])
+
+    assert math.isclose(weight, 12 * rebar_properties(12).weight_per_ml + 24 * rebar_properties(6).weight_per_ml)
+    assert bars_weight([]) == 0
+
+
+def test_verify_quantities(capsys):
+    assert verify_quantities(([6, 10], {'length' : 1}), ((6, 10), {'length' : 1}))
+    assert capsys.readouterr().out == ""
+
+    assert not verify_quantities(([6, 10], {'length' : 1}), ([7, 10], {'length' : 1}))
+    assert capsys.readouterr().out != ""
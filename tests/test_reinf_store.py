@@ -0,0 +1,95 @@
+# -*- coding: utf8 -*-
+"""Tests of the reinforcement store
+
+Author:
+    API2GETHER - 2024
+"""
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+
+from APIHub.reinf_store import REINF_STORE_TOUCH_DELAY, ReinforcementStore, reinforcement_hash
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def last_used(store : ReinforcementStore,
+              key   : str) -> float:
+    return store.connection.execute("SELECT last_used FROM reinforcement WHERE key = ?", (key, )).fetchone()[0]
+
+
+def test_put_get(tmp_path):
+    store = ReinforcementStore(str(tmp_path / "store.sqlite"), "1.0")
+    key   = reinforcement_hash(("rectangle", 400, 300))
+
+    assert store.get(key) is None
+
+    store.put(key, {'bars': [], 'count_stirrup': [10, 15]})
+
+    assert store.get(key) == {'bars': [], 'count_stirrup': [10, 15]}
+
+
+def test_other_version_dropped(tmp_path):
+    file_path = str(tmp_path / "store.sqlite")
+
+    store = ReinforcementStore(file_path, "1.0")
+    store.put("key", {'bars': []})
+    store.close()
+
+    assert ReinforcementStore(file_path, "1.1").get("key") is None
+
+
+def test_max_entries(tmp_path):
+    file_path = str(tmp_path / "store.sqlite")
+
+    store = ReinforcementStore(file_path, "1.0")
+    for index in range(5):
+        store.put(f"key{index}", {'index': index})
+    store.close()
+
+    store = ReinforcementStore(file_path, "1.0", max_entries = 2)
+
+    assert store.connection.execute("SELECT COUNT(*) FROM reinforcement").fetchone()[0] == 2
+
+
+def test_last_used_written_after_delay(tmp_path):
+    store = ReinforcementStore(str(tmp_path / "store.sqlite"), "1.0")
+    store.put("key", {'bars': []})
+
+    # Used an hour ago, not written again
+    with store.connection:
+        store.connection.execute("UPDATE reinforcement SET last_used = ?", (time.time() - 3600, ))
+
+    previous = last_used(store, "key")
+    store.get("key")
+    assert last_used(store, "key") == previous
+
+    # Older than the delay, written again
+    with store.connection:
+        store.connection.execute("UPDATE reinforcement SET last_used = ?", (previous - REINF_STORE_TOUCH_DELAY, ))
+
+    store.get("key")
+    assert last_used(store, "key") > previous
+
+
+def test_disabled_after_error(tmp_path):
+    store = ReinforcementStore(str(tmp_path / "store.sqlite"), "1.0")
+    store.put("key", {'bars': []})
+    store.connection.close()
+
+    assert store.get("key") is None
+    assert not store.enabled
+
+    # No exception once disabled
+    store.put("key", {'bars': []})
+
+
+def test_script_version_matches_pyp():
+    with open(os.path.join(ROOT_DIR, "py", "reinf_concr_column.py"), encoding = "utf-8") as file:
+        script_version = re.search(r'^SCRIPT_VERSION = "(.*)"$', file.read(), re.MULTILINE).group(1)
+
+    pyp_version = ElementTree.parse(os.path.join(ROOT_DIR, "pyp", "Poteau BA.pyp")).getroot().find("Script/Version").text
+
+    assert script_version == pyp_version
@@ -0,0 +1,68 @@
+# -*- coding: utf8 -*-
+"""Tests of the result cache
+
+Author:
+    API2GETHER - 2024
+"""
+import pytest
+
+from APIHub.result_cache import ResultCache, result_key, stable_key
+
+
+class Point3D:
+    def __init__(self, x, y, z):
+        self.X = x
+        self.Y = y
+        self.Z = z
+
+
+def test_stable_key():
+    assert stable_key([1, (2.0, "a")]) == (1, (2.0, "a"))
+    assert stable_key(Point3D(1, 2, 3)) == stable_key(Point3D(1, 2, 3))
+    assert stable_key(Point3D(1, 2, 3)) != stable_key(Point3D(1, 2, 4))
+
+    with pytest.raises(TypeError):
+        stable_key(object())
+
+
+class CommonProperties:
+    def __init__(self, layer, pen, face_style):
+        self.Layer     = layer
+        self.Pen       = pen
+        self.FaceStyle = face_style
+
+    def GetGlobalProperties(self):
+        pass
+
+
+def test_stable_key_common_properties():
+    key = stable_key(CommonProperties(1, 2, 3))
+
+    assert key == ("CommonProperties", ("FaceStyle", 3), ("Layer", 1), ("Pen", 2))
+
+    # The fields unknown to KNOWN_TYPE_FIELDS are keyed too
+    assert stable_key(CommonProperties(1, 2, 4)) != key
+
+
+def test_result_key():
+    assert result_key(1, [2, 3]) == (1, (2, 3))
+    assert result_key(1, object()) is None
+
+
+def test_result_cache_uncached():
+    cache = ResultCache(max_size = 4)
+
+    assert cache.get(result_key(1), lambda: "a") == "a"
+    assert cache.get(result_key(1), lambda: "b") == "a"
+    assert cache.get(None, lambda: "c") == "c"
+    assert cache.get(None, lambda: "d") == "d"
+
+    stats = cache.stats()
+
+    assert (stats['hits'], stats['misses'], stats['uncached'], stats['entries']) == (1, 1, 2, 1)
+    assert stats['hit_rate'] == 0.5
+
+    cache.clear()
+
+    assert cache.stats()['uncached'] == 0
+
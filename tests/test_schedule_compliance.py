@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+"""Tests of the schedule check against the constructive dispositions
+
+Author:
+    API2GETHER - 2024
+"""
+import pytest
+
+from APIHub import column_design
+from APIHub.column_design import check_schedule_rows, iter_schedule_compliance
+from APIHub.column_schedule import ScheduleRow
+
+
+SCHEDULE_ROWS = [ScheduleRow("P1", 12, 4, 6, 200, 100, 100),
+                 ScheduleRow("P2", 8, 4, 6, 500, 100, 100),
+                 ScheduleRow("P3", 20, 40, 8, 200, 300, 100),
+                 ScheduleRow("P4", 8, 2, 6, 100, 100, 100)]
+
+
+def test_check_schedule_rows():
+    results = check_schedule_rows(SCHEDULE_ROWS[:2], "rectangle", 400, 300, 0, 30)
+
+    assert [result.column_id for result in results] == ["P1", "P2"]
+    assert results[0].is_valid and results[0].violations == ()
+    assert not results[1].is_valid
+    assert "Espacement A des cadres" in results[1].violations
+
+
+@pytest.mark.parametrize("choice, length, thick, radius", [("rectangle", 400, 300, 0),
+                                                            ("circle", 0, 0, 250)])
+def test_check_schedule_rows_without_numpy(monkeypatch, choice, length, thick, radius):
+    results = check_schedule_rows(SCHEDULE_ROWS, choice, length, thick, radius, 30)
+
+    monkeypatch.setattr(column_design, "np", None)
+
+    assert check_schedule_rows(SCHEDULE_ROWS, choice, length, thick, radius, 30) == results
+    assert not all(result.is_valid for result in results)
+
+
+def test_iter_schedule_compliance_by_chunks():
+    results = [result for _, result in iter_schedule_compliance(iter(SCHEDULE_ROWS), "rectangle", 400, 300, 0, 30, chunk_size = 3)]
+
+    assert results == check_schedule_rows(SCHEDULE_ROWS, "rectangle", 400, 300, 0, 30)
@@ -0,0 +1,52 @@
+# -*- coding: utf8 -*-
+"""Tests of the background schedule loader
+
+Author:
+    API2GETHER - 2024
+"""
+import threading
+
+from APIHub.column_schedule import ScheduleLoader
+
+
+def test_result_taken_without_waiting():
+    loader  = ScheduleLoader()
+    release = threading.Event()
+
+    loader.submit(("row", "P1"), lambda: release.wait(5) and "P1")
+
+    assert loader.take_result(("row", "P1")) == (False, None)
+
+    release.set()
+    loader.future.result(5)
+
+    assert loader.take_result(("row", "P2")) == (False, None)
+    assert loader.take_result(("row", "P1")) == (True, "P1")
+    assert not loader.is_pending(("row", "P1"))
+
+
+def test_superseded_request():
+    loader  = ScheduleLoader()
+    release = threading.Event()
+
+    loader.submit(("row", "P1"), lambda: release.wait(5) and "P1")
+    loader.submit(("row", "P2"), lambda: "P2")
+
+    release.set()
+    loader.future.result(5)
+
+    assert loader.take_result(("row", "P1")) == (False, None)
+    assert loader.take_result(("row", "P2")) == (True, "P2")
+
+
+def test_failed_loading_reported(capsys):
+    loader = ScheduleLoader()
+
+    def load():
+        raise OSError("fichier verrouillé")
+
+    loader.submit(("row", "P1"), load)
+    loader.future.exception(5)
+
+    assert loader.take_result(("row", "P1")) == (True, None)
+    assert "fichier verrouillé" in capsys.readouterr().out
@@ -0,0 +1,40 @@
+# -*- coding: utf8 -*-
+"""Tests of the streamed schedule reader
+
+Author:
+    API2GETHER - 2024
+"""
+import pytest
+
+from APIHub.column_schedule import ScheduleRow, iter_schedule
+
+
+def test_iter_schedule_skips_invalid_rows(write_schedule):
+    file_path = write_schedule("P1, 12 ,4,6,200,100,100\n"
+                               "P2,14,,8,250,150,150\n"
+                               "P3,abc,4,6,200,100,100\n"
+                               "P4,16,8,8,250,150,150\n")
+
+    assert list(iter_schedule(file_path)) == [ScheduleRow("P1", 12, 4, 6, 200.0, 100.0, 100.0),
+                                              ScheduleRow("P4", 16, 8, 8, 250.0, 150.0, 150.0)]
+
+
+def test_iter_schedule_is_lazy(write_schedule):
+    file_path = write_schedule("".join(f"P{index},12,4,6,200,100,100\n" for index in range(1000)))
+
+    schedule_rows = iter_schedule(file_path)
+
+    assert next(schedule_rows).column_id == "P0"
+    assert next(schedule_rows).column_id == "P1"
+
+    schedule_rows.close()
+
+
+def test_missing_column_id_header(tmp_path):
+    file_path = str(tmp_path / "schedule.csv")
+
+    with open(file_path, mode='w', encoding='utf-8') as file:
+        file.write("Nom,Diamètre\nP1,12\n")
+
+    with pytest.raises(ValueError):
+        list(iter_schedule(file_path))
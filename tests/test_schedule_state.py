@@ -0,0 +1,46 @@
+# -*- coding: utf8 -*-
+"""Tests of the import state of the schedules
+
+Author:
+    API2GETHER - 2024
+"""
+from APIHub.column_schedule import ScheduleRow, diff_schedule_state, iter_changed_rows, load_schedule_state, \
+                                   save_schedule_state, schedule_state_of
+
+
+PREVIOUS_ROWS = [ScheduleRow("P1", 12, 4, 6, 200, 100, 100),
+                 ScheduleRow("P2", 14, 6, 8, 250, 150, 150),
+                 ScheduleRow("P4", 12, 4, 6, 200, 100, 100)]
+
+CURRENT_ROWS = [ScheduleRow("P1", 12, 4, 6, 200, 100, 100),
+                ScheduleRow("P2", 16, 6, 8, 250, 150, 150),
+                ScheduleRow("P3", 12, 4, 6, 200, 100, 100),
+                ScheduleRow("P3", 20, 4, 6, 200, 100, 100)]
+
+
+def test_changed_rows():
+    current_state = {}
+
+    changed_rows = list(iter_changed_rows(CURRENT_ROWS, schedule_state_of(PREVIOUS_ROWS), current_state))
+
+    assert changed_rows == CURRENT_ROWS[1:3]
+    assert current_state == schedule_state_of(CURRENT_ROWS)
+
+
+def test_diff_schedule_state():
+    schedule_diff = diff_schedule_state(schedule_state_of(PREVIOUS_ROWS), schedule_state_of(CURRENT_ROWS))
+
+    assert schedule_diff.added == ("P3", )
+    assert schedule_diff.changed == ("P2", )
+    assert schedule_diff.removed == ("P4", )
+    assert schedule_diff.unchanged == 1
+
+
+def test_saved_state(tmp_path):
+    state_path = str(tmp_path / "schedule.state.json")
+
+    assert load_schedule_state(state_path) == {}
+
+    save_schedule_state(schedule_state_of(CURRENT_ROWS), state_path)
+
+    assert load_schedule_state(state_path) == schedule_state_of(CURRENT_ROWS)
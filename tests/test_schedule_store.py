@@ -0,0 +1,46 @@
+# -*- coding: utf8 -*-
+"""Tests of the SQLite schedule store
+
+Author:
+    API2GETHER - 2024
+"""
+import pytest
+
+from APIHub.schedule_store import ScheduleStore, open_schedule_store, schedule_store_path
+
+
+def test_load_csv_by_level(write_schedule):
+    csv_path = write_schedule("P1,12,4,6,200,100,100\nP2,14,6,8,250,150,150\n")
+
+    store = ScheduleStore(schedule_store_path(csv_path))
+
+    try:
+        assert store.load_csv(csv_path, "R+1") == 2
+        assert store.load_csv(csv_path, "R+2") == 2
+        assert store.levels() == ["R+1", "R+2"]
+        assert store.lookup("P2", "R+2").long_bar_diameter == 14
+        assert store.lookup("P3", "R+2") is None
+        assert [schedule_row.column_id for schedule_row in store.iter_rows("R+1")] == ["P1", "P2"]
+    finally:
+        store.close()
+
+
+def test_failed_load_keeps_the_level(write_schedule, tmp_path):
+    csv_path = write_schedule("P1,12,4,6,200,100,100\n")
+
+    store = ScheduleStore(schedule_store_path(csv_path))
+
+    try:
+        store.load_csv(csv_path, "R+1")
+
+        with pytest.raises(OSError):
+            store.load_csv(str(tmp_path / "missing.csv"), "R+1")
+
+        assert store.lookup("P1", "R+1") is not None
+    finally:
+        store.close()
+
+
+def test_open_missing_store(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        open_schedule_store(str(tmp_path / "missing.sqlite"))
@@ -0,0 +1,36 @@
+# -*- coding: utf8 -*-
+"""Tests of the circle tessellation
+
+Author:
+    API2GETHER - 2024
+"""
+import math
+
+import pytest
+
+from APIHub.tessellation import DEFAULT_DRAWING_SCALE, MAX_SEGMENT_COUNT, MIN_SEGMENT_COUNT, PAPER_CHORD_TOLERANCE, \
+                                chord_tolerance, circle_points, segment_count
+
+
+@pytest.mark.parametrize("radius, tolerance", [(10, 5), (250, 5), (250, 0.5), (5000, 0.01), (250, 0), (250, 300)])
+def test_segment_count(radius, tolerance):
+    count = segment_count(radius, tolerance)
+
+    assert count % 4 == 0
+    assert MIN_SEGMENT_COUNT <= count <= MAX_SEGMENT_COUNT
+
+    if MIN_SEGMENT_COUNT < count < MAX_SEGMENT_COUNT:
+        assert radius * (1 - math.cos(math.pi / count)) <= tolerance
+
+
+def test_circle_points():
+    points = circle_points(250, 5)
+
+    assert len(points) == segment_count(250, 5) + 1
+    assert points[0] == points[-1]
+    assert all(math.isclose(math.hypot(*point), 250) for point in points)
+
+
+def test_chord_tolerance():
+    assert math.isclose(chord_tolerance(), PAPER_CHORD_TOLERANCE * DEFAULT_DRAWING_SCALE)
+    assert segment_count(250, chord_tolerance(0.05, 50)) >= segment_count(250, chord_tolerance(0.05, 100))